@@ -0,0 +1,2 @@
+# Benchmarks for the translation pipeline. Run them as modules, e.g.:
+#   python -m benchmarks.translate_concurrency
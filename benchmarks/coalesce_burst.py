@@ -0,0 +1,73 @@
+"""
+Requests per utterance and end-to-end lag under a synthetic burst, with and
+without coalescing of queued utterances.
+
+    python -m benchmarks.coalesce_burst --utterances 60 --interval 0.05 --delay 0.4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+import realtime_stt
+from benchmarks.fakes import FakeTranslator, RecordingRenderer
+from benchmarks.translate_concurrency import percentile
+
+
+def run_once(coalesce_chars: int, args) -> dict:
+    realtime_stt.transcript.clear()
+    renderer = RecordingRenderer()
+    realtime_stt.enqueue_text.renderer = renderer
+    translator = FakeTranslator(delay=args.delay, jitter=args.jitter, per_char=args.per_char, seed=7)
+    enqueued_at: dict[int, float] = {}
+
+    def feed():
+        for i in range(args.utterances):
+            now = time.perf_counter()
+            enqueued_at[realtime_stt.enqueue_text(f"short utterance number {i}")] = now
+            time.sleep(args.interval)
+        realtime_stt.text_queue.put(None)
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    asyncio.run(realtime_stt.run_translation_loop(
+        translator, renderer, args.concurrency, coalesce_chars, args.coalesce_wait
+    ))
+    feeder.join()
+
+    lags = [renderer.translated_at[row_id] - enqueued_at[row_id] for row_id in enqueued_at]
+    return {
+        "requests_per_utterance": translator.calls / args.utterances,
+        "p50": statistics.median(lags),
+        "p95": percentile(lags, 95),
+        "max": max(lags),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=60)
+    parser.add_argument("--interval", type=float, default=0.05, help="Seconds between utterances in the burst")
+    parser.add_argument("--delay", type=float, default=0.4, help="Fixed translator delay per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--per_char", type=float, default=0.0002, help="Extra delay per character sent")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--coalesce_chars", type=int, default=1000)
+    parser.add_argument("--coalesce_wait", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        realtime_stt.transcript_log_path = os.path.join(tmp, "transcript.log")
+        realtime_stt.transcript_with_translation_log_path = os.path.join(tmp, "transcript_with_translation.log")
+        print(f"{'mode':>10} {'req/utt':>8} {'p50 lag':>8} {'p95 lag':>8} {'max lag':>8}")
+        for name, chars in (("single", 0), ("coalesce", args.coalesce_chars)):
+            r = run_once(chars, args)
+            print(f"{name:>10} {r['requests_per_utterance']:>8.2f} {r['p50']:>8.2f} {r['p95']:>8.2f} {r['max']:>8.2f}")
+        realtime_stt.close_transcript_logs()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Compression calls per hour of speech with the OpenAI translator and compressor:
+flat compression with each utterance entering the context twice (as it used to)
+and once, and hierarchical compression. The API is faked: translations are
+instant and summaries are a quarter of their input, as the compression prompt asks.
+
+    python -m benchmarks.compression_calls --hours 1 --utterances_per_minute 15
+"""
+import argparse
+from unittest.mock import MagicMock
+
+from benchmarks.translator_latency import SAMPLE_UTTERANCES
+from compressor import OpenAICompressor
+from openai_client import PRIORITY_COMPRESSION
+from translator import OpenAITranslator
+
+
+class FakeOpenAIClient:
+    """
+    Stands in for OpenAIClient and counts calls and prompt characters per priority.
+    """
+
+    def __init__(self):
+        self.api_key = "fake"
+        self.client = MagicMock()
+        self.calls: dict[int, int] = {}
+        self.prompt_chars: dict[int, int] = {}
+        self.max_prompt_chars: dict[int, int] = {}
+
+    def _reply(self, content):
+        return MagicMock(choices=[MagicMock(message=MagicMock(content=content))], usage=None)
+
+    def create(self, priority, timeout=30.0, **kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        self.calls[priority] = self.calls.get(priority, 0) + 1
+        self.prompt_chars[priority] = self.prompt_chars.get(priority, 0) + len(prompt)
+        self.max_prompt_chars[priority] = max(self.max_prompt_chars.get(priority, 0), len(prompt))
+        if priority == PRIORITY_COMPRESSION:
+            text = prompt.split("\n\n", 1)[1]
+            return self._reply(text[: len(text) // 4])
+        return self._reply("translation")
+
+
+def run_once(utterances: int, threshold: int, double: bool, mode: str) -> dict:
+    client = FakeOpenAIClient()
+    translator = OpenAITranslator("en", "ru", openai_client=client)
+    compressor = OpenAICompressor(compression_threshold=threshold, openai_client=client, mode=mode)
+    translator.set_compressor(compressor)
+    try:
+        for i in range(utterances):
+            text = SAMPLE_UTTERANCES[i % len(SAMPLE_UTTERANCES)]
+            translator.translate(text)
+            if double:
+                # What OpenAITranslator.translate_with_context used to do on top of translate()
+                compressor.add_text(text)
+            # Lets the background compression finish so runs are deterministic
+            compressor.wait_idle()
+    finally:
+        compressor.stop()
+    return {
+        "compressions": client.calls.get(PRIORITY_COMPRESSION, 0),
+        "compression_chars": client.prompt_chars.get(PRIORITY_COMPRESSION, 0),
+        "max_compression_chars": client.max_prompt_chars.get(PRIORITY_COMPRESSION, 0),
+        "context_chars": len(compressor.get_context()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--utterances_per_minute", type=float, default=15.0)
+    parser.add_argument("--threshold", type=int, default=1500, help="Compression threshold in characters")
+    args = parser.parse_args()
+
+    utterances = int(args.hours * 60 * args.utterances_per_minute)
+    print(f"{utterances} utterances, compression threshold {args.threshold} chars")
+    print(f"{'mode':>18} {'compressions/h':>15} {'prompt chars/h':>15} {'max prompt':>11} {'context':>8}")
+    runs = (("flat, added twice", True, "flat"), ("flat", False, "flat"), ("hierarchical", False, "hierarchical"))
+    for label, double, mode in runs:
+        r = run_once(utterances, args.threshold, double, mode)
+        print(
+            f"{label:>18} {r['compressions'] / args.hours:>15.0f} "
+            f"{r['compression_chars'] / args.hours:>15.0f} {r['max_compression_chars']:>11} {r['context_chars']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
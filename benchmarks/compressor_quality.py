@@ -0,0 +1,112 @@
+"""
+Quality and latency of the context compressors on recorded transcripts
+(transcript.log, or JSONL with `time`/`offset` and `text`). Each transcript is
+fed utterance by utterance; the report shows compression latency, how much the
+final context shrank, and how many of the transcript's names/numbers and
+frequent keywords survive in it. The openai compressor needs an API key and
+is skipped without one.
+
+    python -m benchmarks.compressor_quality transcript.log --compressors extractive openai
+    python -m benchmarks.compressor_quality --threshold 800
+"""
+import argparse
+import statistics
+import time
+from collections import Counter
+
+from benchmarks.replay import load_utterances
+from benchmarks.translate_concurrency import percentile
+from benchmarks.translator_latency import SAMPLE_UTTERANCES
+from compressor import COMPRESSOR_TYPES, OpenAICompressor, get_compressor
+from compressor.extractive_compressor import entities, split_sentences, words
+
+
+def keywords(text: str, count: int = 20) -> set[str]:
+    # Most frequent longer words said more than once
+    frequent = Counter(w for w in words(text) if len(w) >= 5)
+    return {w for w, n in frequent.most_common(count) if n > 1}
+
+
+def named(text: str) -> set[str]:
+    return set().union(*(entities(s) for s in split_sentences(text))) if text else set()
+
+
+def recall(expected: set[str], context: str) -> float:
+    if not expected:
+        return 1.0
+    found = set(words(context))
+    return len(expected & found) / len(expected)
+
+
+def timed(obj, name: str, durations: list[float]) -> None:
+    # Records how long every call of obj.<name> takes
+    method = getattr(obj, name)
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            durations.append(time.perf_counter() - start)
+
+    setattr(obj, name, wrapper)
+
+
+def run(compressor, utterances: list[str]) -> dict:
+    durations: list[float] = []
+    background = isinstance(compressor, OpenAICompressor)
+    # The OpenAI compressor summarizes on its own thread
+    timed(compressor, "_do_compression" if background else "compress", durations)
+    try:
+        for text in utterances:
+            compressor.add_text(text)
+            if background:
+                compressor.wait_idle()
+    finally:
+        if background:
+            compressor.stop()
+    transcript = "\n".join(utterances)
+    context = compressor.get_context()
+    return {
+        "compressions": len(durations),
+        "p50_ms": statistics.median(durations) * 1000 if durations else 0.0,
+        "p95_ms": percentile(durations, 95) * 1000 if durations else 0.0,
+        "ratio": len(context) / len(transcript),
+        "entity_recall": recall(named(transcript), context),
+        "keyword_recall": recall(keywords(transcript), context),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transcripts", nargs="*", help="Recorded transcripts (default: a short sample meeting)")
+    parser.add_argument("--compressors", nargs="+", default=list(COMPRESSOR_TYPES), choices=COMPRESSOR_TYPES)
+    parser.add_argument("--compression_mode", default="flat")
+    parser.add_argument("--threshold", type=int, default=1500, help="Compression threshold in characters")
+    parser.add_argument("--openai_api_key", default=None)
+    args = parser.parse_args()
+
+    sessions = {path: [text for _, text in load_utterances(path)] for path in args.transcripts}
+    if not sessions:
+        sessions = {"sample": SAMPLE_UTTERANCES * 6}
+
+    print(f"{'transcript':>12} {'compressor':>11} {'calls':>6} {'p50 ms':>8} {'p95 ms':>8} {'ratio':>6} {'names':>6} {'keywords':>9}")
+    for name, utterances in sessions.items():
+        for compressor_type in args.compressors:
+            try:
+                compressor = get_compressor(
+                    compressor_type, openai_api_key=args.openai_api_key, compression_mode=args.compression_mode
+                )
+                compressor.compression_threshold = args.threshold
+                r = run(compressor, utterances)
+            except Exception as e:
+                print(f"{name[-12:]:>12} {compressor_type:>11} skipped: {e}")
+                continue
+            print(
+                f"{name[-12:]:>12} {compressor_type:>11} {r['compressions']:>6} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+                f"{r['ratio']:>6.2f} {r['entity_recall']:>6.0%} {r['keyword_recall']:>9.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+import asyncio
+import random
+import threading
+import time
+from typing import List, Tuple
+
+from compressor.base import BaseCompressor
+from translator.base import BaseTranslator
+from renderer.base import BaseRenderer, RowChange
+from transcript import PENDING_TRANSLATION
+
+
+class FakeBackendError(RuntimeError):
+    pass
+
+
+class FakeTranslator(BaseTranslator):
+    """
+    Translator that sleeps instead of calling a network backend.
+    Each request takes `delay` seconds plus a uniform random `jitter`, plus
+    `per_char` seconds per character sent. With probability `stall_rate` a request
+    stalls for another `stall_delay` seconds (a slow tail), and with probability
+    `failure_rate` it raises FakeBackendError after its delay. `calls` counts
+    requests, so a batched request counts once.
+    """
+
+    def __init__(
+        self,
+        delay: float = 0.2,
+        jitter: float = 0.0,
+        per_char: float = 0.0,
+        seed: int | None = None,
+        stall_rate: float = 0.0,
+        stall_delay: float = 0.0,
+        failure_rate: float = 0.0,
+    ):
+        super().__init__()
+        self.delay = delay
+        self.jitter = jitter
+        self.per_char = per_char
+        self.stall_rate = stall_rate
+        self.stall_delay = stall_delay
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failures = 0
+
+    def _request_delay(self, chars: int) -> float:
+        with self._lock:
+            self.calls += 1
+            delay = self.delay + self._random.uniform(0, self.jitter) + self.per_char * chars
+            if self._random.random() < self.stall_rate:
+                delay += self.stall_delay
+            return delay
+
+    def _maybe_fail(self) -> None:
+        with self._lock:
+            if self._random.random() >= self.failure_rate:
+                return
+            self.failures += 1
+        raise FakeBackendError("fake backend failure")
+
+    def translate_with_context(self, text: str, context: str | None) -> str:
+        time.sleep(self._request_delay(len(text)))
+        self._maybe_fail()
+        return f"<{text}>"
+
+    def translate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        time.sleep(self._request_delay(sum(len(t) for t in texts)))
+        self._maybe_fail()
+        return [f"<{text}>" for text in texts]
+
+    async def atranslate_with_context(self, text: str, context: str | None) -> str:
+        await asyncio.sleep(self._request_delay(len(text)))
+        self._maybe_fail()
+        return f"<{text}>"
+
+    async def atranslate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        await asyncio.sleep(self._request_delay(sum(len(t) for t in texts)))
+        self._maybe_fail()
+        return [f"<{text}>" for text in texts]
+
+
+class FakeCompressor(BaseCompressor):
+    """
+    Compressor that sleeps for `delay` seconds per compression instead of calling
+    a model, and keeps only the last `keep_chars` characters of context.
+    With probability `failure_rate` a compression fails and the context is kept as is.
+    """
+
+    def __init__(
+        self,
+        compression_threshold: int = 800,
+        delay: float = 0.5,
+        keep_chars: int = 200,
+        failure_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        super().__init__(compression_threshold)
+        self.delay = delay
+        self.keep_chars = keep_chars
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.compressions = 0
+        self.failures = 0
+
+    def compress(self) -> None:
+        time.sleep(self.delay)
+        with self._lock:
+            self.compressions += 1
+            if self._random.random() < self.failure_rate:
+                self.failures += 1
+                return
+            self._restart(self._joined[-self.keep_chars:])
+
+    def get_context(self) -> str:
+        with self._lock:
+            return self._joined
+
+
+class RecordingRenderer(BaseRenderer):
+    """
+    Renderer that draws nothing and records when each row received its translation.
+    Each update can be made to take `delay` seconds to stand in for drawing cost.
+    """
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__()
+        self.delay = delay
+        self.renders = 0
+        self.translated_at: dict[int, float] = {}
+
+    def render(self, translations: List[Tuple[str, str]]):
+        self.renders += 1
+
+    def apply(self, changes: List[RowChange]):
+        if self.delay:
+            time.sleep(self.delay)
+        self._apply_to_window(changes)
+        self.renders += 1
+        now = time.perf_counter()
+        for change in changes:
+            if change.translation != PENDING_TRANSLATION:
+                self.translated_at.setdefault(change.row_id, now)
+
+    def run(self):
+        pass
+
+    def stop(self):
+        pass
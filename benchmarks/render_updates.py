@@ -0,0 +1,93 @@
+"""
+Per-update cost of the renderers as the session grows.
+
+Compares the legacy path (render() with a full copy of every row) against the
+incremental append_row/update_row hooks at several history sizes, and against
+the same updates arriving as one burst through a RenderScheduler, which draws
+them in a single frame. For Rich the timing includes laying out the frame
+the terminal would show.
+
+    python -m benchmarks.render_updates --sizes 1000 10000 50000
+"""
+import argparse
+import io
+import time
+
+from rich.console import Console
+
+from renderer import RichRenderer, BrowserModalRenderer, RenderScheduler
+
+
+def make_renderers():
+    console = Console(file=io.StringIO(), width=120, height=40, force_terminal=False)
+    return {
+        "rich": RichRenderer(console=console),
+        "html": BrowserModalRenderer(target="ru", api_key="benchmark"),
+    }
+
+
+def draw(renderer) -> None:
+    # What Live does on its next refresh; the HTML renderer only notifies clients
+    if isinstance(renderer, RichRenderer):
+        console = Console(file=io.StringIO(), width=120, height=40, force_terminal=False)
+        console.print(renderer._live.renderable)
+
+
+def bench_incremental(renderer, size: int, updates: int) -> float:
+    for row_id in range(size):
+        renderer.append_row(row_id, f"text {row_id}", f"translation {row_id}")
+    start = time.perf_counter()
+    for i in range(updates):
+        row_id = size + i
+        renderer.append_row(row_id, f"text {row_id}", "...")
+        draw(renderer)
+        renderer.update_row(row_id, f"translation {row_id}")
+        draw(renderer)
+    return (time.perf_counter() - start) / (2 * updates)
+
+
+def bench_scheduled(renderer, size: int, updates: int) -> float:
+    for row_id in range(size):
+        renderer.append_row(row_id, f"text {row_id}", f"translation {row_id}")
+    scheduler = RenderScheduler(renderer)
+    start = time.perf_counter()
+    for i in range(updates):
+        row_id = size + i
+        scheduler.append_row(row_id, f"text {row_id}", "...")
+        scheduler.update_row(row_id, f"translation {row_id}")
+    # The frame the scheduler thread would draw for the whole burst
+    scheduler.flush()
+    draw(renderer)
+    return (time.perf_counter() - start) / (2 * updates)
+
+
+def bench_full_render(renderer, size: int, updates: int) -> float:
+    rows = [(f"text {i}", f"translation {i}") for i in range(size)]
+    start = time.perf_counter()
+    for i in range(updates):
+        rows.append((f"text {size + i}", "..."))
+        renderer.render(rows.copy())
+        draw(renderer)
+        rows[-1] = (rows[-1][0], f"translation {size + i}")
+        renderer.render(rows.copy())
+        draw(renderer)
+    return (time.perf_counter() - start) / (2 * updates)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--updates", type=int, default=100, help="Appends+updates measured per size")
+    args = parser.parse_args()
+
+    print(f"{'renderer':>8} {'rows':>7} {'full render us':>15} {'incremental us':>15} {'scheduled us':>13}")
+    for size in args.sizes:
+        for name in ("rich", "html"):
+            full = bench_full_render(make_renderers()[name], size, args.updates)
+            incremental = bench_incremental(make_renderers()[name], size, args.updates)
+            scheduled = bench_scheduled(make_renderers()[name], size, args.updates)
+            print(f"{name:>8} {size:>7} {full * 1e6:>15.1f} {incremental * 1e6:>15.1f} {scheduled * 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
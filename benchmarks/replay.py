@@ -0,0 +1,195 @@
+"""
+Replays a recorded session through the translation pipeline with fake backends.
+
+Utterances are read from transcript.log ("<ISO time> <text>" lines) or from a
+JSONL file with "time" (ISO) or "offset" (seconds) and "text" fields, and fed to
+enqueue_text with their original spacing divided by --speed. Reports end-to-end
+lag, queue depth over time, renders per second and memory growth, so it runs on
+a machine without a microphone, GPU or network.
+
+    python -m benchmarks.replay transcript.log --speed 10 --delay 0.4 --jitter 0.3
+    python -m benchmarks.replay session.jsonl --speed 0 --concurrency 4 --json
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import realtime_stt
+from benchmarks.fakes import FakeCompressor, FakeTranslator, RecordingRenderer
+from benchmarks.translate_concurrency import percentile
+from tracing import LatencyTracer
+
+
+def parse_time(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def load_utterances(path: str) -> list[tuple[float, str]]:
+    """
+    Returns (offset in seconds from the first utterance, text) pairs in file order.
+    """
+    utterances = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                at = parse_time(entry["offset"] if "offset" in entry else entry["time"])
+                utterances.append((at, entry["text"]))
+            else:
+                stamp, _, text = line.partition(" ")
+                utterances.append((parse_time(stamp), text))
+    if not utterances:
+        return []
+    start = utterances[0][0]
+    return [(at - start, text) for at, text in utterances]
+
+
+def replay(utterances: list[tuple[float, str]], args) -> dict:
+    realtime_stt.transcript.clear()
+    realtime_stt.text_queue = realtime_stt.LoopQueue()
+    realtime_stt.tracer = LatencyTracer(window=max(1000, len(utterances)))
+    renderer = RecordingRenderer(delay=args.render_delay)
+    realtime_stt.enqueue_text.renderer = renderer
+    translator = FakeTranslator(
+        delay=args.delay,
+        jitter=args.jitter,
+        per_char=args.per_char,
+        seed=args.seed,
+        stall_rate=args.stall_rate,
+        stall_delay=args.stall_delay,
+        failure_rate=args.failure_rate,
+    )
+    compressor = None
+    if args.compress_delay is not None:
+        compressor = FakeCompressor(delay=args.compress_delay, failure_rate=args.compress_failure_rate, seed=args.seed)
+        translator.set_compressor(compressor)
+
+    enqueued_at: dict[int, float] = {}
+    depth: list[tuple[float, int, int]] = []
+    done = threading.Event()
+
+    def feed():
+        start = time.perf_counter()
+        for offset, text in utterances:
+            if args.speed > 0:
+                wait = start + offset / args.speed - time.perf_counter()
+                if wait > 0:
+                    time.sleep(wait)
+            enqueued_at[realtime_stt.enqueue_text(text)] = time.perf_counter()
+        realtime_stt.text_queue.put(None)
+
+    def sample():
+        # Queued = waiting in text_queue; pending = enqueued but not yet translated on screen
+        start = time.perf_counter()
+        while not done.wait(args.sample_interval):
+            pending = len(enqueued_at) - len(renderer.translated_at)
+            depth.append((time.perf_counter() - start, realtime_stt.text_queue.qsize(), pending))
+
+    tracemalloc.start()
+    memory_start = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    feeder = threading.Thread(target=feed, daemon=True)
+    sampler = threading.Thread(target=sample, daemon=True)
+    feeder.start()
+    sampler.start()
+    try:
+        asyncio.run(realtime_stt.run_translation_loop(
+            translator,
+            renderer,
+            args.concurrency,
+            args.coalesce_chars,
+            args.coalesce_wait,
+        ))
+    finally:
+        feeder.join()
+        done.set()
+        sampler.join()
+    elapsed = time.perf_counter() - started
+    memory_end, memory_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    lags = [renderer.translated_at[row_id] - at for row_id, at in enqueued_at.items() if row_id in renderer.translated_at]
+    errors = sum(1 for row in realtime_stt.transcript.snapshot() if row[1].startswith("<error"))
+    return {
+        "utterances": len(utterances),
+        "elapsed": elapsed,
+        "requests": translator.calls,
+        "translator_failures": translator.failures,
+        "error_rows": errors,
+        "compressions": compressor.compressions if compressor else 0,
+        "lag_p50": statistics.median(lags) if lags else 0.0,
+        "lag_p95": percentile(lags, 95),
+        "lag_max": max(lags, default=0.0),
+        "max_queued": max((q for _, q, _ in depth), default=0),
+        "max_pending": max((p for _, _, p in depth), default=0),
+        "queue_depth": depth,
+        "renders": renderer.renders,
+        "renders_per_sec": renderer.renders / elapsed if elapsed else 0.0,
+        "memory_growth_kb": (memory_end - memory_start) / 1024,
+        "memory_peak_kb": (memory_peak - memory_start) / 1024,
+        "stages": realtime_stt.tracer.summary(),
+    }
+
+
+def print_report(r: dict) -> None:
+    print(f"utterances {r['utterances']}, requests {r['requests']}, failed {r['translator_failures']}, "
+          f"error rows {r['error_rows']}, compressions {r['compressions']}, elapsed {r['elapsed']:.2f}s")
+    print(f"lag p50 {r['lag_p50']:.3f}s  p95 {r['lag_p95']:.3f}s  max {r['lag_max']:.3f}s")
+    print(f"queue depth max {r['max_queued']} queued / {r['max_pending']} pending")
+    print(f"renders {r['renders']} ({r['renders_per_sec']:.1f}/s)")
+    print(f"memory growth {r['memory_growth_kb']:.1f} KiB, peak {r['memory_peak_kb']:.1f} KiB")
+    print(f"{'stage':>16} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, values in r["stages"].items():
+        if "p50" in values:
+            print(f"{name:>16} {values['count']:>6} {values['p50'] * 1000:>8.1f} "
+                  f"{values['p95'] * 1000:>8.1f} {values['p99'] * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="transcript.log or JSONL file with timestamped utterances")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed factor; 0 feeds everything at once")
+    parser.add_argument("--limit", type=int, default=None, help="Replay only the first N utterances")
+    parser.add_argument("--delay", type=float, default=0.4, help="Fixed translator delay per request in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Extra uniform random translator delay in seconds")
+    parser.add_argument("--per_char", type=float, default=0.0, help="Extra translator delay per character sent")
+    parser.add_argument("--stall_rate", type=float, default=0.0, help="Probability that a request stalls for --stall_delay")
+    parser.add_argument("--stall_delay", type=float, default=2.0)
+    parser.add_argument("--failure_rate", type=float, default=0.0, help="Probability that a translation request fails")
+    parser.add_argument("--compress_delay", type=float, default=None, help="Attach a fake compressor taking this many seconds per compression")
+    parser.add_argument("--compress_failure_rate", type=float, default=0.0)
+    parser.add_argument("--render_delay", type=float, default=0.0, help="Seconds each renderer update takes")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--coalesce_chars", type=int, default=0)
+    parser.add_argument("--coalesce_wait", type=float, default=0.0)
+    parser.add_argument("--sample_interval", type=float, default=0.1, help="Seconds between queue depth samples")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON (includes the queue depth series)")
+    args = parser.parse_args()
+
+    utterances = load_utterances(args.path)[:args.limit]
+    with tempfile.TemporaryDirectory() as tmp:
+        realtime_stt.transcript_log_path = os.path.join(tmp, "transcript.log")
+        realtime_stt.transcript_with_translation_log_path = os.path.join(tmp, "transcript_with_translation.log")
+        report = replay(utterances, args)
+        realtime_stt.close_transcript_logs()
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Bytes sent and server CPU per utterance with many browsers connected to the
+HTML renderer. In "delta" mode clients only read the /events stream of row
+deltas; "legacy" mode reproduces the old page, which refetched the table
+(here capped at its first 1000 rows) and the context on every event.
+
+The renderer runs in a child process so its CPU time is measured on its own.
+
+    python -m benchmarks.sse_fanout --clients 50 --utterances 20 --rows 2000
+"""
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+
+import httpx
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(port: int, rows: int, utterances: int, interval: float, ready, start, report) -> None:
+    from renderer import BrowserModalRenderer
+
+    renderer = BrowserModalRenderer(
+        target="ru", api_key="benchmark", host="127.0.0.1", port=port, max_rows=rows + utterances
+    )
+    for row_id in range(rows):
+        renderer.append_row(row_id, f"earlier utterance number {row_id}", f"ранее сказанная фраза {row_id}")
+    renderer.run()
+    ready.set()
+    start.wait()
+    cpu = time.process_time()
+    for i in range(utterances):
+        row_id = rows + i
+        renderer.append_row(row_id, f"new utterance number {row_id} with a few more words", "...")
+        time.sleep(interval)
+        renderer.update_row(row_id, f"новая фраза номер {row_id} и ещё несколько слов")
+        time.sleep(interval)
+    # Let the clients catch up before reading the CPU time
+    time.sleep(1.0)
+    report.put(time.process_time() - cpu)
+    renderer.stop()
+
+
+async def browser(base: str, legacy: bool, received: list[int], connected: asyncio.Event, counting: asyncio.Event):
+    async with httpx.AsyncClient(base_url=base, timeout=None) as http:
+        async with http.stream("GET", "/events") as response:
+            connected.set()
+            async for line in response.aiter_lines():
+                if counting.is_set():
+                    received[0] += len(line.encode()) + 1
+                if legacy and line.startswith("event:") and counting.is_set():
+                    # What the old page did on every event
+                    for path, params in (("/translations", {"limit": 1000}), ("/context_llm", None)):
+                        reply = await http.get(path, params=params)
+                        received[0] += len(reply.content)
+
+
+async def run_clients(base: str, clients: int, legacy: bool, start, report) -> tuple[int, float]:
+    received = [0]
+    counting = asyncio.Event()
+    events = [asyncio.Event() for _ in range(clients)]
+    tasks = [asyncio.create_task(browser(base, legacy, received, events[i], counting)) for i in range(clients)]
+    for event in events:
+        await event.wait()
+    counting.set()
+    start.set()
+    cpu = await asyncio.to_thread(report.get)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return received[0], cpu
+
+
+def run_mode(legacy: bool, args) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    ready, start, report = ctx.Event(), ctx.Event(), ctx.Queue()
+    port = free_port()
+    server = ctx.Process(target=serve, args=(port, args.rows, args.utterances, args.interval, ready, start, report))
+    server.start()
+    try:
+        ready.wait(30)
+        received, cpu = asyncio.run(run_clients(f"http://127.0.0.1:{port}", args.clients, legacy, start, report))
+    finally:
+        server.join(timeout=5)
+        if server.is_alive():
+            server.terminate()
+    updates = 2 * args.utterances
+    return {
+        "kb_per_update": received / updates / 1024,
+        "kb_per_update_client": received / updates / args.clients / 1024,
+        "cpu_ms_per_update": cpu / updates * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--utterances", type=int, default=20, help="Each is one append and one update")
+    parser.add_argument("--rows", type=int, default=2000, help="Rows already in the table")
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between updates")
+    parser.add_argument("--modes", nargs="+", default=["legacy", "delta"], choices=["legacy", "delta"])
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.rows} rows")
+    print(f"{'mode':>7} {'KB/update':>10} {'KB/update/client':>17} {'server CPU ms/update':>21}")
+    for mode in args.modes:
+        r = run_mode(mode == "legacy", args)
+        print(f"{mode:>7} {r['kb_per_update']:>10.1f} {r['kb_per_update_client']:>17.2f} {r['cpu_ms_per_update']:>21.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import argparse
+import json
+
+from .replay import load_utterances, replay
+
+
+def replay_args(**overrides):
+    args = dict(
+        speed=0, delay=0.01, jitter=0.0, per_char=0.0, stall_rate=0.0, stall_delay=0.0,
+        failure_rate=0.0, compress_delay=None, compress_failure_rate=0.0, render_delay=0.0,
+        concurrency=2, coalesce_chars=0, coalesce_wait=0.0, sample_interval=0.01, seed=1,
+    )
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+
+def test_load_text_log_offsets(tmp_path):
+    path = tmp_path / "transcript.log"
+    path.write_text(
+        "2025-01-01T10:00:00 hello there\n\n2025-01-01T10:00:02.500000 second one\n",
+        encoding="utf-8",
+    )
+    assert load_utterances(str(path)) == [(0.0, "hello there"), (2.5, "second one")]
+
+
+def test_load_jsonl_with_offsets_or_times(tmp_path):
+    path = tmp_path / "session.jsonl"
+    path.write_text(
+        json.dumps({"offset": 1.0, "text": "a"}) + "\n" + json.dumps({"offset": 4.0, "text": "b"}) + "\n",
+        encoding="utf-8",
+    )
+    assert load_utterances(str(path)) == [(0.0, "a"), (3.0, "b")]
+
+
+def test_replay_reports_lag_failures_and_memory(pipeline):
+    utterances = [(i * 0.001, f"utterance {i}") for i in range(20)]
+    report = replay(utterances, replay_args(failure_rate=0.3, compress_delay=0.0))
+    assert report["utterances"] == 20
+    assert report["error_rows"] == report["translator_failures"] > 0
+    assert report["lag_max"] >= report["lag_p50"] > 0
+    assert report["renders"] >= 40
+    assert report["stages"]["total"]["count"] == 20
+    assert "memory_growth_kb" in report
@@ -0,0 +1,79 @@
+"""
+Latency/throughput benchmark for run_translation_loop at different concurrency levels.
+
+    python -m benchmarks.translate_concurrency --utterances 40 --interval 0.1 --delay 0.5 --jitter 0.5
+"""
+import argparse
+import asyncio
+import statistics
+import tempfile
+import threading
+import time
+import os
+
+import realtime_stt
+from benchmarks.fakes import FakeTranslator, RecordingRenderer
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_once(concurrency: int, utterances: int, interval: float, delay: float, jitter: float) -> dict:
+    realtime_stt.transcript.clear()
+    renderer = RecordingRenderer()
+    realtime_stt.enqueue_text.renderer = renderer
+    translator = FakeTranslator(delay=delay, jitter=jitter, seed=42)
+    enqueued_at: dict[int, float] = {}
+
+    def feed():
+        for i in range(utterances):
+            now = time.perf_counter()
+            enqueued_at[realtime_stt.enqueue_text(f"utterance {i}")] = now
+            time.sleep(interval)
+        realtime_stt.text_queue.put(None)
+
+    start = time.perf_counter()
+    feeder = threading.Thread(target=feed, daemon=True)
+    feeder.start()
+    asyncio.run(realtime_stt.run_translation_loop(translator, renderer, concurrency))
+    elapsed = time.perf_counter() - start
+    feeder.join()
+
+    lags = [renderer.translated_at[row_id] - enqueued_at[row_id] for row_id in enqueued_at]
+    return {
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "throughput": utterances / elapsed,
+        "p50": statistics.median(lags),
+        "p95": percentile(lags, 95),
+        "max": max(lags),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--utterances", type=int, default=40)
+    parser.add_argument("--interval", type=float, default=0.1, help="Seconds between utterances")
+    parser.add_argument("--delay", type=float, default=0.5, help="Fixed translator delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Extra uniform random delay in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        realtime_stt.transcript_log_path = os.path.join(tmp, "transcript.log")
+        realtime_stt.transcript_with_translation_log_path = os.path.join(tmp, "transcript_with_translation.log")
+        print(f"{'N':>3} {'elapsed s':>10} {'utt/s':>7} {'p50 lag':>8} {'p95 lag':>8} {'max lag':>8}")
+        for n in args.concurrency:
+            r = run_once(n, args.utterances, args.interval, args.delay, args.jitter)
+            print(f"{r['concurrency']:>3} {r['elapsed']:>10.2f} {r['throughput']:>7.2f} "
+                  f"{r['p50']:>8.2f} {r['p95']:>8.2f} {r['max']:>8.2f}")
+        realtime_stt.close_transcript_logs()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Per-utterance latency of the real translator backends, e.g. the offline local
+model against the network ones. Needs network access (google, openai), an
+OpenAI key (openai) and a converted model (local); unavailable backends are skipped.
+
+    python -m benchmarks.translator_latency --backends local google openai --rounds 3
+    python -m benchmarks.translator_latency --backends local --local_model models/nllb-200-distilled-600M
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.translate_concurrency import percentile
+from translator import get_translator
+
+SAMPLE_UTTERANCES = [
+    "Good morning everyone, thanks for joining the call.",
+    "Let's start with a quick update on the release.",
+    "The build was green last night but one test is flaky.",
+    "Can you share your screen so we can look at the dashboard?",
+    "I think the latency spike comes from the database.",
+    "We should add a cache in front of that service.",
+    "Does anyone have questions before we move on?",
+    "Okay, let's meet again on Thursday at the same time.",
+]
+
+
+def bench(translator, utterances: list[str], rounds: int) -> dict:
+    single = []
+    batch = []
+    for _ in range(rounds):
+        for text in utterances:
+            start = time.perf_counter()
+            translator.translate_with_context(text, None)
+            single.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        translator.translate_batch_with_context(utterances, None)
+        batch.append((time.perf_counter() - start) / len(utterances))
+    return {
+        "p50": statistics.median(single),
+        "p95": percentile(single, 95),
+        "max": max(single),
+        "batch_per_utt": statistics.median(batch),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["local", "google", "openai"], choices=["local", "google", "openai"])
+    parser.add_argument("--source", default="en")
+    parser.add_argument("--target", default="ru")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--local_model", default=None)
+    parser.add_argument("--local_threads", type=int, default=2)
+    parser.add_argument("--proxy", default=None)
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'warmup s':>9} {'p50 s':>7} {'p95 s':>7} {'max s':>7} {'batch s/utt':>12}")
+    for backend in args.backends:
+        try:
+            translator = get_translator(
+                backend, args.source, args.target, proxy=args.proxy,
+                local_model=args.local_model, local_threads=args.local_threads,
+            )
+            start = time.perf_counter()
+            translator.warmup()
+            warmup = time.perf_counter() - start
+            r = bench(translator, SAMPLE_UTTERANCES, args.rounds)
+        except Exception as e:
+            print(f"{backend:>8} skipped: {e}")
+            continue
+        print(f"{backend:>8} {warmup:>9.2f} {r['p50']:>7.3f} {r['p95']:>7.3f} {r['max']:>7.3f} {r['batch_per_utt']:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
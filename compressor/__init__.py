@@ -1,10 +1,13 @@
 from .base import BaseCompressor
-from .openai_compressor import OpenAICompressor
+from .openai_compressor import COMPRESSION_MODES, OpenAICompressor
+from .extractive_compressor import ExtractiveCompressor
+from .factory import COMPRESSOR_TYPES, get_compressor
 
 __all__ = [
     "BaseCompressor",
+    "COMPRESSION_MODES",
+    "COMPRESSOR_TYPES",
     "OpenAICompressor",
+    "ExtractiveCompressor",
+    "get_compressor",
 ]
-
-
-
@@ -17,6 +17,13 @@ class BaseCompressor(ABC):
         self.compression_threshold = compression_threshold
         self.context: List[str] = []
         self.current_size = 0
+        # " ".join(self.context), extended as texts arrive instead of rebuilt per request
+        self._joined = ""
+        # The summary at the head of the context, if any
+        self._summary = ""
+        # Bumped whenever texts are replaced by a summary, so a compression
+        # can tell whether its snapshot of the context is still current
+        self._generation = 0
     
     def add_text(self, text: str | list[str]) -> None:
         """
@@ -28,11 +35,34 @@ class BaseCompressor(ABC):
         else:
             text = str(text)
             
-        self.context.append(text)
-        self.current_size += len(text)
+        self._append(text)
         
         if self.current_size > self.compression_threshold:
             self.compress()
+
+    def _append(self, text: str) -> None:
+        # Constant bookkeeping per text: size and joined string are updated, not recomputed
+        self._joined = f"{self._joined} {text}" if self.context else text
+        self.context.append(text)
+        self.current_size += len(text)
+
+    def _restart(self, summary: str) -> None:
+        # Replaces the whole context with a summary of it
+        self.context = [summary] if summary else []
+        self.current_size = len(summary)
+        self._joined = summary
+        self._summary = summary
+        self._generation += 1
+
+    def _replace_prefix(self, count: int, prefix: str, summary: str) -> None:
+        # Replaces the first `count` texts, whose " ".join() was `prefix`, with a
+        # summary of them (or nothing); texts added since are kept after it
+        tail = self._joined[len(prefix) + 1:] if len(self.context) > count else ""
+        self.current_size += len(summary) - (len(prefix) - (count - 1))
+        self.context[:count] = [summary] if summary else []
+        self._joined = f"{summary} {tail}" if summary and tail else summary or tail
+        self._summary = summary
+        self._generation += 1
     
     @abstractmethod
     def compress(self) -> None:
@@ -48,3 +78,12 @@ class BaseCompressor(ABC):
         Returns the current context as a string.
         """
         pass
+
+    def get_parts(self) -> tuple[str, List[str]]:
+        """
+        Returns the latest summary ("" if none) and the texts added after it,
+        oldest first, so callers can choose how much of each to use.
+        """
+        if self._summary and self.context and self.context[0] is self._summary:
+            return self._summary, self.context[1:]
+        return "", list(self.context)
@@ -0,0 +1,167 @@
+import math
+import re
+import threading
+from collections import Counter
+from typing import List
+
+from .base import BaseCompressor
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|\n+")
+_WORD = re.compile(r"\w+", re.UNICODE)
+# A phrase of up to 4 words said again right after itself ("I think I think")
+_REPEATED_PHRASE = re.compile(r"\b(\w+(?:\s+\w+){0,3})(?:[\s,]+\1\b)+", re.IGNORECASE | re.UNICODE)
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_END.split(text) if s and s.strip()]
+
+
+def words(text: str) -> List[str]:
+    return [w.lower() for w in _WORD.findall(text)]
+
+
+def entities(sentence: str) -> set[str]:
+    """
+    Names and numbers: capitalized words other than the first one, and words with digits.
+    """
+    found = set()
+    for i, word in enumerate(_WORD.findall(sentence)):
+        if any(c.isdigit() for c in word) or (i > 0 and word[:1].isupper()):
+            found.add(word.lower())
+    return found
+
+
+def _tfidf(sentences: List[List[str]]) -> List[dict[str, float]]:
+    # Each sentence is a document; words in every sentence weigh nothing
+    df = Counter(w for s in sentences for w in set(s))
+    n = len(sentences)
+    vectors = []
+    for s in sentences:
+        tf = Counter(s)
+        vector = {w: count * math.log(n / df[w]) for w, count in tf.items() if df[w] < n}
+        norm = math.sqrt(sum(v * v for v in vector.values())) or 1.0
+        vectors.append({w: v / norm for w, v in vector.items()})
+    return vectors
+
+
+def textrank(vectors: List[dict[str, float]], damping: float = 0.85, iterations: int = 30) -> List[float]:
+    """
+    PageRank over the cosine similarity graph of the sentence vectors.
+    """
+    n = len(vectors)
+    weights = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(i + 1, n):
+            a, b = vectors[i], vectors[j]
+            if len(a) > len(b):
+                a, b = b, a
+            sim = sum(v * b.get(w, 0.0) for w, v in a.items())
+            weights[i][j] = weights[j][i] = sim
+    totals = [sum(row) for row in weights]
+    scores = [1.0 / n] * n
+    for _ in range(iterations):
+        scores = [
+            (1 - damping) / n + damping * sum(
+                weights[j][i] / totals[j] * scores[j] for j in range(n) if weights[j][i]
+            )
+            for i in range(n)
+        ]
+    return scores
+
+
+class ExtractiveCompressor(BaseCompressor):
+    """
+    Compressor that runs in-process without any API call: it keeps the most
+    central sentences of the context (TextRank over TF-IDF vectors), favoring
+    sentences with names, numbers and the context's top keywords, and drops
+    repeated phrases and near-duplicate sentences. The summary is about `ratio`
+    of the original length, in the original order.
+    """
+
+    def __init__(
+        self,
+        compression_threshold: int = 1500,
+        ratio: float = 0.25,
+        entity_weight: float = 0.5,
+        keyword_count: int = 10,
+        duplicate_overlap: float = 0.8,
+    ):
+        super().__init__(compression_threshold)
+        self.ratio = ratio
+        self.entity_weight = entity_weight
+        self.keyword_count = keyword_count
+        self.duplicate_overlap = duplicate_overlap
+        # add_text() compresses inline, so the lock must be reentrant
+        self._lock = threading.RLock()
+
+    def add_text(self, text: str | list[str]) -> None:
+        with self._lock:
+            super().add_text(text)
+
+    def _deduplicate(self, sentences: List[str]) -> List[str]:
+        # Keeps the latest of sentences whose word sets mostly overlap
+        kept: List[str] = []
+        seen: List[set[str]] = []
+        for sentence in reversed(sentences):
+            sentence = _REPEATED_PHRASE.sub(r"\1", sentence)
+            bag = set(words(sentence))
+            if not bag:
+                continue
+            if any(len(bag & other) / len(bag | other) >= self.duplicate_overlap for other in seen):
+                continue
+            kept.append(sentence)
+            seen.append(bag)
+        kept.reverse()
+        return kept
+
+    def summarize(self, text: str) -> str:
+        """
+        Extractive summary of text, about `ratio` of its length.
+        """
+        sentences = self._deduplicate(split_sentences(text))
+        if not sentences:
+            return ""
+        budget = max(1, int(len(text) * self.ratio))
+        if len(sentences) == 1:
+            return sentences[0][-budget:]
+
+        tokens = [words(s) for s in sentences]
+        vectors = _tfidf(tokens)
+        ranks = textrank(vectors)
+        weight = Counter()
+        for vector in vectors:
+            weight.update(vector)
+        keywords = {w for w, _ in weight.most_common(self.keyword_count)}
+        top = max(ranks) or 1.0
+
+        scores = []
+        for i, sentence in enumerate(sentences):
+            named = len(entities(sentence)) + len(keywords.intersection(tokens[i]))
+            scores.append(ranks[i] / top + self.entity_weight * math.log1p(named))
+
+        chosen = []
+        used = 0
+        for i in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+            if used + len(sentences[i]) <= budget:
+                chosen.append(i)
+                used += len(sentences[i]) + 1
+        if not chosen:
+            best = max(range(len(sentences)), key=lambda i: scores[i])
+            return sentences[best][:budget]
+        return " ".join(sentences[i] for i in sorted(chosen))
+
+    def compress(self) -> None:
+        with self._lock:
+            if not self.context:
+                return
+            summary = self.summarize("\n".join(self.context))
+            if summary:
+                self._restart(summary)
+
+    def get_context(self) -> str:
+        with self._lock:
+            return self._joined
+
+    def get_parts(self) -> tuple[str, List[str]]:
+        with self._lock:
+            return super().get_parts()
@@ -0,0 +1,21 @@
+from .extractive_compressor import ExtractiveCompressor
+from .openai_compressor import OpenAICompressor
+from openai_client import OpenAIClient
+
+COMPRESSOR_TYPES = ("openai", "extractive")
+
+
+def get_compressor(
+    compressor_type: str,
+    openai_api_key: str | None = None,
+    openai_client: OpenAIClient | None = None,
+    compression_mode: str = "flat",
+):
+    if compressor_type == "openai":
+        compressor = OpenAICompressor(api_key=openai_api_key, openai_client=openai_client, mode=compression_mode)
+    elif compressor_type == "extractive":
+        compressor = ExtractiveCompressor()
+    else:
+        raise ValueError(f"Unknown compressor type: {compressor_type}")
+
+    return compressor
@@ -1,38 +1,76 @@
-import os
 from typing import List
-from openai import OpenAI
 from compressor import BaseCompressor
+from openai_client import OpenAIClient, PRIORITY_COMPRESSION
 import threading
-from queue import Queue, Empty
+
+COMPRESSION_MODES = ("flat", "hierarchical")
+
+SUMMARY_PROMPT = (
+    "Please produce a concise summary of the following conversation, "
+    "presenting only the core storyline first, then adding supporting details. "
+    "The input is a transcription of speech from an online recording. "
+    "Retain all main themes and key points, and make the summary approximately "
+    "one quarter of the original length:\n\n"
+)
+
+MERGE_PROMPT = (
+    "The following are consecutive summaries of one conversation, oldest first. "
+    "The conversation is a transcription of speech from an online recording. "
+    "Merge them into a single concise summary that keeps the core storyline, "
+    "all main themes and key points, approximately half of their combined length:\n\n"
+)
 
 
 class OpenAICompressor(BaseCompressor):
     """
     Concrete compressor using OpenAI to intelligently shrink context.
     Leverages GPT to generate concise summaries of past conversations.
+
+    In "flat" mode each compression summarizes the whole context, previous
+    summary included, into one summary. In "hierarchical" mode only the texts
+    added since the last compression are summarized; segment summaries are kept
+    in up to `max_levels` levels, and every `fanout` summaries of a level are
+    merged into one of the next level (the top level merges into itself). Every
+    call then has a bounded input, and get_context() shows at most
+    `summary_chars` characters of summaries followed by the recent texts.
     """
 
     def __init__(
         self,
         api_key: str | None = None,
-        compression_threshold: int = 1500
+        compression_threshold: int = 1500,
+        openai_client: OpenAIClient | None = None,
+        timeout: float = 60.0,
+        mode: str = "flat",
+        fanout: int = 3,
+        max_levels: int = 3,
+        summary_chars: int | None = None,
     ):
         super().__init__(compression_threshold)
-        if not api_key:
-            api_key = os.environ.get("OPENAI_API_KEY", "")
-        if not api_key:
-            raise ValueError("OpenAI API key must be provided")
-
-        self.client = OpenAI(api_key=api_key)
+        if mode not in COMPRESSION_MODES:
+            raise ValueError(f"Unknown compression mode: {mode}")
+        if openai_client is None:
+            openai_client = OpenAIClient(api_key)
+        self.mode = mode
+        self.fanout = max(2, fanout)
+        self.max_levels = max(1, max_levels)
+        self.summary_chars = summary_chars if summary_chars is not None else compression_threshold // 2
+        # Segment summaries per level, oldest first; level 0 holds the newest
+        self._levels: List[List[str]] = [[] for _ in range(self.max_levels)]
+        # The summaries shown ahead of the recent texts in hierarchical mode
+        self._summary_view = ""
+
+        # Shared with the translator; compression requests yield to translations
+        self.openai_client = openai_client
+        self.client = openai_client.client
+        # Deadline for one summarization request including retries
+        self.timeout = timeout
         # Lock for protecting access to the shared context buffer
         self._context_lock = threading.Lock()
-        # Lock for protecting the list of texts pending to be added during compression
-        self._pending_texts_lock = threading.Lock()
-        # Single-slot queue: a new compression request will overwrite any existing one
-        self._compression_queue: Queue[bool] = Queue(maxsize=1)
-        # Event flag indicating compression is in progress
-        self._compress_event = threading.Event()
-        self._pending_texts: List[str] = []
+        # Wakes the worker when compression is requested or it should stop
+        self._wakeup = threading.Condition(self._context_lock)
+        self._requested = False
+        self._compressing = False
         # Event flag to signal the compression thread to exit
         self._should_stop = threading.Event()
         # Worker thread will run compression tasks in the background
@@ -45,117 +83,153 @@ class OpenAICompressor(BaseCompressor):
     def add_text(self, text: str | list[str]) -> None:
         """
         Thread-safe addition of new text into the context buffer.
-        If compression is active, enqueue to pending list instead.
+        Texts added while a compression runs are kept after the part being summarized.
         """
         if isinstance(text, list):
             text = "\n ".join(text)
 
-        if self._compress_event.is_set():
-            # If compressing, defer appends to the pending bucket
-            with self._pending_texts_lock:
-                self._pending_texts.append(text)
-        else:
-            # Otherwise, add directly to the primary context under lock
-            with self._context_lock:
-                super().add_text(text)
+        with self._context_lock:
+            self._append(str(text))
+            # Past the threshold mid-compression, the next text after it asks again
+            if self.current_size > self.compression_threshold and not self._compressing:
+                self._request()
+
+    def _request(self) -> None:
+        # Caller holds _context_lock
+        self._requested = True
+        self._wakeup.notify_all()
 
     def _compression_worker(self) -> None:
         """
-        Background worker that listens for compression triggers.
+        Background worker that sleeps until a compression is requested.
         """
-        while not self._should_stop.is_set():
+        while True:
+            with self._wakeup:
+                self._wakeup.wait_for(lambda: self._requested or self._should_stop.is_set())
+                if self._should_stop.is_set():
+                    return
+                self._requested = False
+                self._compressing = True
             try:
-                # Wait up to 0.5s for a compression request; loop if none arrive
-                if not self._compression_queue.get(timeout=0.5):
-                    continue
-
-                # Mark that we are in compression phase
-                self._compress_event.set()
                 self._do_compression()
-            except Empty:
-                continue
             except Exception as e:
                 # Print error so worker can continue handling future tasks
                 print(f"Error in compression worker: {e}")
             finally:
-                # Clear flag even if an error occurred
-                self._compress_event.clear()
+                with self._wakeup:
+                    self._compressing = False
+                    self._wakeup.notify_all()
 
     def stop(self):
         """Safely stops the background compression thread."""
         self._should_stop.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
         if self._compression_thread.is_alive():
             self._compression_thread.join(timeout=1.0)
 
-    def _do_compression(self) -> None:
+    def wait_idle(self, timeout: float | None = None) -> bool:
         """
-        Performs the actual summarization by calling the OpenAI API.
+        Waits until no compression is requested or running. Returns False on timeout.
         """
-        try:
-            # Snapshot and clear current context under lock
-            with self._context_lock:
-                if not self.context:
-                    return
-                text_to_compress = "\n".join(self.context)
-
-            # Construct summarization prompt
-            prompt = (
-                "Please produce a concise summary of the following conversation, "
-                "presenting only the core storyline first, then adding supporting details. "
-                "The input is a transcription of speech from an online recording. "
-                "Retain all main themes and key points, and make the summary approximately "
-                "one quarter of the original length:\n\n"
-                f"{text_to_compress}"
-            )
-
-            # Issue API call outside of locks to avoid blocking add_text()
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-nano",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=int(self.compression_threshold * 1.2 + 1),
-                temperature=0.2
+        with self._wakeup:
+            return self._wakeup.wait_for(
+                lambda: not (self._requested or self._compressing) or self._should_stop.is_set(), timeout
             )
 
-            # Merge summary and any texts accumulated during compression
-            with self._context_lock:
-                choice = response.choices[0].message.content if response.choices else ""
-                if choice:
-                    # Only clear context if we got a valid summary back
-                    self.context.clear()
-                    self.context.append(choice)
-
-                # Append any pending texts that arrived mid-compression
-                with self._pending_texts_lock:
-                    if self._pending_texts:
-                        self.context.extend(self._pending_texts)
-                        self._pending_texts.clear()
+    def _summarize(self, instructions: str, text: str) -> str:
+        # Issue API call outside of locks to avoid blocking add_text()
+        response = self.openai_client.create(
+            PRIORITY_COMPRESSION,
+            timeout=self.timeout,
+            model="gpt-4.1-nano",
+            messages=[{"role": "user", "content": f"{instructions}{text}"}],
+            max_tokens=int(self.compression_threshold * 1.2 + 1),
+            temperature=0.2
+        )
+        return response.choices[0].message.content if response.choices else ""
 
-                # Recompute size after update
-                self.current_size = sum(len(t) for t in self.context)
+    def _do_compression(self) -> None:
+        """
+        Performs the actual summarization by calling the OpenAI API.
+        """
+        # Snapshot current context under lock; texts added during the call
+        # come after this prefix and are left alone
+        with self._context_lock:
+            if not self.context:
+                return
+            count = len(self.context)
+            prefix = self._joined
+            generation = self._generation
+            text_to_compress = "\n".join(self.context)
 
+        try:
+            choice = self._summarize(SUMMARY_PROMPT, text_to_compress)
         except Exception as e:
             print(f"Error during compression: {e}")
+            return
+        # Only replace the context if we got a valid summary back
+        if not choice:
+            return
+
+        with self._context_lock:
+            if generation != self._generation:
+                # The context was replaced meanwhile, so the snapshot is stale
+                return
+            if self.mode == "hierarchical":
+                self._replace_prefix(count, prefix, "")
+                self._levels[0].append(choice)
+                self._update_summary_view()
+            else:
+                self._replace_prefix(count, prefix, choice)
+
+        if self.mode == "hierarchical":
+            self._merge_levels()
+
+    def _merge_levels(self) -> None:
+        # Runs on the compression thread, the only writer of _levels
+        for level, summaries in enumerate(self._levels):
+            if len(summaries) < self.fanout:
+                return
+            merged = self._summarize(MERGE_PROMPT, "\n\n".join(summaries[:self.fanout]))
+            if not merged:
+                return
+            with self._context_lock:
+                del summaries[:self.fanout]
+                if level + 1 < self.max_levels:
+                    self._levels[level + 1].append(merged)
+                else:
+                    # The top level merges into itself, keeping the oldest summary first
+                    summaries.insert(0, merged)
+                self._update_summary_view()
+
+    def _update_summary_view(self) -> None:
+        # Oldest (highest level) first; beyond summary_chars the oldest part is cut off
+        view = "\n".join(s for summaries in reversed(self._levels) for s in summaries)
+        if len(view) > self.summary_chars:
+            view = view[len(view) - self.summary_chars:]
+        self._summary_view = view
 
     def compress(self) -> None:
         """
-        Enqueue a compression request, dropping any previous pending request.
+        Requests a compression; requests made before the worker wakes up are merged.
         """
-        try:
-            self._compression_queue.get_nowait()
-        except Empty:
-            pass
-        # New request will signal the worker to run
-        self._compression_queue.put(True)
+        with self._context_lock:
+            self._request()
 
     def get_context(self) -> str:
         """
         Returns the full available context string.
-        Includes pending texts if compression is ongoing.
         """
-        if self._compress_event.is_set():
-            # Merge both lists under both locks to give up-to-date view
-            with self._context_lock, self._pending_texts_lock:
-                return " ".join(self.context + self._pending_texts)
-        else:
-            with self._context_lock:
-                return " ".join(self.context)
+        with self._context_lock:
+            if self._summary_view and self._joined:
+                return f"{self._summary_view} {self._joined}"
+            return self._summary_view or self._joined
+
+    def get_parts(self) -> tuple[str, List[str]]:
+        """
+        Returns the latest summary and the texts added after it.
+        """
+        with self._context_lock:
+            summary, texts = super().get_parts()
+            return summary or self._summary_view, texts
@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from .extractive_compressor import ExtractiveCompressor, entities, split_sentences, textrank, _tfidf
+from .factory import get_compressor
+
+MEETING = [
+    "Good morning everyone, thanks for joining the call.",
+    "Let's start with a quick update on the release.",
+    "The build was green last night but one test is flaky.",
+    "Um, so, the build was green last night but one test is flaky.",
+    "Maria found that the latency spike comes from the database in Frankfurt.",
+    "We should add a cache in front of that database service.",
+    "I think I think we can ship version 2.4 on Thursday.",
+    "Does anyone have questions before we move on?",
+]
+
+
+def test_split_sentences():
+    assert split_sentences("One. Two? Three!\nFour") == ["One.", "Two?", "Three!", "Four"]
+
+
+def test_entities_are_names_and_numbers():
+    assert entities("Maria ships version 2.4 to Berlin") == {"2", "4", "berlin"}
+
+
+def test_textrank_favors_the_central_sentence():
+    sentences = [["cache", "database"], ["database", "latency", "cache"], ["latency", "spike"], ["weather"]]
+    ranks = textrank(_tfidf(sentences))
+    assert ranks.index(max(ranks)) == 1
+
+
+def test_summary_is_short_deduplicated_and_keeps_names():
+    compressor = ExtractiveCompressor(ratio=0.4)
+    text = "\n".join(MEETING)
+    summary = compressor.summarize(text)
+    assert len(summary) <= len(text) * 0.4
+    assert summary.count("build was green") <= 1
+    assert "Frankfurt" in summary
+    assert "I think I think" not in summary
+
+
+def test_compresses_inline_past_the_threshold():
+    compressor = ExtractiveCompressor(compression_threshold=200)
+    for text in MEETING:
+        compressor.add_text(text)
+    assert compressor.current_size <= 200
+    assert compressor.get_context() == " ".join(compressor.context)
+    summary, recent = compressor.get_parts()
+    assert summary and compressor.context[0] is summary
+    assert recent == compressor.context[1:]
+
+
+def test_concurrent_add_text():
+    compressor = ExtractiveCompressor(compression_threshold=300)
+
+    def worker(i):
+        for j in range(50):
+            compressor.add_text(f"Speaker {i} says sentence number {j}.")
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert compressor.current_size == sum(len(t) for t in compressor.context)
+    assert compressor.get_context() == " ".join(compressor.context)
+
+
+def test_factory():
+    assert isinstance(get_compressor("extractive"), ExtractiveCompressor)
+    with pytest.raises(ValueError):
+        get_compressor("zip")
@@ -1,4 +1,5 @@
 import pytest
+import re
 import threading
 import time
 
@@ -112,21 +113,203 @@ def test_do_compression_handles_exception(compressor):
 
 def test_compression_worker_handles_exception(compressor):
     # Force _do_compression to throw and verify worker keeps running
-    with patch.object(compressor, "_do_compression", side_effect=Exception("fail")):
-        compressor._compression_queue.put(True)
-        # Give worker time to process without hanging
-        time.sleep(0.2)
+    with patch.object(compressor, "_do_compression", side_effect=Exception("fail")) as compression:
+        compressor.compress()
+        assert compressor.wait_idle(timeout=1.0)
+        compressor.compress()
+        assert compressor.wait_idle(timeout=1.0)
+    assert compression.call_count == 2
+    assert compressor._compression_thread.is_alive()
 
 
 def test_multiple_compress_requests(compressor):
-    # Ensure only one pending request stays in queue when compress() is called repeatedly
-    compressor._compression_queue.queue.clear()
-    compressor.compress()
-    compressor.compress()
-    assert compressor._compression_queue.qsize() == 1
+    # Requests made while a compression runs are merged into one more run
+    running = threading.Event()
+    release = threading.Event()
+
+    def compression():
+        running.set()
+        release.wait(1.0)
+
+    with patch.object(compressor, "_do_compression", side_effect=compression) as mock:
+        compressor.compress()
+        assert running.wait(1.0)
+        compressor.compress()
+        compressor.compress()
+        release.set()
+        assert compressor.wait_idle(timeout=1.0)
+    assert mock.call_count == 2
 
 
 def test_stop_idempotent(compressor):
     # Calling stop() multiple times should not raise errors
     compressor.stop()
     compressor.stop()
+
+
+def test_get_parts_splits_summary_from_recent_texts(compressor):
+    assert compressor.get_parts() == ("", [])
+    compressor.add_text("a" * 60)
+    time.sleep(0.5)
+    compressor.add_text("after")
+    assert compressor.get_parts() == ("compressed summary", ["after"])
+
+
+def test_size_and_context_are_kept_incrementally(compressor):
+    compressor.compression_threshold = 10_000
+    for text in ("one", "two", "three"):
+        compressor.add_text(text)
+    assert compressor.current_size == 11
+    assert compressor.get_context() == "one two three"
+
+    def create(**kwargs):
+        # A text arriving during the call stays after the summarized part
+        compressor.add_text("four")
+        return DummyResponse("compressed summary")
+
+    with patch.object(compressor.client.chat.completions, "create", side_effect=create):
+        compressor._do_compression()
+    assert compressor.context == ["compressed summary", "four"]
+    assert compressor.current_size == len("compressed summary") + 4
+    assert compressor.get_context() == "compressed summary four"
+
+
+def test_failed_compression_keeps_texts(compressor):
+    compressor.add_text("one")
+
+    def create(**kwargs):
+        compressor.add_text("two")
+        raise Exception("fail")
+
+    with patch.object(compressor.client.chat.completions, "create", side_effect=create):
+        compressor._do_compression()
+    assert compressor.context == ["one", "two"]
+    assert compressor.get_context() == "one two"
+
+
+def test_stale_snapshot_is_not_applied(compressor):
+    compressor.add_text("one")
+
+    def create(**kwargs):
+        # Something else replaced the context during the call
+        with compressor._context_lock:
+            compressor._restart("other summary")
+        return DummyResponse("compressed summary")
+
+    with patch.object(compressor.client.chat.completions, "create", side_effect=create):
+        compressor._do_compression()
+    assert compressor.context == ["other summary"]
+
+
+@pytest.fixture
+def hierarchical():
+    comp = OpenAICompressor(
+        api_key="test-key", compression_threshold=10_000, mode="hierarchical", fanout=2, max_levels=2
+    )
+    prompts = []
+
+    def create(**kwargs):
+        prompts.append(kwargs["messages"][0]["content"])
+        return DummyResponse(f"S{len(prompts)}")
+
+    patcher = patch.object(comp.client.chat.completions, "create", side_effect=create)
+    patcher.start()
+    yield comp, prompts
+    comp.stop()
+    patcher.stop()
+
+
+def test_hierarchical_summarizes_only_the_new_segment(hierarchical):
+    compressor, prompts = hierarchical
+    compressor.add_text("one two")
+    compressor._do_compression()
+    assert compressor.context == []
+    assert compressor.current_size == 0
+    compressor.add_text("three")
+    assert compressor.get_context() == "S1 three"
+    assert compressor.get_parts() == ("S1", ["three"])
+    compressor._do_compression()
+    # The second call sees only the new text, not the first summary
+    assert prompts[1].endswith("\n\nthree")
+    assert "S1" not in prompts[1]
+
+
+def test_hierarchical_merges_levels(hierarchical):
+    compressor, prompts = hierarchical
+    for text in ("a", "b"):
+        compressor.add_text(text)
+        compressor._do_compression()
+    # Two segment summaries were merged into one on the next level
+    assert prompts[2].endswith("S1\n\nS2")
+    assert compressor._levels == [[], ["S3"]]
+    for text in ("c", "d"):
+        compressor.add_text(text)
+        compressor._do_compression()
+    # The new level-1 summary fills the top level, which merges into itself
+    assert compressor._levels == [[], ["S7"]]
+    assert prompts[6].endswith("S3\n\nS6")
+    assert compressor.get_context() == "S7"
+
+
+def test_hierarchical_view_is_bounded(hierarchical):
+    compressor, _ = hierarchical
+    compressor.summary_chars = 4
+    compressor._levels = [["newest"], ["oldest"]]
+    compressor._update_summary_view()
+    assert compressor.get_parts()[0] == "west"
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        OpenAICompressor(api_key="test-key", mode="tree")
+
+
+UTTERANCE_ID = re.compile(r"u\d+_\d+")
+
+
+@pytest.mark.parametrize("mode", ["flat", "hierarchical"])
+def test_stress_no_utterance_lost_or_duplicated(mode):
+    comp = OpenAICompressor(
+        api_key="test-key", compression_threshold=400, mode=mode, max_levels=10, summary_chars=10**9
+    )
+
+    def create(**kwargs):
+        # The "summary" lists every utterance id it was given, so ids can be counted
+        time.sleep(0.002)
+        ids = UTTERANCE_ID.findall(kwargs["messages"][0]["content"])
+        return DummyResponse(" ".join(ids))
+
+    writers, per_writer = 8, 100
+    errors = []
+    done = threading.Event()
+
+    def writer(w):
+        for i in range(per_writer):
+            comp.add_text(f"u{w}_{i} " + "words " * 8)
+
+    def reader():
+        while not done.is_set():
+            ids = UTTERANCE_ID.findall(comp.get_context())
+            if len(ids) != len(set(ids)):
+                errors.append(ids)
+            comp.get_parts()
+
+    with patch.object(comp.client.chat.completions, "create", side_effect=create):
+        readers = [threading.Thread(target=reader) for _ in range(2)]
+        threads = [threading.Thread(target=writer, args=(w,)) for w in range(writers)]
+        for t in readers + threads:
+            t.start()
+        for t in threads:
+            t.join()
+        comp.compress()
+        assert comp.wait_idle(timeout=5.0)
+        done.set()
+        for t in readers:
+            t.join()
+        context = comp.get_context()
+        comp.stop()
+
+    assert not errors
+    expected = [f"u{w}_{i}" for w in range(writers) for i in range(per_writer)]
+    assert sorted(UTTERANCE_ID.findall(context)) == sorted(expected)
+    assert comp.current_size == sum(len(t) for t in comp.context)
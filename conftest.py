@@ -0,0 +1,34 @@
+import pytest
+
+import realtime_stt
+from renderer.base import BaseRenderer
+
+
+class ListRenderer(BaseRenderer):
+    # Relies on the full-list fallback of BaseRenderer.apply
+    def __init__(self):
+        super().__init__()
+        self.snapshots = []
+
+    def render(self, translations):
+        self.snapshots.append(list(translations))
+
+    def run(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr(realtime_stt, "transcript_log_path", str(tmp_path / "t.log"))
+    monkeypatch.setattr(realtime_stt, "transcript_with_translation_log_path", str(tmp_path / "tt.log"))
+    monkeypatch.setattr(realtime_stt, "text_queue", realtime_stt.LoopQueue())
+    monkeypatch.setattr(realtime_stt, "tracer", realtime_stt.LatencyTracer())
+    realtime_stt.transcript.clear()
+    renderer = ListRenderer()
+    realtime_stt.enqueue_text.renderer = renderer
+    yield renderer
+    realtime_stt.close_transcript_logs()
+    realtime_stt.transcript.clear()
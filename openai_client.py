@@ -0,0 +1,250 @@
+import asyncio
+import math
+import os
+import random
+import threading
+import time
+
+import openai
+from openai import AsyncOpenAI, OpenAI
+
+# Lower numbers go first: live translation must never wait behind background work
+PRIORITY_TRANSLATION = 0
+PRIORITY_COMPRESSION = 1
+
+# Rough characters per token, used to estimate a request's size before sending it
+CHARS_PER_TOKEN = 4
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a call can't be admitted or retried before its deadline.
+    """
+
+
+def estimate_tokens(messages: list[dict], max_tokens: int) -> int:
+    """
+    Tokens a request counts against the TPM limit: prompt size plus max_tokens,
+    which is how the API reserves them.
+    """
+    chars = sum(len(str(m.get("content", ""))) for m in messages)
+    return math.ceil(chars / CHARS_PER_TOKEN) + max_tokens
+
+
+class TokenBucket:
+    """
+    Refills at `per_minute` units per minute up to `capacity` (one minute's worth by default).
+    Not thread-safe on its own; RateLimiter guards it.
+    """
+
+    def __init__(self, per_minute: float, capacity: float | None = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float, reserve: float = 0.0) -> float:
+        """
+        Seconds until `amount` can be taken while leaving `reserve` units in the bucket.
+        """
+        self._refill(now)
+        # A request bigger than the bucket only needs a full bucket
+        needed = min(amount + reserve, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute token buckets shared by every caller
+    of one API key.
+
+    Callers waiting with a higher priority (lower number) block admission of lower
+    priorities, and lower priorities may only use the buckets while more than
+    `background_reserve` of their capacity is left, so compression calls never
+    take the capacity live translation needs.
+    """
+
+    def __init__(self, rpm: float | None = None, tpm: float | None = None, background_reserve: float = 0.2):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.background_reserve = background_reserve
+        self._cond = threading.Condition()
+        self._waiting: dict[int, int] = {}
+
+    def _wait_time(self, tokens: int, priority: int) -> float:
+        # Seconds until the request may go; 0 means it was admitted and charged
+        if any(count for p, count in self._waiting.items() if p < priority):
+            return 0.05
+        now = time.monotonic()
+        wait = 0.0
+        for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+            if bucket is not None:
+                reserve = self.background_reserve * bucket.capacity if priority > PRIORITY_TRANSLATION else 0.0
+                wait = max(wait, bucket.wait_time(amount, now, reserve))
+        if wait == 0.0:
+            for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+                if bucket is not None:
+                    bucket.take(amount)
+        return wait
+
+    def _enter(self, priority: int) -> None:
+        self._waiting[priority] = self._waiting.get(priority, 0) + 1
+
+    def _leave(self, priority: int) -> None:
+        self._waiting[priority] -= 1
+        self._cond.notify_all()
+
+    def acquire(self, tokens: int, priority: int = PRIORITY_TRANSLATION, deadline: float | None = None) -> None:
+        """
+        Blocks until the request is admitted. Raises DeadlineExceeded if it can't be
+        admitted before `deadline` (a time.monotonic() value).
+        """
+        with self._cond:
+            self._enter(priority)
+            try:
+                while True:
+                    wait = self._wait_time(tokens, priority)
+                    if wait == 0.0:
+                        return
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= wait:
+                            raise DeadlineExceeded("Rate limit leaves no room before the deadline")
+                    self._cond.wait(wait)
+            finally:
+                self._leave(priority)
+
+    async def aacquire(self, tokens: int, priority: int = PRIORITY_TRANSLATION, deadline: float | None = None) -> None:
+        """
+        Async version of acquire(); sleeps on the event loop instead of blocking it.
+        """
+        with self._cond:
+            self._enter(priority)
+        try:
+            while True:
+                with self._cond:
+                    wait = self._wait_time(tokens, priority)
+                if wait == 0.0:
+                    return
+                if deadline is not None and deadline - time.monotonic() <= wait:
+                    raise DeadlineExceeded("Rate limit leaves no room before the deadline")
+                await asyncio.sleep(wait)
+        finally:
+            with self._cond:
+                self._leave(priority)
+
+
+def is_retryable(error: Exception) -> bool:
+    # Timeouts, connection errors, 408/409/429 and 5xx are worth another try
+    if isinstance(error, openai.APIConnectionError):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in (408, 409, 429) or error.status_code >= 500
+    return False
+
+
+def retry_after(error: Exception) -> float | None:
+    # Seconds the server asked us to wait, if it said so
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class OpenAIClient:
+    """
+    OpenAI client shared by the translator and the compressor of one API key.
+
+    Every chat completion goes through one RateLimiter sized to the org's RPM/TPM
+    limits, is retried on rate-limit, timeout, connection and 5xx errors with
+    jittered exponential backoff (honoring Retry-After), and never runs past its
+    per-call deadline. The SDK's own retries are turned off so this is the only
+    retry policy.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        max_retries: int = 4,
+        base_delay: float = 0.5,
+        max_delay: float = 8.0,
+    ):
+        if not api_key:
+            api_key = os.environ.get("OPENAI_API_KEY", "")
+        if not api_key:
+            raise ValueError("OpenAI API key must be provided")
+        self.api_key = api_key
+        self.client = OpenAI(api_key=api_key, max_retries=0)
+        self.limiter = RateLimiter(rpm, tpm)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retries = 0
+        self._random = random.Random()
+        # Async client, created on first use in the running event loop
+        self._async_client: AsyncOpenAI | None = None
+        self._async_loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
+            self._async_loop = loop
+        return self._async_client
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        # Full jitter spreads retries from both callers instead of retrying in lockstep
+        delay = self._random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        return max(delay, retry_after(error) or 0.0)
+
+    def _next_attempt(self, attempt: int, error: Exception, deadline: float) -> float:
+        # Returns the backoff before the next attempt, or re-raises if there won't be one
+        if not is_retryable(error) or attempt >= self.max_retries:
+            raise error
+        delay = self._backoff(attempt, error)
+        if time.monotonic() + delay >= deadline:
+            raise error
+        self.retries += 1
+        return delay
+
+    def create(self, priority: int = PRIORITY_TRANSLATION, timeout: float = 30.0, **kwargs):
+        """
+        chat.completions.create with rate limiting, retries and a `timeout` second deadline.
+        """
+        deadline = time.monotonic() + timeout
+        tokens = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 0))
+        attempt = 0
+        while True:
+            self.limiter.acquire(tokens, priority, deadline)
+            try:
+                return self.client.chat.completions.create(**kwargs, timeout=max(0.1, deadline - time.monotonic()))
+            except Exception as e:
+                time.sleep(self._next_attempt(attempt, e, deadline))
+                attempt += 1
+
+    async def acreate(self, priority: int = PRIORITY_TRANSLATION, timeout: float = 30.0, **kwargs):
+        """
+        Async version of create().
+        """
+        deadline = time.monotonic() + timeout
+        tokens = estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens", 0))
+        attempt = 0
+        while True:
+            await self.limiter.aacquire(tokens, priority, deadline)
+            try:
+                return await self.async_client.chat.completions.create(**kwargs, timeout=max(0.1, deadline - time.monotonic()))
+            except Exception as e:
+                await asyncio.sleep(self._next_attempt(attempt, e, deadline))
+                attempt += 1
@@ -2,10 +2,12 @@ from .base import BaseRenderer
 from .factory import get_renderer
 from .rich_render import RichRenderer
 from .html_fastaip_renderer import BrowserModalRenderer
+from .scheduler import RenderScheduler
 
 __all__ = [
     "BaseRenderer",
     "RichRenderer",
     "BrowserModalRenderer",
+    "RenderScheduler",
     "get_renderer",
 ]
\ No newline at end of file
@@ -1,10 +1,68 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Protocol, Tuple
+
+
+@dataclass(frozen=True)
+class RowChange:
+    """
+    A single change to the translations table.
+    kind is "append" for a new row (text is set) or "update" for a new translation;
+    an update with text set replaces the row text as well.
+    """
+    kind: str
+    row_id: int
+    translation: str
+    text: str | None = None
+
+
+class RowHistory(Protocol):
+    """
+    Source of rows older than the renderer window, e.g. transcript.TranscriptStore.
+    page() returns rows with ID below before_id, newest first.
+    """
+    def page(self, before_id: int | None = None, limit: int = 100) -> list: ...
+
+
+class MetricsSource(Protocol):
+    """
+    Pipeline latency statistics, e.g. tracing.LatencyTracer.
+    summary() maps interval names to {"count", "p50", "p95", "p99"};
+    prometheus() returns the same data in Prometheus text format.
+    """
+    def summary(self) -> dict: ...
+
+    def prometheus(self) -> str: ...
+
 
 class BaseRenderer(ABC):
     """
     Abstract base class for renderers.
     """
+    def __init__(self, max_rows: int = 1000):
+        # The most recent rows, row ID -> (text, translation), oldest first.
+        # Capped at max_rows so memory and redraw cost don't grow with the session.
+        self._window: OrderedDict[int, Tuple[str, str]] = OrderedDict()
+        self._max_rows = max_rows
+        # Rows arrive from the recorder and translation threads at the same time
+        self._window_lock = threading.RLock()
+        self._history: RowHistory | None = None
+        self._metrics: MetricsSource | None = None
+
+    def set_history(self, history: RowHistory):
+        """
+        Attach a source for rows that no longer fit in the window.
+        """
+        self._history = history
+
+    def set_metrics(self, metrics: MetricsSource):
+        """
+        Attach pipeline latency statistics for renderers that can show or serve them.
+        """
+        self._metrics = metrics
+
     @abstractmethod
     def render(self, translations: List[Tuple[str, str]]):
         """
@@ -12,6 +70,56 @@ class BaseRenderer(ABC):
         """
         pass
 
+    def append_row(self, row_id: int, text: str, translation: str):
+        """
+        Add a new row to the end of the table.
+        """
+        self.apply([RowChange("append", row_id, translation, text)])
+
+    def update_row(self, row_id: int, translation: str, text: str | None = None):
+        """
+        Replace the translation (and optionally the text) of an existing row.
+        """
+        self.apply([RowChange("update", row_id, translation, text)])
+
+    def apply(self, changes: List[RowChange]):
+        """
+        Apply a batch of row changes.
+        The default updates the row window and falls back to render() with its rows;
+        renderers that can draw deltas should override this.
+        """
+        self._apply_to_window(changes)
+        with self._window_lock:
+            rows = list(self._window.values())
+        self.render(rows)
+
+    def _apply_to_window(self, changes: List[RowChange]):
+        """
+        Apply changes to the row window. Updates for rows outside it are ignored.
+        """
+        with self._window_lock:
+            for change in changes:
+                if change.kind == "append":
+                    self._window[change.row_id] = (change.text or "", change.translation)
+                    if len(self._window) > self._max_rows:
+                        self._window.popitem(last=False)
+                elif change.row_id in self._window:
+                    text, _ = self._window[change.row_id]
+                    if change.text is not None:
+                        text = change.text
+                    self._window[change.row_id] = (text, change.translation)
+
+    def _replace_window(self, translations: List[Tuple[str, str]]):
+        """
+        Refill the window from a full list of rows.
+        Without IDs, a row's position in the list stands in for its ID.
+        """
+        with self._window_lock:
+            self._window.clear()
+            start = max(0, len(translations) - self._max_rows)
+            for row_id in range(start, len(translations)):
+                self._window[row_id] = translations[row_id]
+
     @abstractmethod
     def run(self):
         """
@@ -34,4 +142,4 @@ class BaseRenderer(ABC):
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.stop()
         # не подавляем исключения
-        return False
\ No newline at end of file
+        return False
@@ -1,14 +1,28 @@
+from typing import Callable, Iterable
+
 from .base import BaseRenderer
 from .rich_render import RichRenderer
 from .html_fastaip_renderer import BrowserModalRenderer
+from .scheduler import RenderScheduler
 
-def get_renderer(engine: str, target: str,  api_key: str | None = None) -> BaseRenderer:
+def get_renderer(
+    engine: str,
+    target: str,
+    api_key: str | None = None,
+    show_stats: bool = False,
+    fps: float = 0.0,
+    on_frame: Callable[[Iterable[int]], None] | None = None,
+) -> BaseRenderer:
     """
     Factory function to get the appropriate renderer.
+    With fps > 0 it is wrapped in a RenderScheduler drawing at most fps frames per second.
     """
     if engine == "rich":
-        return RichRenderer()
+        renderer = RichRenderer(refresh_per_second=fps or 2, show_stats=show_stats)
     elif engine == "html_fastaip":
-        return BrowserModalRenderer(api_key=api_key, target=target)
+        renderer = BrowserModalRenderer(api_key=api_key, target=target)
     else:
-        raise ValueError(f"Unknown rendering engine: {engine}")
\ No newline at end of file
+        raise ValueError(f"Unknown rendering engine: {engine}")
+    if fps > 0:
+        renderer = RenderScheduler(renderer, fps=fps, on_frame=on_frame)
+    return renderer
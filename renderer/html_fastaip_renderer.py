@@ -1,20 +1,40 @@
-from .base import BaseRenderer
+from .base import BaseRenderer, RowChange
+from .sse_hub import SSEHub
+from collections import deque
 from typing import List, Tuple
-from threading import Thread
+from threading import Lock, Thread
+import json
 import time
 import os
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, StreamingResponse
 import uvicorn
-import asyncio
 from openai import AsyncOpenAI
 
 
 
 
+def format_event(event_id: int, event: str, data: str) -> str:
+    """One Server-Sent Events message."""
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+
 class BrowserModalRenderer(BaseRenderer):
-    def __init__(self, target: str,  api_key: str | None = None, host: str = "0.0.0.0", port: int = 8090):#"127.0.0.1"
-        super().__init__() 
+    """
+    Serves the translations table to browsers.
+
+    Changes are pushed over /events as versioned Server-Sent Events: "rows"
+    (a batch of row appends/updates), "context" (context and LLM answer) and
+    "snapshot" (reload the first /translations page). Each event ID is the
+    table version after it; /translations reports the version its page
+    reflects in the X-Version header, so the page only replays newer deltas. The last `event_log_size` events are kept so a
+    reconnecting browser (Last-Event-ID) gets what it missed, or a snapshot
+    event if that is no longer available. Each browser buffers at most
+    `client_buffer` events; one that falls further behind gets a snapshot
+    event instead (see SSEHub).
+    """
+    def __init__(self, target: str,  api_key: str | None = None, host: str = "0.0.0.0", port: int = 8090, max_rows: int = 1000, event_log_size: int = 1000, client_buffer: int = 256):#"127.0.0.1"
+        super().__init__(max_rows=max_rows)
         if not api_key:
             api_key = os.environ.get("OPENAI_API_KEY", "")
         if not api_key:
@@ -23,13 +43,16 @@ class BrowserModalRenderer(BaseRenderer):
         self.port = port
         self.target = target
         self.app = FastAPI()
-        self._translations: List[Tuple[str, str]] = []
         self._server_thread: Thread | None = None
         self._uvicorn_server = None
-        self._sse_clients = []
         self.client = AsyncOpenAI(api_key=api_key)
         self._context_text = ""
         self._llm_response = ""
+        # Version of the table and the recent events as (id, event, JSON data)
+        self._version = 0
+        self._event_log: deque[tuple[int, str, str]] = deque(maxlen=event_log_size)
+        self._events_lock = Lock()
+        self._hub = SSEHub(self._snapshot_event, buffer_size=client_buffer)
 
 
         @self.app.get("/", response_class=HTMLResponse)
@@ -98,16 +121,48 @@ class BrowserModalRenderer(BaseRenderer):
                 <script>
                   let context = [];
                   let suppressContextUpdate = false;
+                  // Row events received while a snapshot page loads, as [version, changes]
+                  let pendingRows = null;
+                  let snapshotGeneration = 0;
 
                   async function fetchTranslations() {{
+                    // First page of the table, newest first: [text, translation, row_id],
+                    // and the version of the table the page was read at
                     const resp = await fetch('/translations');
                     const data = await resp.json();
-                    updateTable(data);
+                    return {{version: Number(resp.headers.get('X-Version')), data}};
+                  }}
+
+                  async function loadSnapshot() {{
+                    // Deltas arriving during the fetch may or may not be in the page:
+                    // hold them back and replay those newer than the page afterwards
+                    const generation = ++snapshotGeneration;
+                    if (pendingRows === null) pendingRows = [];
+                    let page = null;
+                    try {{
+                      page = await fetchTranslations();
+                    }} catch (e) {{
+                      console.error('Failed to load translations', e);
+                    }}
+                    // A later snapshot is loading and will replay the buffer
+                    if (generation !== snapshotGeneration) return;
+                    const buffered = pendingRows;
+                    pendingRows = null;
+                    if (page) {{
+                      const tbody = document.getElementById('tableBody');
+                      tbody.replaceChildren(...page.data.map(([src, dst, rowId]) => makeRow(rowId, src, dst)));
+                    }}
+                    for (const [version, changes] of buffered) {{
+                      if (!page || version > page.version) applyRows(changes);
+                    }}
                   }}
 
                   async function fetchContextAndLLM() {{
                     const resp = await fetch('/context_llm');
-                    const data = await resp.json();
+                    showContext(await resp.json());
+                  }}
+
+                  function showContext(data) {{
                     suppressContextUpdate = true;
                     document.getElementById('contextArea').innerText = data.context || "";
                     context = (data.context || "").split('\\n');
@@ -115,33 +170,44 @@ class BrowserModalRenderer(BaseRenderer):
                     suppressContextUpdate = false;
                   }}
 
-                  function updateTable(data) {{
-                    const tbody = document.getElementById('tableBody');
-                    tbody.innerHTML = '';
-                    data.forEach(([src, dst], idx) => {{
-                      const tr = document.createElement('tr');
-                      tr.innerHTML = `
-                        <td style="font-size:0.85rem;">${{src}}</td>
-                        <td style="font-size:0.85rem;">${{dst}}</td>
-                        <td>
-                          <button class="btn btn-sm btn-success" onclick="addToContext(${{idx}})">+</button>
-                        </td>
-                      `;
-                      tbody.appendChild(tr);
-                    }});
-                    window._lastTranslations = data;
+                  function makeRow(rowId, src, dst) {{
+                    const tr = document.createElement('tr');
+                    tr.dataset.rowId = rowId;
+                    tr.innerHTML = `
+                      <td class="src" style="font-size:0.85rem;"></td>
+                      <td class="dst" style="font-size:0.85rem;"></td>
+                      <td>
+                        <button class="btn btn-sm btn-success">+</button>
+                      </td>
+                    `;
+                    tr.querySelector('.src').textContent = src;
+                    tr.querySelector('.dst').textContent = dst;
+                    tr.querySelector('button').onclick = () => addToContext(tr);
+                    return tr;
                   }}
 
-                  function addToContext(idx) {{
-                    const data = window._lastTranslations || [];
-                    if (data[idx]) {{
-                      const text = data[idx][0];
-                      context.push(text);
-                      updateContextArea();
-                      sendContextUpdate();
+                  function applyRows(changes) {{
+                    // Patch only the rows that changed; newest rows go on top
+                    const tbody = document.getElementById('tableBody');
+                    for (const change of changes) {{
+                      let tr = tbody.querySelector(`tr[data-row-id="${{change.row_id}}"]`);
+                      if (!tr) {{
+                        if (change.kind !== 'append') continue;
+                        tr = makeRow(change.row_id, change.text || '', change.translation);
+                        tbody.prepend(tr);
+                        continue;
+                      }}
+                      if (change.text !== undefined) tr.querySelector('.src').textContent = change.text;
+                      tr.querySelector('.dst').textContent = change.translation;
                     }}
                   }}
 
+                  function addToContext(tr) {{
+                    context.push(tr.querySelector('.src').textContent);
+                    updateContextArea();
+                    sendContextUpdate();
+                  }}
+
                   function updateContextArea() {{
                     const area = document.getElementById('contextArea');
                     area.innerText = context.join('\\n');
@@ -179,16 +245,19 @@ class BrowserModalRenderer(BaseRenderer):
                     // Response and context will be updated via SSE
                   }}
 
-                  // SSE for updating translations and context/LLM
+                  // SSE carries row and context changes; after a reconnect the browser
+                  // sends Last-Event-ID and gets the missed events or a snapshot event
                   const evtSource = new EventSource('/events');
-                  evtSource.onmessage = function(event) {{
-                    fetchTranslations();
+                  evtSource.addEventListener('rows', event => {{
+                    const changes = JSON.parse(event.data);
+                    if (pendingRows !== null) pendingRows.push([Number(event.lastEventId), changes]);
+                    else applyRows(changes);
+                  }});
+                  evtSource.addEventListener('context', event => showContext(JSON.parse(event.data)));
+                  evtSource.addEventListener('snapshot', () => {{
+                    loadSnapshot();
                     fetchContextAndLLM();
-                  }};
-
-                  // Initial load
-                  fetchTranslations();
-                  fetchContextAndLLM();
+                  }});
                 </script>
               </body>
             </html>
@@ -196,8 +265,25 @@ class BrowserModalRenderer(BaseRenderer):
             return HTMLResponse(content=html)
 
         @self.app.get("/translations")
-        async def get_translations():
-            return JSONResponse(self._translations)
+        async def get_translations(before_id: int | None = None, limit: int = 200):
+            """
+            One page of rows, newest first, as [text, translation, row_id].
+            Pass the smallest row_id seen as before_id to get the next older page.
+            The X-Version header is the table version the page includes: row
+            events with a higher ID are not in it yet.
+            """
+            # Read before the page: changes reach the window before their event
+            # is published, so every event up to this version is in the page
+            version = self._snapshot_event()[0]
+            page = self._page(before_id, max(1, min(limit, 1000)))
+            return JSONResponse(page, headers={"X-Version": str(version)})
+
+        @self.app.get("/metrics")
+        async def metrics():
+            """Pipeline latency summaries and SSE client lag in Prometheus text format."""
+            body = self._metrics.prometheus() if self._metrics is not None else ""
+            body += self._hub.prometheus()
+            return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
 
         @self.app.get("/context_llm")
         async def get_context_llm():
@@ -213,31 +299,44 @@ class BrowserModalRenderer(BaseRenderer):
             # Clear LLM response when context changes
             self._llm_response = ""
             # Notify all clients
-            for queue in list(self._sse_clients):
-                try:
-                    queue.put_nowait(True)
-                except Exception:
-                    pass
+            self._publish_context()
             return JSONResponse({"ok": True})
 
         @self.app.get("/events")
         async def sse(request: Request):
             async def event_generator():
-                queue = asyncio.Queue()
-                self._sse_clients.append(queue)
+                # Subscribe here rather than in the endpoint: if the response is
+                # never streamed, the finally below still runs and no client leaks.
+                # Subscribe before reading the log so no event falls in between.
+                client = self._hub.subscribe()
                 try:
+                    backlog = self._events_since(request.headers.get("last-event-id"))
+                    if backlog is None:
+                        sent, event, data = self._snapshot_event()
+                        yield format_event(sent, event, data)
+                    else:
+                        # Resume: replay what the client missed
+                        sent = int(request.headers["last-event-id"])
+                        for entry in backlog:
+                            sent = entry[0]
+                            yield format_event(*entry)
+                    client.sent_id = sent
                     while True:
                         # Exit if client disconnects
                         if await request.is_disconnected():
                             break
-                        try:
-                            await asyncio.wait_for(queue.get(), timeout=15)
-                            yield "data: update\n\n"
-                        except asyncio.TimeoutError:
+                        entry = await client.get(timeout=15)
+                        if entry is None:
                             # Keep-alive ping
                             yield ": keep-alive\n\n"
+                            continue
+                        # Already sent as part of the backlog or a snapshot
+                        if entry[0] <= sent and entry[1] != "snapshot":
+                            continue
+                        sent = client.sent_id = entry[0]
+                        yield format_event(*entry)
                 finally:
-                    self._sse_clients.remove(queue)
+                    self._hub.unsubscribe(client)
             return StreamingResponse(event_generator(), media_type="text/event-stream")
 
         @self.app.post("/llm_context")
@@ -269,11 +368,7 @@ class BrowserModalRenderer(BaseRenderer):
 
             self._llm_response = await my_llm_ask(context_text)
             # Notify all clients
-            for queue in list(self._sse_clients):
-                try:
-                    queue.put_nowait(True)
-                except Exception:
-                    pass
+            self._publish_context()
             return JSONResponse({"response": self._llm_response})
 
     def run(self):
@@ -290,21 +385,80 @@ class BrowserModalRenderer(BaseRenderer):
         # Give the server time to start
         time.sleep(0.5)
 
+    def _page(self, before_id: int | None, limit: int) -> list:
+        """Rows with ID below before_id, newest first, from history if attached."""
+        if self._history is not None:
+            return [[r.text, r.translation, r.row_id] for r in self._history.page(before_id, limit)]
+        page = []
+        with self._window_lock:
+            for row_id in reversed(self._window):
+                if len(page) >= limit:
+                    break
+                if before_id is None or row_id < before_id:
+                    text, translation = self._window[row_id]
+                    page.append([text, translation, row_id])
+        return page
+
     def render(self, translations: List[Tuple[str, str]]):
         """Update data and send event to clients."""
-        self._translations = translations[::-1]
-        # Notify all subscribed clients
-        for queue in list(self._sse_clients):
-            try:
-                queue.put_nowait(True)
-            except Exception:
-                pass
+        self._replace_window(translations)
+        # Row IDs are positions here, so clients reload rather than patch
+        self._publish("snapshot", {})
         # Open browser only on first run
         # if not hasattr(self, "_browser_opened"):
             # url = f"http://{self.host}:{self.port}/"
             # webbrowser.open(url)
             # self._browser_opened = True
 
+    def apply(self, changes: List[RowChange]):
+        """Apply row changes in place and send them to clients as one event."""
+        self._apply_to_window(changes)
+        rows = []
+        for change in changes:
+            row = {"kind": change.kind, "row_id": change.row_id, "translation": change.translation}
+            if change.text is not None:
+                row["text"] = change.text
+            rows.append(row)
+        self._publish("rows", rows)
+
+    def _publish_context(self):
+        self._publish("context", {"context": self._context_text, "llm_response": self._llm_response})
+
+    def _publish(self, event: str, payload) -> None:
+        """Record an event under the next version and send it to all clients."""
+        data = json.dumps(payload, ensure_ascii=False)
+        with self._events_lock:
+            self._version += 1
+            entry = (self._version, event, data)
+            self._event_log.append(entry)
+            # Under the lock so clients get the events in version order
+            self._hub.publish(entry)
+
+    def _snapshot_event(self) -> tuple[int, str, str]:
+        with self._events_lock:
+            return self._version, "snapshot", "{}"
+
+    def _events_since(self, last_event_id: str | None) -> list | None:
+        """
+        Events after last_event_id, or None if the client needs a snapshot:
+        no ID, an ID from another server run, or events that left the log.
+        """
+        try:
+            last = int(last_event_id)
+        except (TypeError, ValueError):
+            return None
+        with self._events_lock:
+            if last > self._version:
+                return None
+            oldest = self._event_log[0][0] if self._event_log else self._version + 1
+            if last < oldest - 1:
+                return None
+            return [entry for entry in self._event_log if entry[0] > last]
+
+    def client_stats(self) -> list[dict]:
+        """Per-client SSE buffer and lag stats, see SSEHub.stats()."""
+        return self._hub.stats()
+
     def stop(self):
         """Stop the server."""
         if self._uvicorn_server and self._uvicorn_server.should_exit is False:
@@ -1,73 +1,267 @@
-from .base  import BaseRenderer
+from .base  import BaseRenderer, RowChange
 from rich.live import Live
-from rich.console import Console
+from rich.console import Console, ConsoleOptions, Group, RenderResult
+from rich.segment import Segment
+from rich.style import Style
 from rich.table import Table
+from rich.text import Text
 from rich.box import SIMPLE_HEAVY
 
-from typing import List, Tuple
+import os
+import select
+import sys
+import threading
+from itertools import zip_longest
+from typing import Callable, List, Tuple
+
+try:
+    import termios
+    import tty
+except ImportError:  # Windows: no key bindings
+    termios = None
+
+# Escape sequences and keys -> scroll action
+SCROLL_KEYS = {
+    "\x1b[A": "up", "k": "up",
+    "\x1b[B": "down", "j": "down",
+    "\x1b[5~": "page_up", "b": "page_up",
+    "\x1b[6~": "page_down", " ": "page_down",
+    "\x1b[H": "oldest", "\x1b[1~": "oldest", "g": "oldest",
+    "\x1b[F": "newest", "\x1b[4~": "newest", "G": "newest",
+}
+
+COLUMN_SEPARATOR = " │ "
+
+_Line = List[Segment]
+
+
+class _Lines:
+    """
+    Pre-rendered lines, yielded as they are without measuring them again.
+    """
+    def __init__(self, lines: List[_Line]):
+        self.lines = lines
+
+    def __rich_console__(self, console: Console, options: ConsoleOptions) -> RenderResult:
+        for line in self.lines:
+            yield from line
+            yield Segment.line()
+
+
+class _KeyReader:
+    """
+    Reads keys from a terminal stdin in cbreak mode on a daemon thread and passes
+    the scroll action of each bound key to `on_action`.
+    """
+    def __init__(self, on_action: Callable[[str], None]):
+        self.on_action = on_action
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._saved = None
+
+    def start(self) -> bool:
+        if termios is None or not sys.stdin.isatty():
+            return False
+        fd = sys.stdin.fileno()
+        self._saved = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+        self._thread = threading.Thread(target=self._run, args=(fd,), name="rich-keys", daemon=True)
+        self._thread.start()
+        return True
+
+    def _run(self, fd: int):
+        while not self._stop.is_set():
+            ready, _, _ = select.select([fd], [], [], 0.2)
+            if not ready:
+                continue
+            key = os.read(fd, 8).decode(errors="ignore")
+            action = SCROLL_KEYS.get(key)
+            if action:
+                self.on_action(action)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self._saved is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._saved)
+            self._saved = None
+
 
 class RichRenderer(BaseRenderer):
     """
     Renderer implementation using Rich.
+
+    The table is virtualized: each row is wrapped to the terminal width once per
+    version of the row and its lines are cached, and a frame only lays out the
+    rows that fit on screen, newest first. Updating one row re-wraps only that
+    row. Up/Down (j/k), PgUp/PgDn (b/space), Home/End (g/G) scroll back through
+    the row window.
     """
-    def __init__(self, refresh_per_second: int = 2):
-        super().__init__()
-        self.console = Console()
+    def __init__(
+        self,
+        refresh_per_second: int = 2,
+        console: Console | None = None,
+        max_rows: int = 500,
+        show_stats: bool = False,
+        key_bindings: bool = True,
+    ):
+        super().__init__(max_rows=max_rows)
+        self.console = console or Console()
+        # Show latency percentiles of the attached metrics under the table
+        self.show_stats = show_stats
         self._live = Live(
-            console=self.console, 
+            console=self.console,
             refresh_per_second=refresh_per_second,
-            screen=True, 
-            redirect_stderr=False, 
+            screen=True,
+            redirect_stderr=False,
             redirect_stdout=False
         )
-        self._table_data = []
+        # Row ID -> version, bumped on every change of the row
+        self._versions: dict[int, int] = {}
+        # Row ID -> (version, width, wrapped lines)
+        self._row_cache: dict[int, Tuple[int, int, List[_Line]]] = {}
+        # Rows hidden above the top of the screen, counted from the newest one
+        self._scroll = 0
+        self._page_rows = 1
+        # Frames come from the render scheduler, scrolling from the key thread
+        self._draw_lock = threading.Lock()
+        self._keys = _KeyReader(self.scroll) if key_bindings else None
 
     def render(self, translations: List[Tuple[str, str]]):
         """
         Build and update the Rich table from translations.
         """
-        # table = Table(title="Translations")
-        # table.add_column("Text")
-        # table.add_column("Translation")
-        
-        # # Add rows in reverse order
-        # for text, translation in reversed(translations):
-        #     table.add_row(text, translation)
-        
-        # self._live.update(table)
-        # self._live.refresh()
-        
-        header_lines = 3
-        term_height = self.console.size.height or 20
-        max_visible = term_height - header_lines
-        if max_visible < 1:
-            max_visible = len(translations)
-
-        visible = translations[-max_visible:]
-        visible = list(reversed(visible))
-
-        tbl = Table(
-            show_header=True,
-            header_style="bold magenta",
-            show_lines=True,
-            box=SIMPLE_HEAVY,
+        self._replace_window(translations)
+        # Row IDs are positions here, so every cached row may be stale
+        with self._window_lock:
+            self._versions.clear()
+            self._row_cache.clear()
+        self._draw()
+
+    def apply(self, changes: List[RowChange]):
+        """
+        Apply row changes to the visible window and redraw it.
+        Work depends on the rows on screen, not on the length of the session.
+        """
+        self._apply_to_window(changes)
+        with self._window_lock:
+            for change in changes:
+                self._versions[change.row_id] = self._versions.get(change.row_id, 0) + 1
+                if change.kind == "append" and self._scroll:
+                    # Keep the rows being read in place while new ones arrive
+                    self._scroll += 1
+            if len(self._versions) > 2 * self._max_rows:
+                for row_id in [r for r in self._versions if r not in self._window]:
+                    self._versions.pop(row_id, None)
+                    self._row_cache.pop(row_id, None)
+        self._draw()
+
+    def scroll(self, action: str):
+        """
+        Scroll the table: up/down by a row, page_up/page_down by a screen,
+        oldest/newest to either end of the row window.
+        """
+        with self._window_lock:
+            last = max(0, len(self._window) - 1)
+            step = {"up": 1, "down": -1, "page_up": self._page_rows, "page_down": -self._page_rows}
+            if action == "oldest":
+                self._scroll = last
+            elif action == "newest":
+                self._scroll = 0
+            else:
+                self._scroll = min(last, max(0, self._scroll + step[action]))
+        self._draw()
+
+    def _row_lines(self, row_id: int, text: str, translation: str, width: int) -> List[_Line]:
+        # Caller holds _window_lock
+        version = self._versions.get(row_id, 0)
+        cached = self._row_cache.get(row_id)
+        if cached is not None and cached[0] == version and cached[1] == width:
+            return cached[2]
+        lines = self._wrap_row(text, translation, width)
+        self._row_cache[row_id] = (version, width, lines)
+        return lines
+
+    def _wrap_row(self, text: str, translation: str, width: int) -> List[_Line]:
+        left_width = max(1, (width - len(COLUMN_SEPARATOR)) // 2)
+        right_width = max(1, width - len(COLUMN_SEPARATOR) - left_width)
+        options = self.console.options.update(no_wrap=False)
+        left = self.console.render_lines(
+            Text(text, style="dim", overflow="fold"), options.update_width(left_width), pad=True
+        )
+        right = self.console.render_lines(
+            Text(translation, style="green", overflow="fold"), options.update_width(right_width), pad=True
         )
-        tbl.add_column("Text", style="dim", no_wrap=False, overflow="fold")
-        tbl.add_column("Translation", style="green", no_wrap=False, overflow="fold")
+        separator = Segment(COLUMN_SEPARATOR, Style(dim=True))
+        lines = [
+            (l or [Segment(" " * left_width)]) + [separator] + (r or [Segment(" " * right_width)])
+            for l, r in zip_longest(left, right)
+        ]
+        lines.append([Segment("─" * width, Style(dim=True))])
+        return lines
 
-        for t, tr in visible:
-            tbl.add_row(t, tr)
+    def _header(self, width: int) -> List[_Line]:
+        left_width = max(1, (width - len(COLUMN_SEPARATOR)) // 2)
+        style = Style(bold=True, color="magenta")
+        title = [Segment("Text".ljust(left_width), style), Segment(COLUMN_SEPARATOR, Style(dim=True)), Segment("Translation", style)]
+        if self._scroll:
+            title.append(Segment(f"  ↑ {self._scroll} newer (End)", Style(color="yellow")))
+        return [title, [Segment("━" * width, Style(dim=True))]]
 
-        self._live.update(tbl)
-        self._live.refresh()
+    def _draw(self):
+        with self._draw_lock:
+            stats = self._stats_table() if self.show_stats and self._metrics is not None else None
+            width = self.console.size.width or 80
+            height = self.console.size.height or 20
+            available = height - 2
+            if stats is not None:
+                available -= stats.row_count + 4
+
+            lines = self._header(width)
+            body: List[_Line] = []
+            with self._window_lock:
+                skipped = 0
+                drawn = 0
+                for row_id in reversed(self._window):
+                    if skipped < self._scroll:
+                        skipped += 1
+                        continue
+                    text, translation = self._window[row_id]
+                    row = self._row_lines(row_id, text, translation, width)
+                    if body and len(body) + len(row) > available:
+                        break
+                    body.extend(row)
+                    drawn += 1
+                self._page_rows = max(1, drawn)
+            lines.extend(body[:max(1, available)])
+
+            view = _Lines(lines)
+            # Live redraws the terminal on its own refresh_per_second timer
+            self._live.update(Group(view, stats) if stats is not None else view)
+
+    def _stats_table(self) -> Table:
+        stats = Table(title="Latency, ms", box=SIMPLE_HEAVY, header_style="bold cyan")
+        for column in ("Stage", "Count", "p50", "p95", "p99"):
+            stats.add_column(column, justify="left" if column == "Stage" else "right")
+        for name, values in self._metrics.summary().items():
+            if "p50" not in values:
+                stats.add_row(name, str(values["count"]), "", "", "")
+                continue
+            stats.add_row(name, str(values["count"]), *(f"{values[p] * 1000:.0f}" for p in ("p50", "p95", "p99")))
+        return stats
 
     def run(self):
         """
         Start the Rich live table rendering and run the recorder.
         """
         self._live.start()
+        if self._keys is not None:
+            self._keys.start()
 
     def stop(self):
         """Останавливаем Live и возвращаем терминал в обычный режим"""
+        if self._keys is not None:
+            self._keys.stop()
         self._live.stop()
-
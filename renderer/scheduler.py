@@ -0,0 +1,164 @@
+import logging
+import threading
+import time
+from typing import Callable, Iterable, List, Tuple
+
+from .base import BaseRenderer, MetricsSource, RowChange, RowHistory
+
+
+def coalesce_changes(changes: List[RowChange]) -> List[RowChange]:
+    """
+    Folds later changes of a row into its first change in the batch, so each row
+    is drawn once with its latest text and translation.
+    """
+    out: List[RowChange] = []
+    index: dict[int, int] = {}
+    for change in changes:
+        i = index.get(change.row_id)
+        if i is None or change.kind == "append":
+            index[change.row_id] = len(out)
+            out.append(change)
+            continue
+        previous = out[i]
+        text = change.text if change.text is not None else previous.text
+        out[i] = RowChange(previous.kind, change.row_id, change.translation, text)
+    return out
+
+
+class RenderScheduler(BaseRenderer):
+    """
+    Sits between the pipeline and a renderer: render()/apply() only record the
+    change and return, and a frame thread draws everything recorded since the
+    last frame at most `fps` times per second. A burst of updates costs one draw,
+    and producers never wait for terminal or network output.
+
+    `on_frame` is called with the IDs of the rows drawn in each frame.
+    """
+
+    def __init__(
+        self,
+        renderer: BaseRenderer,
+        fps: float = 10.0,
+        on_frame: Callable[[Iterable[int]], None] | None = None,
+    ):
+        super().__init__(max_rows=0)
+        if fps <= 0:
+            raise ValueError("fps must be positive")
+        self.renderer = renderer
+        self.interval = 1.0 / fps
+        self.on_frame = on_frame
+        self._cond = threading.Condition()
+        # Serializes frames drawn by the thread and by flush()
+        self._draw_lock = threading.Lock()
+        self._changes: List[RowChange] = []
+        self._snapshot: List[Tuple[str, str]] | None = None
+        self._requests = 0
+        self._stopping = False
+        self._thread: threading.Thread | None = None
+        # render()/apply() calls, frames drawn, calls that shared a frame with
+        # an earlier one, and row changes overwritten before they were drawn
+        self.requests = 0
+        self.frames = 0
+        self.merged_frames = 0
+        self.dropped_changes = 0
+
+    def set_history(self, history: RowHistory):
+        self.renderer.set_history(history)
+
+    def set_metrics(self, metrics: MetricsSource):
+        self.renderer.set_metrics(metrics)
+
+    def render(self, translations: List[Tuple[str, str]]):
+        """
+        Schedule a full redraw; changes not drawn yet are superseded by it.
+        """
+        with self._cond:
+            self.dropped_changes += len(self._changes)
+            self._changes = []
+            self._snapshot = list(translations)
+            self._request()
+
+    def apply(self, changes: List[RowChange]):
+        """
+        Schedule row changes for the next frame.
+        """
+        with self._cond:
+            self._changes.extend(changes)
+            self._request()
+
+    def _request(self):
+        # Caller holds _cond
+        self._requests += 1
+        self.requests += 1
+        self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "requests": self.requests,
+                "frames": self.frames,
+                "merged_frames": self.merged_frames,
+                "dropped_changes": self.dropped_changes,
+            }
+
+    def flush(self):
+        """
+        Draw everything scheduled so far now, in the calling thread.
+        """
+        with self._draw_lock:
+            with self._cond:
+                snapshot, changes, requests = self._snapshot, self._changes, self._requests
+                self._snapshot, self._changes, self._requests = None, [], 0
+                if not requests:
+                    return
+                coalesced = coalesce_changes(changes)
+                self.frames += 1
+                self.merged_frames += requests - 1
+                self.dropped_changes += len(changes) - len(coalesced)
+            if snapshot is not None:
+                self.renderer.render(snapshot)
+            if coalesced:
+                self.renderer.apply(coalesced)
+        if self.on_frame is not None:
+            rows = {change.row_id for change in coalesced}
+            if snapshot is not None:
+                rows.update(range(len(snapshot)))
+            self.on_frame(rows)
+
+    def _run(self):
+        last_frame = 0.0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._requests or self._stopping)
+                if self._stopping and not self._requests:
+                    return
+                # Keep collecting until the frame is due; stopping draws right away
+                delay = last_frame + self.interval - time.monotonic()
+                if delay > 0:
+                    self._cond.wait_for(lambda: self._stopping, delay)
+            try:
+                self.flush()
+            except Exception:
+                logging.exception("Render frame failed")
+            last_frame = time.monotonic()
+
+    def run(self):
+        """
+        Start the wrapped renderer and the frame thread.
+        """
+        self.renderer.run()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="render-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Draw what is still scheduled, then stop the frame thread and the wrapped renderer.
+        """
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        self.renderer.stop()
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from collections import deque
+from typing import Callable
+
+# (event ID, event name, JSON data)
+Event = tuple[int, str, str]
+
+
+class SSEClient:
+    """
+    One connected browser: a bounded buffer of events waiting to be sent.
+
+    Lives on the server's event loop. When the buffer is full the client has
+    fallen too far behind to be worth catching up event by event, so the buffer
+    is dropped and the next event it gets is a snapshot.
+    """
+    def __init__(self, client_id: int, buffer_size: int, snapshot: Callable[[], Event]):
+        self.client_id = client_id
+        self._buffer: deque[Event] = deque()
+        self._buffer_size = buffer_size
+        self._snapshot = snapshot
+        self._behind = False
+        self._wake = asyncio.Event()
+        # ID of the last event written to the stream (set by the stream), events
+        # thrown away on overflow and the number of times the client was reset
+        # to a snapshot
+        self.sent_id = 0
+        self.dropped = 0
+        self.snapshots = 0
+
+    def push(self, entry: Event):
+        # Called on the event loop only
+        if self._behind:
+            self.dropped += 1
+            return
+        if len(self._buffer) >= self._buffer_size:
+            self.dropped += len(self._buffer) + 1
+            self.snapshots += 1
+            self._buffer.clear()
+            self._behind = True
+        else:
+            self._buffer.append(entry)
+        self._wake.set()
+
+    async def get(self, timeout: float) -> Event | None:
+        """
+        The next event to send, a snapshot event if the client fell behind,
+        or None after `timeout` seconds without events.
+        """
+        if not self._buffer and not self._behind:
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self._behind:
+            self._behind = False
+            return self._snapshot()
+        return self._buffer.popleft()
+
+    @property
+    def queued(self) -> int:
+        return len(self._buffer)
+
+
+class SSEHub:
+    """
+    Broadcasts events from producer threads to SSE clients on the server's
+    event loop.
+
+    publish() may be called from any thread: it hands the event to the loop
+    with call_soon_threadsafe, and only the loop touches client buffers. Each
+    client buffers at most `buffer_size` events (see SSEClient), so a stalled
+    browser tab costs bounded memory and never delays the others.
+    """
+    def __init__(self, snapshot: Callable[[], Event], buffer_size: int = 256):
+        if buffer_size < 1:
+            raise ValueError("buffer_size must be positive")
+        self.buffer_size = buffer_size
+        self._snapshot = snapshot
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._clients: dict[int, SSEClient] = {}
+        self._next_id = 0
+        # ID of the newest event delivered to the clients
+        self._latest = 0
+        # Guards the loop and the client table; stats() may run on any thread
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> SSEClient:
+        """Register a client; must be called on the server's event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._loop = loop
+            self._next_id += 1
+            client = SSEClient(self._next_id, self.buffer_size, self._snapshot)
+            client.sent_id = self._latest
+            self._clients[client.client_id] = client
+        return client
+
+    def unsubscribe(self, client: SSEClient):
+        with self._lock:
+            self._clients.pop(client.client_id, None)
+
+    def publish(self, entry: Event):
+        """Queue an event for every client; safe to call from any thread."""
+        with self._lock:
+            if self._loop is None or not self._clients:
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._deliver, entry)
+            except RuntimeError:
+                # The loop was closed with the server
+                self._loop = None
+
+    def _deliver(self, entry: Event):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._latest = max(self._latest, entry[0])
+        for client in clients:
+            client.push(entry)
+
+    def stats(self) -> list[dict]:
+        """
+        Per client: events waiting in its buffer, how many events it is behind
+        the newest one, events dropped on overflow and snapshot resets.
+        """
+        with self._lock:
+            clients = list(self._clients.values())
+            latest = self._latest
+        return [
+            {
+                "client": client.client_id,
+                "queued": client.queued,
+                "lag": max(0, latest - client.sent_id),
+                "dropped": client.dropped,
+                "snapshots": client.snapshots,
+            }
+            for client in clients
+        ]
+
+    def prometheus(self) -> str:
+        """Per-client stats in Prometheus text format."""
+        stats = self.stats()
+        lines = []
+        for name, key in (
+            ("queued_events", "queued"),
+            ("lag_events", "lag"),
+            ("dropped_events_total", "dropped"),
+            ("snapshots_total", "snapshots"),
+        ):
+            for client in stats:
+                lines.append(f'sse_client_{name}{{client="{client["client"]}"}} {client[key]}\n')
+        return "".join(lines)
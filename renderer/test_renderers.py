@@ -0,0 +1,353 @@
+import asyncio
+import io
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from rich.console import Console
+
+from .base import BaseRenderer, RowChange
+from .rich_render import RichRenderer
+from .html_fastaip_renderer import BrowserModalRenderer
+from .scheduler import RenderScheduler, coalesce_changes
+
+
+class SnapshotRenderer(BaseRenderer):
+    def __init__(self):
+        super().__init__()
+        self.snapshots = []
+
+    def render(self, translations):
+        self.snapshots.append(translations)
+
+    def run(self):
+        pass
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def rich_renderer():
+    console = Console(file=io.StringIO(), width=80, height=20)
+    return RichRenderer(console=console, max_rows=5)
+
+
+@pytest.fixture
+def html_renderer():
+    return BrowserModalRenderer(target="ru", api_key="test-key")
+
+
+def test_base_window_is_bounded():
+    renderer = SnapshotRenderer()
+    renderer._max_rows = 3
+    for row_id in range(5):
+        renderer.append_row(row_id, f"t{row_id}", "...")
+    assert renderer.snapshots[-1] == [("t2", "..."), ("t3", "..."), ("t4", "...")]
+
+
+def test_base_apply_falls_back_to_full_render():
+    renderer = SnapshotRenderer()
+    renderer.append_row(0, "hello", "...")
+    renderer.append_row(1, "hello", "...")
+    renderer.update_row(1, "привет")
+    renderer.update_row(99, "ignored")
+    assert renderer.snapshots[-1] == [("hello", "..."), ("hello", "привет")]
+    assert len(renderer.snapshots) == 4
+
+
+def test_base_apply_batches_changes():
+    renderer = SnapshotRenderer()
+    renderer.apply([
+        RowChange("append", 0, "...", "a"),
+        RowChange("update", 0, "A"),
+        RowChange("append", 1, "...", "b"),
+    ])
+    assert renderer.snapshots == [[("a", "A"), ("b", "...")]]
+
+
+def test_rich_window_is_bounded(rich_renderer):
+    for row_id in range(20):
+        rich_renderer.append_row(row_id, f"t{row_id}", "...")
+    assert list(rich_renderer._window) == [15, 16, 17, 18, 19]
+    rich_renderer.update_row(19, "done")
+    rich_renderer.update_row(0, "evicted row is ignored")
+    assert rich_renderer._window[19] == ("t19", "done")
+    assert 0 not in rich_renderer._window
+
+
+def test_rich_render_fallback_keeps_latest_rows(rich_renderer):
+    rich_renderer.render([(f"t{i}", "x") for i in range(8)])
+    assert list(rich_renderer._window) == [3, 4, 5, 6, 7]
+
+
+def test_html_translations_newest_first(html_renderer):
+    html_renderer.append_row(0, "one", "...")
+    html_renderer.append_row(1, "two", "...")
+    html_renderer.update_row(0, "раз")
+    client = TestClient(html_renderer.app)
+    assert client.get("/translations").json() == [["two", "...", 1], ["one", "раз", 0]]
+
+
+def test_html_translations_report_their_version(html_renderer):
+    client = TestClient(html_renderer.app)
+    html_renderer.append_row(0, "one", "...")
+    html_renderer.update_row(0, "раз")
+    resp = client.get("/translations")
+    # Both row events are reflected in the page, so the browser replays none of them
+    assert resp.headers["X-Version"] == "2"
+    assert resp.json() == [["one", "раз", 0]]
+    html_renderer.append_row(1, "two", "...")
+    assert client.get("/translations").headers["X-Version"] == "3"
+
+
+def test_html_translations_paginate_through_history(html_renderer):
+    from transcript import TranscriptStore, SQLiteHistory
+
+    store = TranscriptStore(hot_rows=10, history=SQLiteHistory(), spill_batch=5)
+    for i in range(40):
+        store.append(f"t{i}", "x")
+    html_renderer.set_history(store)
+    client = TestClient(html_renderer.app)
+    first = client.get("/translations", params={"limit": 15}).json()
+    assert [row[2] for row in first] == list(range(39, 24, -1))
+    older = client.get("/translations", params={"limit": 15, "before_id": first[-1][2]}).json()
+    assert [row[2] for row in older] == list(range(24, 9, -1))
+
+
+class StaticMetrics:
+    def summary(self):
+        return {"total": {"count": 3, "p50": 0.1, "p95": 0.2, "p99": 0.3}, "in_flight": {"count": 1}}
+
+    def prometheus(self):
+        return 'pipeline_stage_seconds_count{stage="total"} 3\n'
+
+
+def test_rich_stats_table_lists_percentiles():
+    console = Console(file=io.StringIO(), width=80, height=30)
+    renderer = RichRenderer(console=console, show_stats=True)
+    renderer.set_metrics(StaticMetrics())
+    stats = renderer._stats_table()
+    assert stats.row_count == 2
+    renderer.append_row(0, "hello", "...")
+    # The percentiles stay under the table after a row change
+    shown = screen(renderer)
+    assert "hello" in shown
+    assert "Latency, ms" in shown
+    assert "total" in shown and "in_flight" in shown
+
+
+def test_html_metrics_endpoint(html_renderer):
+    client = TestClient(html_renderer.app)
+    assert client.get("/metrics").text == ""
+    html_renderer.set_metrics(StaticMetrics())
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'stage="total"' in response.text
+
+
+class SlowRenderer(SnapshotRenderer):
+    def __init__(self, delay=0.0):
+        super().__init__()
+        self.delay = delay
+        self.batches = []
+
+    def apply(self, changes):
+        time.sleep(self.delay)
+        self.batches.append(changes)
+        super().apply(changes)
+
+
+def test_coalesce_changes_keeps_latest_per_row():
+    changes = [
+        RowChange("append", 1, "...", "hello"),
+        RowChange("update", 1, "при"),
+        RowChange("update", 2, "мир", "world"),
+        RowChange("update", 1, "привет"),
+    ]
+    assert coalesce_changes(changes) == [RowChange("append", 1, "привет", "hello"), RowChange("update", 2, "мир", "world")]
+
+
+def test_scheduler_merges_a_burst_into_one_frame():
+    inner = SlowRenderer()
+    drawn = []
+    scheduler = RenderScheduler(inner, fps=5, on_frame=drawn.append)
+    with scheduler:
+        scheduler.append_row(0, "hello", "...")
+        time.sleep(0.05)
+        for i in range(100):
+            scheduler.update_row(0, f"partial {i}")
+        scheduler.append_row(1, "world", "...")
+    # The first request gets a frame right away, the burst shares the next one
+    assert scheduler.frames == 2
+    assert scheduler.merged_frames == 100
+    assert scheduler.dropped_changes == 99
+    assert inner.snapshots[-1] == [("hello", "partial 99"), ("world", "...")]
+    assert drawn[-1] == {0, 1}
+
+
+def test_scheduler_producers_do_not_wait_for_drawing():
+    inner = SlowRenderer(delay=0.2)
+    scheduler = RenderScheduler(inner, fps=50)
+    with scheduler:
+        start = time.perf_counter()
+        for i in range(20):
+            scheduler.append_row(i, f"t{i}", "...")
+            time.sleep(0.001)
+        elapsed = time.perf_counter() - start
+    assert elapsed < 0.2
+    assert len(inner.snapshots[-1]) == 20
+    assert scheduler.frames < 20
+
+
+def test_scheduler_full_render_supersedes_pending_changes():
+    inner = SlowRenderer()
+    scheduler = RenderScheduler(inner, fps=1)
+    scheduler.append_row(0, "old", "...")
+    scheduler.render([("a", "b")])
+    scheduler.flush()
+    assert inner.snapshots == [[("a", "b")]]
+    assert scheduler.dropped_changes == 1
+
+
+def screen(renderer):
+    console = Console(file=io.StringIO(), width=80, height=20)
+    console.print(renderer._live.renderable)
+    return console.file.getvalue()
+
+
+@pytest.fixture
+def counted_wraps(rich_renderer, monkeypatch):
+    wrapped = []
+    wrap = rich_renderer._wrap_row
+
+    def counting(text, translation, width):
+        wrapped.append(text)
+        return wrap(text, translation, width)
+
+    monkeypatch.setattr(rich_renderer, "_wrap_row", counting)
+    return wrapped
+
+
+def test_rich_update_rewraps_one_row(rich_renderer, counted_wraps):
+    for row_id in range(3):
+        rich_renderer.append_row(row_id, f"t{row_id}", "...")
+    counted_wraps.clear()
+    rich_renderer.update_row(1, "done")
+    assert counted_wraps == ["t1"]
+    assert "done" in screen(rich_renderer)
+
+
+def test_rich_lays_out_only_rows_that_fit(counted_wraps, rich_renderer):
+    rich_renderer._max_rows = 500
+    rich_renderer.render([(f"row {i} " + "long words " * 10, "x") for i in range(500)])
+    # A 20 line terminal fits a handful of wrapped rows; the rest are never measured
+    assert len(counted_wraps) < 10
+    assert "row 499" in screen(rich_renderer)
+    assert "row 0 " not in screen(rich_renderer)
+
+
+def test_rich_scrollback(rich_renderer):
+    for row_id in range(5):
+        rich_renderer.append_row(row_id, f"t{row_id}", "...")
+    rich_renderer.scroll("up")
+    assert screen(rich_renderer).index("t3") < screen(rich_renderer).index("t2")
+    assert "t4" not in screen(rich_renderer)
+    # New rows don't move the rows being read
+    rich_renderer.append_row(5, "t5", "...")
+    assert "t4" not in screen(rich_renderer) and "t3" in screen(rich_renderer)
+    rich_renderer.scroll("oldest")
+    assert "↑ 4 newer" in screen(rich_renderer)
+    assert "t1" in screen(rich_renderer) and "t2" not in screen(rich_renderer)
+    rich_renderer.scroll("newest")
+    assert "t5" in screen(rich_renderer)
+
+
+class FakeRequest:
+    def __init__(self, headers):
+        self.headers = headers
+
+    async def is_disconnected(self):
+        return True
+
+
+def read_events(renderer, headers):
+    # Runs /events until it notices the (fake) disconnect after the first messages
+    endpoint = next(route.endpoint for route in renderer.app.routes if route.path == "/events")
+
+    async def collect():
+        response = await endpoint(FakeRequest(headers))
+        return "".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(collect())
+
+
+def test_html_pushes_versioned_row_deltas(html_renderer):
+    html_renderer.append_row(0, "one", "...")
+    html_renderer.update_row(0, "раз")
+    assert [entry[:2] for entry in html_renderer._event_log] == [(1, "rows"), (2, "rows")]
+    assert json.loads(html_renderer._event_log[-1][2]) == [{"kind": "update", "row_id": 0, "translation": "раз"}]
+
+
+def test_html_sse_resumes_from_last_event_id(html_renderer):
+    for row_id in range(3):
+        html_renderer.append_row(row_id, f"t{row_id}", "...")
+    body = read_events(html_renderer, {"last-event-id": "1"})
+    assert body.startswith("id: 2\nevent: rows\n")
+    assert "id: 3\n" in body and "id: 1\n" not in body
+    # A new client, or one too far behind, starts with a snapshot at the current version
+    assert read_events(html_renderer, {}) == "id: 3\nevent: snapshot\ndata: {}\n\n"
+    html_renderer._event_log.popleft()
+    assert "event: snapshot" in read_events(html_renderer, {"last-event-id": "0"})
+    assert "event: snapshot" in read_events(html_renderer, {"last-event-id": "99"})
+
+
+def test_html_full_render_sends_snapshot(html_renderer):
+    html_renderer.render([("a", "b")])
+    assert html_renderer._event_log[-1][1] == "snapshot"
+
+
+def test_html_events_endpoint_does_not_leak_unstreamed_clients(html_renderer):
+    endpoint = next(route.endpoint for route in html_renderer.app.routes if route.path == "/events")
+    # The response is dropped before it is streamed, e.g. the client went away
+    asyncio.run(endpoint(FakeRequest({})))
+    read_events(html_renderer, {})
+    assert html_renderer.client_stats() == []
+
+
+def test_sse_hub_wakes_clients_from_producer_threads(html_renderer):
+    async def scenario():
+        client = html_renderer._hub.subscribe()
+        producer = threading.Thread(target=lambda: [html_renderer.append_row(i, f"t{i}", "...") for i in range(3)])
+        producer.start()
+        received = [await client.get(timeout=2) for _ in range(3)]
+        producer.join()
+        return received
+
+    received = asyncio.run(scenario())
+    assert [entry[:2] for entry in received] == [(1, "rows"), (2, "rows"), (3, "rows")]
+
+
+def test_sse_hub_resets_slow_client_to_snapshot():
+    renderer = BrowserModalRenderer(target="ru", api_key="test-key", client_buffer=3)
+
+    async def scenario():
+        slow = renderer._hub.subscribe()
+        fast = renderer._hub.subscribe()
+        for i in range(10):
+            renderer.append_row(i, f"t{i}", "...")
+            # Let the loop deliver the event, then the fast client sends it
+            await asyncio.sleep(0)
+            fast.sent_id = (await fast.get(timeout=1))[0]
+        stats = {client["client"]: client for client in renderer.client_stats()}
+        return await slow.get(timeout=1), stats[slow.client_id], stats[fast.client_id]
+
+    snapshot, slow, fast = asyncio.run(scenario())
+    # The slow client's buffer stays bounded and it reloads from the current version
+    assert slow == {"client": 1, "queued": 0, "lag": 10, "dropped": 10, "snapshots": 1}
+    assert snapshot == (10, "snapshot", "{}")
+    # The other client is not held back
+    assert fast == {"client": 2, "queued": 0, "lag": 0, "dropped": 0, "snapshots": 0}
+    assert 'sse_client_lag_events{client="1"} 10' in renderer._hub.prometheus()
@@ -0,0 +1,187 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+
+from transcript import PENDING_TRANSLATION
+
+# Marks text and translations of a row that is still being spoken
+PROVISIONAL_SUFFIX = " …"
+# Characters that end a clause, so the text before them is unlikely to change
+CLAUSE_END = ".,!?;:"
+
+
+def stable_prefix(text: str) -> str:
+    """
+    Trims a partial transcription to whole words: the last word may still be
+    rewritten by the next realtime pass unless it ends a clause.
+    """
+    text = " ".join(text.split())
+    if not text or text[-1] in CLAUSE_END:
+        return text
+    return text.rsplit(" ", 1)[0] if " " in text else ""
+
+
+def same_text(a: str, b: str) -> bool:
+    return " ".join(a.split()).casefold() == " ".join(b.split()).casefold()
+
+
+class Speculator:
+    """
+    Translates stable prefixes of the utterance currently being spoken, before the
+    recorder finalizes it, and shows them as a provisional row.
+
+    on_partial() is fed from the realtime transcription callback. When the final
+    text arrives, finalize() hands over the provisional row; if the last speculation
+    was for exactly the final text, claim() lets the translation loop reuse it
+    instead of sending a new request. Superseded or mismatched speculations are
+    cancelled and counted as wasted calls.
+    """
+
+    def __init__(
+        self,
+        translator,
+        loop: asyncio.AbstractEventLoop,
+        transcript,
+        renderer,
+        min_chars: int = 12,
+        min_growth: int = 8,
+        log_every: int = 20,
+    ):
+        self.translator = translator
+        self.loop = loop
+        self.transcript = transcript
+        self.renderer = renderer
+        self.min_chars = min_chars
+        self.min_growth = min_growth
+        self.log_every = log_every
+        self._finalized = 0
+        self._lock = threading.Lock()
+        # State of the utterance being spoken
+        self._row_id: int | None = None
+        self._prefix = ""
+        self._future: concurrent.futures.Future | None = None
+        self._started_at = 0.0
+        # Row ID -> (future, started_at, finalized_at) for speculations matching the final text
+        self._claims: dict[int, tuple[concurrent.futures.Future, float, float]] = {}
+        # Reported numbers
+        self.calls = 0
+        self.reused = 0
+        self.wasted = 0
+        self.saved_seconds = 0.0
+
+    def on_partial(self, text: str) -> None:
+        """
+        Called with each stabilized partial transcription of the current utterance.
+        """
+        prefix = stable_prefix(text)
+        with self._lock:
+            if len(prefix) < self.min_chars or same_text(prefix, self._prefix):
+                return
+            if prefix.startswith(self._prefix) and len(prefix) - len(self._prefix) < self.min_growth:
+                return
+            if self._row_id is None:
+                self._row_id = self.transcript.append(prefix + PROVISIONAL_SUFFIX, PENDING_TRANSLATION)
+                self.renderer.append_row(self._row_id, prefix + PROVISIONAL_SUFFIX, PENDING_TRANSLATION)
+            else:
+                self.transcript.update(self._row_id, PENDING_TRANSLATION, prefix + PROVISIONAL_SUFFIX)
+                self.renderer.update_row(self._row_id, PENDING_TRANSLATION, prefix + PROVISIONAL_SUFFIX)
+            self._supersede()
+            self._prefix = prefix
+            self._started_at = time.monotonic()
+            self.calls += 1
+            self._future = asyncio.run_coroutine_threadsafe(self._speculate(self._row_id, prefix), self.loop)
+
+    def _supersede(self) -> None:
+        # Called with the lock held: the running speculation won't be used
+        if self._future is not None:
+            self._future.cancel()
+            self.wasted += 1
+            self._future = None
+
+    async def _speculate(self, row_id: int, prefix: str) -> tuple[str, float]:
+        # Returns (translation, monotonic time it finished)
+        translation = await self.translator.atranslate_with_context(prefix, self.translator.get_context())
+        finished_at = time.monotonic()
+        with self._lock:
+            current = self._row_id == row_id and self._prefix == prefix
+        if current:
+            self.transcript.update(row_id, translation + PROVISIONAL_SUFFIX)
+            self.renderer.update_row(row_id, translation + PROVISIONAL_SUFFIX)
+        return translation, finished_at
+
+    def finalize(self, text: str) -> int | None:
+        """
+        Called with the final text of the utterance. Returns the provisional row ID
+        to reuse for it, or None if nothing was speculated.
+        """
+        with self._lock:
+            self._finalized += 1
+            if self.log_every and self._finalized % self.log_every == 0:
+                self.loop.call_soon_threadsafe(self.log_stats)
+            row_id, self._row_id = self._row_id, None
+            if row_id is None:
+                return None
+            if self._future is not None and same_text(self._prefix, text):
+                self._claims[row_id] = (self._future, self._started_at, time.monotonic())
+                self._future = None
+            else:
+                self._supersede()
+            self._prefix = ""
+            return row_id
+
+    def claim(self, row_id: int) -> tuple[concurrent.futures.Future, float, float] | None:
+        """
+        Takes the speculation that matches the final text of row_id, if any.
+        """
+        with self._lock:
+            return self._claims.pop(row_id, None)
+
+    async def reuse(self, claim: tuple[concurrent.futures.Future, float, float]) -> str | None:
+        """
+        Waits for a claimed speculation. Returns its translation, or None if it failed
+        and the utterance has to be translated normally.
+        """
+        future, started_at, finalized_at = claim
+        try:
+            translation, finished_at = await asyncio.wrap_future(future)
+        except (Exception, asyncio.CancelledError) as e:
+            logging.debug(f"Speculative translation not usable: {e!r}")
+            self.record_waste()
+            return None
+        if not self.translator.is_cacheable(translation):
+            self.record_waste()
+            return None
+        self.record_reuse(started_at, finalized_at, finished_at)
+        return translation
+
+    def record_reuse(self, started_at: float, finalized_at: float, finished_at: float) -> None:
+        """
+        Counts a reused speculation. The saving is the part of the request that ran
+        before the final text arrived, i.e. latency the speaker no longer waits for.
+        """
+        with self._lock:
+            self.reused += 1
+            self.saved_seconds += max(0.0, min(finished_at, finalized_at) - started_at)
+
+    def record_waste(self) -> None:
+        with self._lock:
+            self.wasted += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "reused": self.reused,
+                "wasted": self.wasted,
+                "saved_seconds": self.saved_seconds,
+                "saved_per_reuse": self.saved_seconds / self.reused if self.reused else 0.0,
+            }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logging.info(
+            f"Speculation: {stats['calls']} call(s), {stats['reused']} reused, {stats['wasted']} wasted, "
+            f"{stats['saved_seconds']:.2f}s saved ({stats['saved_per_reuse']:.2f}s per reused utterance)"
+        )
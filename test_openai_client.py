@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import openai
+import pytest
+
+from openai_client import (
+    DeadlineExceeded,
+    OpenAIClient,
+    PRIORITY_COMPRESSION,
+    PRIORITY_TRANSLATION,
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+)
+
+
+def status_error(cls, status, retry_after=None):
+    headers = {"retry-after": retry_after} if retry_after is not None else {}
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return cls("error", response=httpx.Response(status, request=request, headers=headers), body=None)
+
+
+@pytest.fixture
+def client():
+    client = OpenAIClient("test-key", base_delay=0.01, max_delay=0.02)
+    client.client.chat.completions.create = MagicMock()
+    return client
+
+
+def test_estimate_counts_prompt_and_max_tokens():
+    assert estimate_tokens([{"role": "user", "content": "x" * 40}], 100) == 110
+
+
+def test_bucket_refills_over_time():
+    bucket = TokenBucket(per_minute=600)
+    bucket.take(600)
+    assert bucket.wait_time(1, time.monotonic()) == pytest.approx(0.1, abs=0.01)
+    assert bucket.wait_time(1, time.monotonic() + 0.2) == 0.0
+
+
+def test_limiter_waits_for_refill_and_respects_deadline():
+    limiter = RateLimiter(rpm=600)
+    limiter.requests.take(limiter.requests.level)
+    start = time.monotonic()
+    limiter.acquire(0)
+    assert 0.05 < time.monotonic() - start < 0.5
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire(0, deadline=time.monotonic() + 0.01)
+
+
+def test_compression_keeps_out_of_reserved_capacity():
+    limiter = RateLimiter(tpm=6000, background_reserve=0.5)
+    limiter.tokens.take(4000)
+    # 2000 left: enough for a translation, but compression must leave half the bucket
+    limiter.acquire(1000, PRIORITY_TRANSLATION, deadline=time.monotonic() + 0.05)
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire(100, PRIORITY_COMPRESSION, deadline=time.monotonic() + 0.05)
+
+
+def test_waiting_translation_blocks_compression():
+    limiter = RateLimiter(rpm=600, background_reserve=0.0)
+    limiter.requests.take(limiter.requests.level)
+    order = []
+
+    def call(priority, delay):
+        time.sleep(delay)
+        limiter.acquire(0, priority)
+        order.append(priority)
+
+    threads = [
+        threading.Thread(target=call, args=(PRIORITY_COMPRESSION, 0.0)),
+        threading.Thread(target=call, args=(PRIORITY_TRANSLATION, 0.02)),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Compression asked first, but the bucket's next slot goes to translation
+    assert order == [PRIORITY_TRANSLATION, PRIORITY_COMPRESSION]
+
+
+def test_retries_rate_limit_then_succeeds(client):
+    create = client.client.chat.completions.create
+    create.side_effect = [status_error(openai.RateLimitError, 429, "0"), "ok"]
+    assert client.create(model="m", messages=[], max_tokens=1) == "ok"
+    assert create.call_count == 2
+    assert client.retries == 1
+    # The SDK gets the remaining deadline as its request timeout
+    assert 0 < create.call_args.kwargs["timeout"] <= 30
+
+
+def test_does_not_retry_client_errors(client):
+    client.client.chat.completions.create.side_effect = status_error(openai.BadRequestError, 400)
+    with pytest.raises(openai.BadRequestError):
+        client.create(model="m", messages=[])
+    assert client.client.chat.completions.create.call_count == 1
+
+
+def test_gives_up_when_backoff_would_pass_deadline(client):
+    client.client.chat.completions.create.side_effect = status_error(openai.RateLimitError, 429, "5")
+    start = time.monotonic()
+    with pytest.raises(openai.RateLimitError):
+        client.create(timeout=1.0, model="m", messages=[])
+    assert time.monotonic() - start < 0.5
+
+
+def test_async_create_retries_server_errors(client):
+    async def run():
+        create = AsyncMock(side_effect=[status_error(openai.InternalServerError, 503), "ok"])
+        client.async_client.chat.completions.create = create
+        return await client.acreate(model="m", messages=[]), create.await_count
+
+    assert asyncio.run(run()) == ("ok", 2)
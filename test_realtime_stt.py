@@ -0,0 +1,245 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+import realtime_stt
+from translator.base import BaseTranslator
+
+
+class DelayTranslator(BaseTranslator):
+    # Earlier utterances take longer, so replies arrive in reverse order
+    def __init__(self, delays: dict[str, float]):
+        super().__init__()
+        self.delays = delays
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def translate_with_context(self, text, context):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delays.get(text, 0))
+        with self._lock:
+            self.active -= 1
+        if text == "boom":
+            raise RuntimeError("backend down")
+        return text.upper()
+
+
+def run_loop(translator, renderer, texts, concurrency):
+    for text in texts:
+        realtime_stt.enqueue_text(text)
+    realtime_stt.text_queue.put(None)
+    asyncio.run(realtime_stt.run_translation_loop(translator, renderer, concurrency))
+
+
+def test_results_committed_in_utterance_order(pipeline, tmp_path):
+    translator = DelayTranslator({"one": 0.3, "two": 0.2, "three": 0.1})
+    run_loop(translator, pipeline, ["one", "two", "three"], concurrency=3)
+
+    assert realtime_stt.transcript.snapshot() == [("one", "ONE"), ("two", "TWO"), ("three", "THREE")]
+    assert translator.max_active == 3
+    realtime_stt.flush_transcript_logs()
+    logged = (tmp_path / "tt.log").read_text(encoding="utf-8").splitlines()
+    assert [line.split(" ", 1)[1] for line in logged] == ["one | ONE", "two | TWO", "three | THREE"]
+    # Every intermediate snapshot only ever fills translations from the top down
+    for snapshot in pipeline.snapshots:
+        done = [tr != "..." for _, tr in snapshot]
+        assert done == sorted(done, reverse=True)
+
+
+def test_concurrency_is_bounded(pipeline):
+    translator = DelayTranslator({f"t{i}": 0.05 for i in range(8)})
+    run_loop(translator, pipeline, [f"t{i}" for i in range(8)], concurrency=2)
+
+    assert translator.max_active == 2
+    assert all(tr == t.upper() for t, tr in realtime_stt.transcript.snapshot())
+
+
+def test_translation_error_is_committed_in_place(pipeline):
+    translator = DelayTranslator({})
+    run_loop(translator, pipeline, ["a", "boom", "b"], concurrency=2)
+
+    assert realtime_stt.transcript.snapshot() == [
+        ("a", "A"),
+        ("boom", "<error: backend down>"),
+        ("b", "B"),
+    ]
+
+
+def test_repeated_phrase_updates_its_own_row(pipeline):
+    # The second "yes" finishes first; it must not land in the first "yes" row
+    translator = DelayTranslator({})
+    first = realtime_stt.enqueue_text("yes")
+    second = realtime_stt.enqueue_text("yes")
+    realtime_stt.commit_translation(second, "yes", "SECOND", pipeline)
+
+    assert realtime_stt.transcript.get(first).translation == "..."
+    assert realtime_stt.transcript.get(second).translation == "SECOND"
+    realtime_stt.text_queue.put(None)
+    asyncio.run(realtime_stt.run_translation_loop(translator, pipeline, 1))
+
+
+def test_row_evicted_without_history_does_not_stop_the_loop(pipeline, monkeypatch, tmp_path):
+    from transcript import TranscriptStore
+
+    monkeypatch.setattr(realtime_stt, "transcript", TranscriptStore(hot_rows=2, spill_batch=1))
+    translator = DelayTranslator({"one": 0.2})
+    # "one" is pushed out of the hot window while it is being translated
+    run_loop(translator, pipeline, ["one", "two", "three"], concurrency=3)
+
+    assert realtime_stt.transcript.snapshot() == [("two", "TWO"), ("three", "THREE")]
+    realtime_stt.flush_transcript_logs()
+    logged = (tmp_path / "tt.log").read_text(encoding="utf-8").splitlines()
+    assert [line.split(" ", 1)[1] for line in logged] == ["one | ONE", "two | TWO", "three | THREE"]
+
+
+class BrokenTranslator(DelayTranslator):
+    def warmup(self):
+        raise ImportError("ctranslate2 is not installed")
+
+
+def test_failed_warmup_stops_the_app(pipeline, monkeypatch):
+    interrupted = []
+    monkeypatch.setattr(realtime_stt, "get_translator", lambda *args, **kwargs: BrokenTranslator({}))
+    monkeypatch.setattr(realtime_stt._thread, "interrupt_main", lambda: interrupted.append(True))
+    monkeypatch.setattr(realtime_stt, "startup_error", None)
+    for name, value in (("input_lang", "en"), ("translate_lang", "ru"), ("renderer", pipeline)):
+        monkeypatch.setattr(realtime_stt.translate_worker, name, value, raising=False)
+
+    asyncio.run(realtime_stt.translate_worker())
+
+    assert interrupted == [True]
+    assert isinstance(realtime_stt.startup_error, ImportError)
+
+
+def test_missing_openai_key_stops_the_app(pipeline, monkeypatch):
+    interrupted = []
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(realtime_stt._thread, "interrupt_main", lambda: interrupted.append(True))
+    monkeypatch.setattr(realtime_stt, "startup_error", None)
+    for name, value in (("input_lang", "en"), ("translate_lang", "ru"), ("renderer", pipeline), ("translator_type", "hedged")):
+        monkeypatch.setattr(realtime_stt.translate_worker, name, value, raising=False)
+
+    asyncio.run(realtime_stt.translate_worker())
+
+    assert interrupted == [True]
+    assert "API key" in str(realtime_stt.startup_error)
+
+
+class BatchTranslator(DelayTranslator):
+    def __init__(self, delays=None):
+        super().__init__(delays or {})
+        self.batches = []
+
+    def translate_batch_with_context(self, texts, context):
+        self.batches.append(list(texts))
+        return [text.upper() for text in texts]
+
+
+def test_queued_utterances_are_coalesced(pipeline):
+    translator = BatchTranslator()
+    for text in ["one", "two", "three", "four"]:
+        realtime_stt.enqueue_text(text)
+    realtime_stt.text_queue.put(None)
+    asyncio.run(realtime_stt.run_translation_loop(translator, pipeline, 1, coalesce_chars=100))
+
+    assert translator.batches == [["one", "two", "three", "four"]]
+    assert realtime_stt.transcript.snapshot() == [("one", "ONE"), ("two", "TWO"), ("three", "THREE"), ("four", "FOUR")]
+
+
+def test_coalesced_batches_respect_char_budget(pipeline):
+    translator = BatchTranslator()
+    for text in ["aaaa", "bbbb", "cccc", "dddd", "eeee"]:
+        realtime_stt.enqueue_text(text)
+    realtime_stt.text_queue.put(None)
+    asyncio.run(realtime_stt.run_translation_loop(translator, pipeline, 1, coalesce_chars=8))
+
+    assert translator.batches == [["aaaa", "bbbb"], ["cccc", "dddd"]]
+    assert [tr for _, tr in realtime_stt.transcript.snapshot()] == ["AAAA", "BBBB", "CCCC", "DDDD", "EEEE"]
+
+
+class StreamingTranslator(BaseTranslator):
+    def translate_stream_with_context(self, text, context, on_partial):
+        for end in range(1, len(text) + 1):
+            on_partial(text[:end].upper())
+        return text.upper()
+
+    def translate_with_context(self, text, context):
+        return text.upper()
+
+
+def test_streaming_pushes_throttled_partials(pipeline):
+    pipeline.snapshots.clear()
+    realtime_stt.enqueue_text("hello")
+    realtime_stt.text_queue.put(None)
+    # A long interval lets only the first partial through before the final result
+    asyncio.run(realtime_stt.run_translation_loop(StreamingTranslator(), pipeline, stream_interval=60))
+
+    translations = [snapshot[0][1] for snapshot in pipeline.snapshots]
+    assert translations == ["...", "H" + realtime_stt.STREAMING_SUFFIX, "HELLO"]
+    assert realtime_stt.transcript.snapshot() == [("hello", "HELLO")]
+
+
+def test_partial_publisher_records_first_token(pipeline):
+    row_id = realtime_stt.enqueue_text("hi")
+    publisher = realtime_stt.PartialPublisher(row_id, pipeline, interval=0)
+    publisher("H")
+    publisher("HI")
+    assert publisher.first_token_at is not None
+    assert publisher.pushes == 2
+    assert realtime_stt.transcript.get(row_id).translation == "HI" + realtime_stt.STREAMING_SUFFIX
+
+
+def test_loop_queue_hands_items_from_other_threads(pipeline):
+    received = []
+
+    async def consume():
+        realtime_stt.text_queue.bind(asyncio.get_running_loop())
+        feeder = threading.Thread(target=lambda: [realtime_stt.text_queue.put(i) for i in range(50)])
+        feeder.start()
+        for _ in range(50):
+            received.append(await asyncio.wait_for(realtime_stt.text_queue.get(), 2))
+        feeder.join()
+        realtime_stt.text_queue.unbind()
+
+    asyncio.run(consume())
+    assert received == list(range(50))
+
+
+def test_cancelling_the_loop_cancels_in_flight_requests(pipeline):
+    class HangingTranslator(BaseTranslator):
+        cancelled = False
+
+        def translate_with_context(self, text, context):
+            raise AssertionError("sync path must not be used")
+
+        async def atranslate_with_context(self, text, context):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                HangingTranslator.cancelled = True
+                raise
+
+    async def run_and_cancel():
+        realtime_stt.enqueue_text("stuck")
+        loop_task = asyncio.create_task(realtime_stt.run_translation_loop(HangingTranslator(), pipeline))
+        await asyncio.sleep(0.05)
+        loop_task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await loop_task
+        await asyncio.sleep(0)
+
+    asyncio.run(run_and_cancel())
+    assert HangingTranslator.cancelled
+
+
+def test_pipeline_traces_every_stage(pipeline):
+    run_loop(DelayTranslator({}), pipeline, ["one", "two"], concurrency=2)
+    summary = realtime_stt.tracer.summary()
+    for name in ("enqueue", "queue_wait", "dispatch", "translate", "commit_wait", "render", "total"):
+        assert summary[name]["count"] == 2
+    assert summary["in_flight"]["count"] == 0
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+
+import realtime_stt
+from speculation import Speculator, stable_prefix, PROVISIONAL_SUFFIX
+from translator.base import BaseTranslator
+
+
+class EchoTranslator(BaseTranslator):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def translate_with_context(self, text, context):
+        raise AssertionError("sync path must not be used")
+
+    async def atranslate_with_context(self, text, context):
+        self.requests.append(text)
+        await asyncio.sleep(0.01)
+        return text.upper()
+
+
+def test_stable_prefix_drops_unfinished_word():
+    assert stable_prefix("we will start the dem") == "we will start the"
+    assert stable_prefix("we will start,") == "we will start,"
+    assert stable_prefix("single") == ""
+
+
+def run_utterance(pipeline, partials, final):
+    """Feeds partials and the final text from a recorder-like thread while the loop runs."""
+    translator = EchoTranslator()
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        realtime_stt.speculator = Speculator(translator, loop, realtime_stt.transcript, pipeline, min_chars=5, min_growth=3)
+
+        def recorder():
+            for text in partials:
+                realtime_stt.on_realtime_text(text)
+                asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), loop).result()
+            realtime_stt.enqueue_text(final)
+            realtime_stt.text_queue.put(None)
+
+        thread = threading.Thread(target=recorder)
+        thread.start()
+        await realtime_stt.run_translation_loop(translator, pipeline)
+        await asyncio.to_thread(thread.join)
+
+    try:
+        asyncio.run(main())
+        return translator, realtime_stt.speculator.stats()
+    finally:
+        realtime_stt.speculator = None
+
+
+def test_matching_speculation_is_reused(pipeline):
+    translator, stats = run_utterance(pipeline, ["hello there my", "hello there my friend."], "Hello there my friend.")
+
+    assert realtime_stt.transcript.snapshot() == [("Hello there my friend.", "HELLO THERE MY FRIEND.")]
+    # One speculation per stable prefix and no request for the final text
+    assert translator.requests == ["hello there", "hello there my friend."]
+    assert stats["calls"] == 2
+    assert stats["reused"] == 1
+    assert stats["wasted"] == 1
+    assert stats["saved_seconds"] > 0
+    # The provisional row was shown with the speculative translation before the final text
+    shown = [snapshot[0] for snapshot in pipeline.snapshots]
+    assert ("hello there my friend." + PROVISIONAL_SUFFIX, "HELLO THERE MY FRIEND." + PROVISIONAL_SUFFIX) in shown
+
+
+def test_mismatched_final_text_is_translated_normally(pipeline):
+    translator, stats = run_utterance(pipeline, ["turn to the next"], "Turn to the last slide")
+
+    assert realtime_stt.transcript.snapshot() == [("Turn to the last slide", "TURN TO THE LAST SLIDE")]
+    assert translator.requests == ["turn to the", "Turn to the last slide"]
+    assert stats == pytest.approx({"calls": 1, "reused": 0, "wasted": 1, "saved_seconds": 0.0, "saved_per_reuse": 0.0})
+
+
+def test_utterance_without_partials_gets_new_row(pipeline):
+    translator, stats = run_utterance(pipeline, [], "ok")
+    assert realtime_stt.transcript.snapshot() == [("ok", "OK")]
+    assert stats["calls"] == 0
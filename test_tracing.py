@@ -0,0 +1,84 @@
+import pytest
+
+from tracing import LatencyTracer, RollingHistogram, STAGES
+
+
+def trace(tracer, row_id, start, step=0.1):
+    for i, stage in enumerate(STAGES[1:]):
+        tracer.mark(row_id, stage, start + i * step)
+
+
+def test_histogram_percentiles_use_recent_window():
+    histogram = RollingHistogram(window=100)
+    for value in range(1000):
+        histogram.add(float(value))
+    p = histogram.percentiles()
+    assert p[0.5] == 950.0
+    assert p[0.99] == 999.0
+    assert histogram.count == 1000
+
+
+def test_finished_trace_fills_interval_histograms():
+    tracer = LatencyTracer()
+    trace(tracer, 0, 10.0)
+    summary = tracer.summary()
+    assert summary["total"]["count"] == 1
+    assert summary["total"]["p50"] == pytest.approx(0.6)
+    assert summary["translate"]["p50"] == pytest.approx(0.1)
+    # No end-of-speech event was seen, so decode time is unknown
+    assert "decode" not in summary
+    assert summary["in_flight"]["count"] == 0
+
+
+def test_speech_end_attaches_to_next_utterance_only():
+    tracer = LatencyTracer()
+    tracer.speech_ended()
+    trace(tracer, 0, 1e9)
+    trace(tracer, 1, 2e9)
+    assert tracer.summary()["decode"]["count"] == 1
+
+
+def test_stages_before_recorded_and_repeats_are_ignored():
+    tracer = LatencyTracer()
+    tracer.mark(5, "translate_start", 1.0)
+    tracer.mark(5, "recorded", 2.0)
+    tracer.mark(5, "row_updated", 3.0)
+    tracer.mark(5, "row_updated", 9.0)
+    tracer.mark(5, "rendered", 4.0)
+    summary = tracer.summary()
+    assert "translate" not in summary
+    assert summary["render"]["p50"] == pytest.approx(1.0)
+
+
+def test_unfinished_traces_are_evicted():
+    tracer = LatencyTracer(max_open=3)
+    for row_id in range(10):
+        tracer.mark(row_id, "recorded")
+    assert tracer.summary()["in_flight"]["count"] == 3
+
+
+def test_rows_drawn_closes_only_committed_rows():
+    tracer = LatencyTracer()
+    tracer.mark(0, "recorded", 1.0)
+    tracer.mark(1, "recorded", 1.0)
+    tracer.mark(0, "row_updated", 2.0)
+    # Row 1 was drawn with a partial translation only
+    tracer.rows_drawn([0, 1, 2])
+    summary = tracer.summary()
+    assert summary["render"]["count"] == 1
+    assert summary["in_flight"]["count"] == 1
+
+
+def test_unknown_stage_raises():
+    with pytest.raises(ValueError):
+        LatencyTracer().mark(0, "nope")
+
+
+def test_prometheus_exposition():
+    tracer = LatencyTracer()
+    trace(tracer, 0, 0.0)
+    text = tracer.prometheus()
+    assert "# TYPE pipeline_stage_seconds summary" in text
+    assert 'pipeline_stage_seconds{stage="total",quantile="0.95"}' in text
+    assert 'pipeline_stage_seconds_count{stage="total"} 1' in text
+    assert "pipeline_utterances_in_flight 0" in text
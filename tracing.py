@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import OrderedDict, deque
+
+# Pipeline stages of one utterance, in the order they happen.
+# speech_end comes from the recorder's end-of-speech callback and may be missing.
+STAGES = (
+    "speech_end",
+    "recorded",
+    "enqueued",
+    "dequeued",
+    "translate_start",
+    "translate_end",
+    "row_updated",
+    "rendered",
+)
+
+# Reported intervals: name -> (from stage, to stage)
+INTERVALS = {
+    "decode": ("speech_end", "recorded"),
+    "enqueue": ("recorded", "enqueued"),
+    "queue_wait": ("enqueued", "dequeued"),
+    "dispatch": ("dequeued", "translate_start"),
+    "translate": ("translate_start", "translate_end"),
+    "commit_wait": ("translate_end", "row_updated"),
+    "render": ("row_updated", "rendered"),
+    "total": ("recorded", "rendered"),
+    "speech_to_screen": ("speech_end", "rendered"),
+}
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RollingHistogram:
+    """
+    Keeps the last `window` samples for percentiles, plus lifetime count and sum.
+    """
+
+    def __init__(self, window: int = 1000):
+        self._samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        self._samples.append(value)
+        self.count += 1
+        self.total += value
+
+    def percentiles(self, quantiles=QUANTILES) -> dict[float, float]:
+        ordered = sorted(self._samples)
+        if not ordered:
+            return {q: 0.0 for q in quantiles}
+        return {q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in quantiles}
+
+
+class LatencyTracer:
+    """
+    Records monotonic timestamps for each utterance (keyed by row ID) as it moves
+    through the pipeline, and turns finished traces into per-interval histograms.
+
+    mark() is called from the recorder thread, the event loop and renderer code, so
+    all state is guarded by one lock. A trace is closed when the "rendered" stage is
+    marked; traces that never finish (e.g. cancelled rows) are evicted once more than
+    `max_open` are pending.
+    """
+
+    def __init__(self, window: int = 1000, max_open: int = 1000):
+        self._lock = threading.Lock()
+        self._open: OrderedDict[int, dict[str, float]] = OrderedDict()
+        self._histograms = {name: RollingHistogram(window) for name in INTERVALS}
+        self._max_open = max_open
+        self._speech_end: float | None = None
+
+    def speech_ended(self) -> None:
+        """
+        Called when the recorder detects end of speech; attached to the next utterance.
+        """
+        with self._lock:
+            self._speech_end = time.monotonic()
+
+    def mark(self, row_id: int, stage: str, at: float | None = None) -> None:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage: {stage}")
+        at = time.monotonic() if at is None else at
+        with self._lock:
+            trace = self._open.get(row_id)
+            if trace is None:
+                if stage != "recorded":
+                    return
+                trace = self._open[row_id] = {}
+                if self._speech_end is not None:
+                    trace["speech_end"] = self._speech_end
+                    self._speech_end = None
+                if len(self._open) > self._max_open:
+                    self._open.popitem(last=False)
+            # Partial streaming pushes update the row many times; keep the first one
+            trace.setdefault(stage, at)
+            if stage == "rendered":
+                del self._open[row_id]
+                self._record(trace)
+
+    def rows_drawn(self, row_ids) -> None:
+        """
+        Marks "rendered" for the rows among row_ids whose final translation was
+        drawn, i.e. whose trace already has "row_updated". Used when rendering is
+        deferred to frames, so earlier partial updates don't close the trace.
+        """
+        at = time.monotonic()
+        with self._lock:
+            for row_id in row_ids:
+                trace = self._open.get(row_id)
+                if trace is not None and "row_updated" in trace:
+                    trace["rendered"] = at
+                    del self._open[row_id]
+                    self._record(trace)
+
+    def _record(self, trace: dict[str, float]) -> None:
+        for name, (start, end) in INTERVALS.items():
+            if start in trace and end in trace:
+                self._histograms[name].add(trace[end] - trace[start])
+
+    def summary(self) -> dict[str, dict]:
+        """
+        Interval name -> {"count", "p50", "p95", "p99"} in seconds, for intervals with samples.
+        """
+        with self._lock:
+            result = {}
+            for name, histogram in self._histograms.items():
+                if histogram.count:
+                    p = histogram.percentiles()
+                    result[name] = {"count": histogram.count, "p50": p[0.5], "p95": p[0.95], "p99": p[0.99]}
+            result_open = len(self._open)
+        result["in_flight"] = {"count": result_open}
+        return result
+
+    def prometheus(self) -> str:
+        """
+        The histograms as Prometheus summaries (text exposition format).
+        """
+        lines = [
+            "# HELP pipeline_stage_seconds Latency between pipeline stages of an utterance.",
+            "# TYPE pipeline_stage_seconds summary",
+        ]
+        with self._lock:
+            for name, histogram in self._histograms.items():
+                for q, value in histogram.percentiles().items():
+                    lines.append(f'pipeline_stage_seconds{{stage="{name}",quantile="{q}"}} {value:.6f}')
+                lines.append(f'pipeline_stage_seconds_sum{{stage="{name}"}} {histogram.total:.6f}')
+                lines.append(f'pipeline_stage_seconds_count{{stage="{name}"}} {histogram.count}')
+            in_flight = len(self._open)
+        lines += [
+            "# HELP pipeline_utterances_in_flight Utterances recorded but not yet rendered with a translation.",
+            "# TYPE pipeline_utterances_in_flight gauge",
+            f"pipeline_utterances_in_flight {in_flight}",
+        ]
+        return "\n".join(lines) + "\n"
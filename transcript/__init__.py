@@ -0,0 +1,12 @@
+from .store import TranscriptStore, TranscriptRow, PENDING_TRANSLATION
+from .history import SQLiteHistory
+from .log_writer import TranscriptLogWriter, LOG_FORMATS
+
+__all__ = [
+    "TranscriptStore",
+    "TranscriptRow",
+    "SQLiteHistory",
+    "TranscriptLogWriter",
+    "LOG_FORMATS",
+    "PENDING_TRANSLATION",
+]
@@ -0,0 +1,110 @@
+import sqlite3
+import threading
+from typing import Iterable, List
+
+from .store import TranscriptRow
+
+
+class SQLiteHistory:
+    """
+    Append-only on-disk segment for transcript rows that left the in-memory window.
+    Rows stay queryable by ID, by page (newest first) and by creation time range.
+
+    A file can hold several sessions; IDs keep counting up across them. page()
+    and between() only return rows of the current session (IDs from
+    `session_start` on), so a new run doesn't start with the rows of earlier ones.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        # Accessed from the recorder, translation and web server threads, serialized by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rows ("
+            " id INTEGER PRIMARY KEY,"
+            " created_at REAL NOT NULL,"
+            " text TEXT NOT NULL,"
+            " translation TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS rows_created_at ON rows (created_at)")
+        self._conn.commit()
+        # First row ID of this session
+        self.session_start = self.next_id()
+
+    def next_id(self) -> int:
+        """
+        Returns the first row ID not used yet, so IDs stay unique across restarts.
+        """
+        with self._lock:
+            (next_id,) = self._conn.execute("SELECT COALESCE(MAX(id) + 1, 0) FROM rows").fetchone()
+            return next_id
+
+    def extend(self, rows: Iterable[TranscriptRow]) -> None:
+        """
+        Writes rows in a single transaction.
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rows (id, created_at, text, translation) VALUES (?, ?, ?, ?)",
+                [(r.row_id, r.created_at, r.text, r.translation) for r in rows],
+            )
+
+    def update(self, row_id: int, translation: str, text: str | None = None) -> TranscriptRow | None:
+        """
+        Sets the translation (and optionally the text) of a stored row.
+        Returns None if the row is unknown.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE rows SET translation = ?, text = COALESCE(?, text) WHERE id = ?",
+                (translation, text, row_id),
+            )
+        return self.get(row_id)
+
+    def get(self, row_id: int) -> TranscriptRow | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, text, translation, created_at FROM rows WHERE id = ?", (row_id,)
+            ).fetchone()
+        return TranscriptRow(*row) if row else None
+
+    def page(self, before_id: int | None = None, limit: int = 100) -> List[TranscriptRow]:
+        """
+        Returns up to `limit` rows with ID below `before_id`, newest first.
+        """
+        if before_id is None:
+            query = "SELECT id, text, translation, created_at FROM rows WHERE id >= ? ORDER BY id DESC LIMIT ?"
+            params = (self.session_start, limit)
+        else:
+            query = (
+                "SELECT id, text, translation, created_at FROM rows"
+                " WHERE id >= ? AND id < ? ORDER BY id DESC LIMIT ?"
+            )
+            params = (self.session_start, before_id, limit)
+        with self._lock:
+            return [TranscriptRow(*row) for row in self._conn.execute(query, params)]
+
+    def between(self, start: float, end: float) -> List[TranscriptRow]:
+        """
+        Returns rows of this session created in [start, end), oldest first.
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT id, text, translation, created_at FROM rows"
+                " WHERE created_at >= ? AND created_at < ? AND id >= ? ORDER BY id",
+                (start, end, self.session_start),
+            )
+            return [TranscriptRow(*row) for row in cursor]
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM rows").fetchone()
+            return count
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
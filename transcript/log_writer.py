@@ -0,0 +1,141 @@
+import datetime
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+# Output formats: the original "<time> <text> | <translation>" lines, or one JSON object per line
+LOG_FORMATS = ("text", "jsonl")
+
+_FLUSH = object()
+_STOP = object()
+
+
+class TranscriptLogWriter:
+    """
+    Appends transcript records to a file from a background thread.
+
+    write() only puts the record on a queue, so callers (the STT callback and the
+    translation loop) never wait on disk I/O. The thread keeps the file open,
+    flushes buffered lines once `flush_bytes` accumulate or `flush_interval`
+    seconds pass, and rotates the file to path.1 ... path.N when it would grow
+    beyond `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fmt: str = "text",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        flush_interval: float = 1.0,
+        flush_bytes: int = 64 * 1024,
+    ):
+        if fmt not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._file = None
+        self._thread = threading.Thread(target=self._run, name=f"log-writer:{os.path.basename(path)}", daemon=True)
+        self._thread.start()
+
+    def write(self, text: str, translation: str | None = None, row_id: int | None = None, **fields) -> None:
+        """
+        Queues one record. The timestamp is taken now, not when the line is written.
+        """
+        self._queue.put((datetime.datetime.now(), text, translation, row_id, fields))
+
+    def flush(self, timeout: float | None = None) -> None:
+        """
+        Blocks until everything queued so far is on disk.
+        """
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        done.wait(timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """
+        Flushes pending records and stops the writer thread.
+        """
+        if self._thread.is_alive():
+            self._queue.put((_STOP, None))
+            self._thread.join(timeout)
+
+    def _format(self, record) -> str:
+        now, text, translation, row_id, fields = record
+        if self.fmt == "jsonl":
+            entry = {"time": now.isoformat(), "row_id": row_id, "text": text}
+            if translation is not None:
+                entry["translation"] = translation
+            entry.update(fields)
+            return json.dumps(entry, ensure_ascii=False) + "\n"
+        if translation is None:
+            return f"{now.isoformat()} {text}\n"
+        return f"{now.isoformat()} {text} | {translation}\n"
+
+    def _run(self) -> None:
+        buffer: list[str] = []
+        buffered = 0
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush)) if buffer else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            control = item[0] if item is not None and (item[0] is _FLUSH or item[0] is _STOP) else None
+            if item is not None and control is None:
+                line = self._format(item)
+                buffer.append(line)
+                buffered += len(line.encode("utf-8"))
+            due = time.monotonic() - last_flush >= self.flush_interval
+            if buffer and (buffered >= self.flush_bytes or due or control is not None):
+                self._write_out(buffer, buffered)
+                buffer, buffered = [], 0
+                last_flush = time.monotonic()
+            if item is not None:
+                # Lets callers wait for the thread to take every record in
+                self._queue.task_done()
+            if control is _FLUSH:
+                item[1].set()
+            elif control is _STOP:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write_out(self, lines: list[str], size: int) -> None:
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            if self.max_bytes and self._file.tell() > 0 and self._file.tell() + size > self.max_bytes:
+                self._rotate()
+            self._file.writelines(lines)
+            self._file.flush()
+        except (OSError, ValueError) as e:
+            # Never let a full disk or a failed rotation take down the writer
+            # thread; count what was lost and try again with the next batch
+            self.dropped += len(lines)
+            logging.error(f"Error writing {self.path}: {e}")
+
+    def _rotate(self) -> None:
+        self._file.close()
+        # If a rename below fails, the next batch reopens the file
+        self._file = None
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{i}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
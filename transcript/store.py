@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, List, NamedTuple, Tuple
+
+if TYPE_CHECKING:
+    from .history import SQLiteHistory
+
+# Placeholder shown in the translation column until the translation arrives
+PENDING_TRANSLATION = "..."
+
+
+class TranscriptRow(NamedTuple):
+    row_id: int
+    text: str
+    translation: str
+    created_at: float
+
+
+class TranscriptStore:
+    """
+    Thread-safe transcript of (text, translation) rows addressed by stable sequence IDs.
+    IDs are handed out by append() and index the rows directly, so updating a row is
+    O(1) and never confuses two utterances with equal text.
+
+    With `hot_rows` set, only the most recent rows are kept in memory. Older rows are
+    moved to `history` in batches of `spill_batch` (or dropped if there is no history),
+    so memory stays bounded however long the session runs.
+    """
+
+    def __init__(
+        self,
+        hot_rows: int | None = None,
+        history: "SQLiteHistory | None" = None,
+        spill_batch: int = 100,
+    ):
+        self._lock = threading.Lock()
+        # Row ID -> row, oldest first
+        self._rows: OrderedDict[int, TranscriptRow] = OrderedDict()
+        self.hot_rows = hot_rows
+        self.history = history
+        self.spill_batch = max(1, spill_batch)
+        self._next_id = history.next_id() if history else 0
+
+    def append(self, text: str, translation: str = PENDING_TRANSLATION) -> int:
+        """
+        Adds a new row and returns its ID.
+        """
+        with self._lock:
+            row_id = self._next_id
+            self._next_id += 1
+            self._rows[row_id] = TranscriptRow(row_id, text, translation, time.time())
+            if self.hot_rows is not None and len(self._rows) > self.hot_rows:
+                self._spill()
+            return row_id
+
+    def _spill(self) -> None:
+        # Called with the lock held: move the oldest rows out of memory
+        count = min(len(self._rows), max(self.spill_batch, len(self._rows) - self.hot_rows))
+        spilled = [self._rows.popitem(last=False)[1] for _ in range(count)]
+        if self.history is not None:
+            self.history.extend(spilled)
+
+    def update(self, row_id: int, translation: str, text: str | None = None) -> Tuple[str, str]:
+        """
+        Sets the translation (and optionally the text) of a row and returns the
+        updated (text, translation). Raises KeyError for an unknown ID.
+        """
+        with self._lock:
+            row = self._rows.get(row_id)
+            if row is not None:
+                row = row._replace(translation=translation, text=row.text if text is None else text)
+                self._rows[row_id] = row
+                return row.text, translation
+        # The row already left the hot window
+        stored = self.history.update(row_id, translation, text) if self.history else None
+        if stored is None:
+            raise KeyError(row_id)
+        return stored.text, stored.translation
+
+    def get(self, row_id: int) -> TranscriptRow:
+        """
+        Returns a row by ID from memory or history. Raises KeyError for an unknown ID.
+        """
+        with self._lock:
+            row = self._rows.get(row_id)
+        if row is None and self.history is not None:
+            row = self.history.get(row_id)
+        if row is None:
+            raise KeyError(row_id)
+        return row
+
+    def page(self, before_id: int | None = None, limit: int = 100) -> List[TranscriptRow]:
+        """
+        Returns up to `limit` rows with ID below `before_id`, newest first,
+        continuing into history once the in-memory rows run out.
+        """
+        result: List[TranscriptRow] = []
+        # The lock is held across the history query so a concurrent spill can't hide rows
+        with self._lock:
+            for row_id in reversed(self._rows):
+                if len(result) >= limit:
+                    return result
+                if before_id is None or row_id < before_id:
+                    result.append(self._rows[row_id])
+            if self.history is not None and len(result) < limit:
+                oldest_hot = next(iter(self._rows), None)
+                if oldest_hot is not None and (before_id is None or oldest_hot < before_id):
+                    before_id = oldest_hot
+                result.extend(self.history.page(before_id, limit - len(result)))
+        return result
+
+    def between(self, start: float, end: float) -> List[TranscriptRow]:
+        """
+        Returns rows created in [start, end), oldest first.
+        """
+        with self._lock:
+            result = self.history.between(start, end) if self.history else []
+            result.extend(r for r in self._rows.values() if start <= r.created_at < end)
+        return result
+
+    def snapshot(self) -> List[Tuple[str, str]]:
+        """
+        Returns (text, translation) for the rows held in memory, in utterance order.
+        """
+        with self._lock:
+            return [(r.text, r.translation) for r in self._rows.values()]
+
+    def flush(self) -> None:
+        """
+        Writes the in-memory rows to history as well, e.g. on shutdown.
+        They stay in memory; a later spill simply overwrites them.
+        """
+        with self._lock:
+            if self.history is not None and self._rows:
+                self.history.extend(self._rows.values())
+
+    def clear(self) -> None:
+        """
+        Drops the in-memory rows. History on disk is left untouched.
+        """
+        with self._lock:
+            self._rows.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
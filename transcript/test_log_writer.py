@@ -0,0 +1,101 @@
+import json
+import os
+import threading
+
+import pytest
+
+from .log_writer import TranscriptLogWriter
+
+
+def test_text_format_matches_plain_log_lines(tmp_path):
+    path = tmp_path / "t.log"
+    writer = TranscriptLogWriter(str(path))
+    writer.write("hello")
+    writer.write("hello", "привет")
+    writer.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [line.split(" ", 1)[1] for line in lines] == ["hello", "hello | привет"]
+
+
+def test_jsonl_records_row_ids_and_extra_fields(tmp_path):
+    path = tmp_path / "t.jsonl"
+    writer = TranscriptLogWriter(str(path), fmt="jsonl")
+    writer.write("one", "ONE", row_id=3, latency=0.25)
+    writer.close()
+    entry = json.loads(path.read_text(encoding="utf-8"))
+    assert entry["row_id"] == 3
+    assert entry["translation"] == "ONE"
+    assert entry["latency"] == 0.25
+    assert "time" in entry
+
+
+def test_unknown_format_raises(tmp_path):
+    with pytest.raises(ValueError):
+        TranscriptLogWriter(str(tmp_path / "t.log"), fmt="xml")
+
+
+def test_write_does_not_wait_for_disk(tmp_path):
+    path = tmp_path / "t.log"
+    writer = TranscriptLogWriter(str(path), flush_interval=60, flush_bytes=1 << 20)
+    for i in range(100):
+        writer.write(f"line {i}")
+    # Once the thread has buffered every record, still nothing is on disk:
+    # neither the size nor the interval threshold has been reached
+    writer._queue.join()
+    assert not path.exists() or path.read_text(encoding="utf-8") == ""
+    writer.flush()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 100
+    writer.close()
+
+
+def test_concurrent_writers_keep_every_line(tmp_path):
+    path = tmp_path / "t.log"
+    writer = TranscriptLogWriter(str(path))
+
+    def produce(n):
+        for i in range(200):
+            writer.write(f"{n}-{i}")
+
+    threads = [threading.Thread(target=produce, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 800
+
+
+def test_rotates_when_file_would_exceed_max_bytes(tmp_path):
+    path = tmp_path / "t.log"
+    writer = TranscriptLogWriter(str(path), max_bytes=200, backup_count=2, flush_bytes=1)
+    for i in range(30):
+        writer.write(f"utterance number {i}")
+    writer.close()
+    assert path.stat().st_size <= 200
+    assert (tmp_path / "t.log.1").exists()
+    assert (tmp_path / "t.log.2").exists()
+    assert not (tmp_path / "t.log.3").exists()
+    # The newest lines stay in the live file
+    assert path.read_text(encoding="utf-8").splitlines()[-1].endswith("utterance number 29")
+
+
+def test_failed_rotation_does_not_stop_the_writer(tmp_path, monkeypatch):
+    path = tmp_path / "t.log"
+    writer = TranscriptLogWriter(str(path), max_bytes=100, backup_count=1, flush_bytes=1)
+    replace = os.replace
+    failures = []
+
+    def failing_once(source, target):
+        if not failures:
+            failures.append(source)
+            raise PermissionError("file is locked")
+        replace(source, target)
+
+    monkeypatch.setattr("transcript.log_writer.os.replace", failing_once)
+    for i in range(10):
+        writer.write(f"utterance number {i}")
+        writer.flush(timeout=1)
+    writer.close()
+    # Only the batch of the failed rotation is lost; later lines keep coming
+    assert failures and writer.dropped == 1
+    assert path.read_text(encoding="utf-8").splitlines()[-1].endswith("utterance number 9")
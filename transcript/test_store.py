@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from .store import TranscriptStore, PENDING_TRANSLATION
+from .history import SQLiteHistory
+
+
+def test_append_returns_sequential_ids():
+    store = TranscriptStore()
+    assert [store.append(t) for t in ("a", "b", "c")] == [0, 1, 2]
+    assert store.snapshot() == [("a", PENDING_TRANSLATION), ("b", PENDING_TRANSLATION), ("c", PENDING_TRANSLATION)]
+
+
+def test_update_targets_exact_row_with_duplicate_text():
+    store = TranscriptStore()
+    first = store.append("okay")
+    second = store.append("okay")
+    assert store.update(second, "ok-2") == ("okay", "ok-2")
+    assert store.get(first).translation == PENDING_TRANSLATION
+    assert store.snapshot() == [("okay", PENDING_TRANSLATION), ("okay", "ok-2")]
+
+
+def test_update_unknown_id_raises():
+    store = TranscriptStore()
+    with pytest.raises(KeyError):
+        store.update(7, "x")
+
+
+def test_concurrent_appends_get_unique_ids():
+    store = TranscriptStore()
+    ids = []
+    ids_lock = threading.Lock()
+
+    def worker():
+        for i in range(200):
+            row_id = store.append(str(i))
+            with ids_lock:
+                ids.append(row_id)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(ids) == list(range(800))
+    assert len(store) == 800
+
+
+def test_hot_window_spills_to_history():
+    history = SQLiteHistory()
+    store = TranscriptStore(hot_rows=10, history=history, spill_batch=4)
+    for i in range(25):
+        store.append(f"t{i}")
+    assert len(store) <= 10
+    assert len(store) + len(history) == 25
+    # Rows are reachable by ID wherever they live
+    assert store.get(0).text == "t0"
+    assert store.get(24).text == "t24"
+    # A late translation for a spilled row goes to history
+    assert store.update(0, "late") == ("t0", "late")
+    assert history.get(0).translation == "late"
+
+
+def test_page_crosses_from_memory_into_history():
+    store = TranscriptStore(hot_rows=5, history=SQLiteHistory(), spill_batch=2)
+    for i in range(20):
+        store.append(f"t{i}")
+    first = store.page(limit=8)
+    assert [r.row_id for r in first] == list(range(19, 11, -1))
+    second = store.page(before_id=first[-1].row_id, limit=8)
+    assert [r.row_id for r in second] == list(range(11, 3, -1))
+    assert [r.row_id for r in store.page(before_id=2, limit=8)] == [1, 0]
+
+
+def test_between_returns_rows_in_time_range(monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr("transcript.store.time.time", lambda: float(next(clock)))
+    store = TranscriptStore(hot_rows=3, history=SQLiteHistory(), spill_batch=1)
+    for i in range(10):
+        store.append(f"t{i}")
+    assert [r.row_id for r in store.between(2.0, 6.0)] == [2, 3, 4, 5]
+
+
+def test_ids_continue_after_restart(tmp_path):
+    path = str(tmp_path / "history.db")
+    store = TranscriptStore(hot_rows=2, history=SQLiteHistory(path), spill_batch=1)
+    for i in range(5):
+        store.append(f"t{i}")
+    store.flush()
+    store.history.close()
+    reopened = TranscriptStore(hot_rows=2, history=SQLiteHistory(path))
+    assert reopened.append("next") == 5
+    assert reopened.get(4).text == "t4"
+
+
+def test_new_session_pages_only_its_own_rows(tmp_path):
+    path = str(tmp_path / "history.db")
+    store = TranscriptStore(hot_rows=2, history=SQLiteHistory(path), spill_batch=1)
+    for i in range(5):
+        store.append(f"old {i}")
+    store.flush()
+    store.history.close()
+    reopened = TranscriptStore(hot_rows=2, history=SQLiteHistory(path), spill_batch=1)
+    for i in range(4):
+        reopened.append(f"new {i}")
+    assert [r.text for r in reopened.page(limit=100)] == ["new 3", "new 2", "new 1", "new 0"]
+    assert [r.text for r in reopened.between(0, float("inf"))] == ["new 0", "new 1", "new 2", "new 3"]
+
+
+def test_without_history_old_rows_are_dropped():
+    store = TranscriptStore(hot_rows=3, spill_batch=1)
+    for i in range(6):
+        store.append(f"t{i}")
+    assert store.snapshot() == [("t3", "..."), ("t4", "..."), ("t5", "...")]
+    with pytest.raises(KeyError):
+        store.update(0, "x")
@@ -1,13 +1,22 @@
 # This file initializes the translator package. It may contain package-level documentation or import statements for the classes defined in the package.
 from .base import BaseTranslator
+from .cache import TranslationCache
+from .context_policy import ContextPolicy, TokenCounter
 from .factory import get_translator
 from .openai_translator import OpenAITranslator
 from .google_translator import GoogleTranslator
+from .local_translator import LocalTranslator
+from .hedged_translator import HedgedTranslator
 
 
 __all__ = [
     "BaseTranslator",
+    "TranslationCache",
+    "ContextPolicy",
+    "TokenCounter",
     "get_translator",
     "OpenAITranslator",
     "GoogleTranslator",
+    "LocalTranslator",
+    "HedgedTranslator",
 ]
\ No newline at end of file
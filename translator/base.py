@@ -1,10 +1,28 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, List, Optional
 from compressor.base import BaseCompressor      
+from .cache import TranslationCache
+from .context_policy import ContextPolicy
+
+# How a context-sensitive backend uses the cache:
+#   "bypass"      - never cache (default, the context may change the translation)
+#   "fingerprint" - cache per (text, context) pair
+#   "ignore"      - cache by text alone, whatever the context
+CACHE_CONTEXT_MODES = ("bypass", "fingerprint", "ignore")
+
 
 class BaseTranslator(ABC):
+    # Name used in cache keys; subclasses override it
+    backend_name: str = "base"
+    # True if the translation depends on the context passed to translate_with_context
+    context_sensitive: bool = False
+
     def __init__(self):
         self.compressor: Optional[BaseCompressor] = None
+        self.cache: Optional[TranslationCache] = None
+        self.cache_context_mode = "bypass"
+        self.context_policy: Optional[ContextPolicy] = None
 
     def set_compressor(self, compressor: BaseCompressor) -> None:
         """
@@ -12,25 +30,202 @@ class BaseTranslator(ABC):
         """
         self.compressor = compressor
 
+    def set_context_policy(self, policy: ContextPolicy) -> None:
+        """
+        Caps the context sent with each request to the policy's token budget.
+        Without a policy the compressor's whole context is sent.
+        """
+        self.context_policy = policy
+
+    def warmup(self) -> None:
+        """
+        Prepares the backend before the first utterance, e.g. loads a local model.
+        The default does nothing.
+        """
+        pass
+
+    def set_cache(self, cache: TranslationCache, context_mode: str = "bypass") -> None:
+        """
+        Sets the translation cache. context_mode is one of CACHE_CONTEXT_MODES and
+        only matters for context-sensitive backends.
+        """
+        if context_mode not in CACHE_CONTEXT_MODES:
+            raise ValueError(f"Unknown cache context mode: {context_mode}")
+        self.cache = cache
+        self.cache_context_mode = context_mode
+
     def get_context(self) -> str:
         """
-        Retrieves the accumulated context from the compressor.
+        Retrieves the accumulated context from the compressor, trimmed by the
+        context policy if one is set.
         """
-        if self.compressor:
-            return self.compressor.get_context()
-        return ""
+        if not self.compressor:
+            return ""
+        if self.context_policy:
+            return self.context_policy.build(*self.compressor.get_parts())
+        return self.compressor.get_context()
 
     def translate(self, text: str) -> str:
         """
         Translates text, possibly using the accumulated context.
+        Answers from the cache when one is set and applies to this backend.
         """
-        context: str | None = None
-        if self.compressor:
-            context = self.compressor.get_context()
-        translated_text = self.translate_with_context(text, context)
+        context, key, translated_text = self._lookup(text)
+        if translated_text is None:
+            translated_text = self.translate_with_context(text, context)
+        self._remember(text, key, translated_text)
+        return translated_text
+
+    def translate_streaming(self, text: str, on_partial: Callable[[str], None]) -> str:
+        """
+        Like translate(), but calls on_partial with the translation so far while it
+        is being generated. Cached answers and non-streaming backends produce no partials.
+        """
+        context, key, translated_text = self._lookup(text)
+        if translated_text is None:
+            translated_text = self.translate_stream_with_context(text, context, on_partial)
+        self._remember(text, key, translated_text)
+        return translated_text
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Translates several utterances sharing one context, in order.
+        Cached utterances are skipped; the rest go to translate_batch_with_context.
+        """
+        context, keys, results, missing = self._lookup_batch(texts)
+        if missing:
+            translated = self.translate_batch_with_context([texts[i] for i in missing], context)
+            for i, translation in zip(missing, translated):
+                results[i] = translation
+        self._remember_batch(texts, keys, results, missing)
+        return results
+
+    async def atranslate(self, text: str) -> str:
+        """
+        Async version of translate().
+        """
+        context, key, translated_text = self._lookup(text)
+        if translated_text is None:
+            translated_text = await self.atranslate_with_context(text, context)
+        self._remember(text, key, translated_text)
+        return translated_text
+
+    async def atranslate_streaming(self, text: str, on_partial: Callable[[str], None]) -> str:
+        """
+        Async version of translate_streaming().
+        """
+        context, key, translated_text = self._lookup(text)
+        if translated_text is None:
+            translated_text = await self.atranslate_stream_with_context(text, context, on_partial)
+        self._remember(text, key, translated_text)
+        return translated_text
+
+    async def atranslate_batch(self, texts: List[str]) -> List[str]:
+        """
+        Async version of translate_batch().
+        """
+        context, keys, results, missing = self._lookup_batch(texts)
+        if missing:
+            translated = await self.atranslate_batch_with_context([texts[i] for i in missing], context)
+            for i, translation in zip(missing, translated):
+                results[i] = translation
+        self._remember_batch(texts, keys, results, missing)
+        return results
+
+    def _lookup(self, text: str):
+        # Returns (context, cache key, cached translation or None)
+        context = self.get_context() if self.compressor else None
+        key = self._cache_key(text, context)
+        return context, key, self.cache.get(key) if key else None
+
+    def _remember(self, text: str, key, translated_text: str) -> None:
+        # Stores a fresh result in the cache and the text in the context
+        if key and self.is_cacheable(translated_text):
+            self.cache.put(key, translated_text)
         if self.compressor:
             self.compressor.add_text(text)
-        return translated_text
+
+    def _lookup_batch(self, texts: List[str]):
+        # Returns (context, keys, results with cache hits filled in, indexes still to translate)
+        context = self.get_context() if self.compressor else None
+        keys = [self._cache_key(text, context) for text in texts]
+        results: List[str | None] = [self.cache.get(key) if key else None for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        return context, keys, results, missing
+
+    def _remember_batch(self, texts: List[str], keys: list, results: List[str], missing: List[int]) -> None:
+        for i in missing:
+            if keys[i] and self.is_cacheable(results[i]):
+                self.cache.put(keys[i], results[i])
+        if self.compressor:
+            for text in texts:
+                self.compressor.add_text(text)
+
+    def translate_stream_with_context(
+        self, text: str, context: str | None, on_partial: Callable[[str], None]
+    ) -> str:
+        """
+        Translates text using the provided context, reporting partial results.
+        The default doesn't stream and just returns the full translation.
+        """
+        return self.translate_with_context(text, context)
+
+    def translate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        """
+        Translates several utterances using the provided context.
+        The default sends one request per utterance; backends that can translate
+        a batch in one request should override this.
+        """
+        return [self.translate_with_context(text, context) for text in texts]
+
+    async def atranslate_with_context(self, text: str, context: str | None) -> str:
+        """
+        Async version of translate_with_context().
+        The default runs the blocking method in a worker thread; backends with a
+        native async client should override this.
+        """
+        return await asyncio.to_thread(self.translate_with_context, text, context)
+
+    async def atranslate_stream_with_context(
+        self, text: str, context: str | None, on_partial: Callable[[str], None]
+    ) -> str:
+        """
+        Async version of translate_stream_with_context(). on_partial is called from
+        a worker thread when the default thread fallback is used.
+        """
+        return await asyncio.to_thread(self.translate_stream_with_context, text, context, on_partial)
+
+    async def atranslate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        """
+        Async version of translate_batch_with_context().
+        """
+        return await asyncio.to_thread(self.translate_batch_with_context, texts, context)
+
+    def _cache_key(self, text: str, context: str | None):
+        """
+        Returns the cache key for text, or None if the cache must not be used.
+        """
+        if self.cache is None:
+            return None
+        fingerprint_context = None
+        if self.context_sensitive:
+            if self.cache_context_mode == "bypass":
+                return None
+            if self.cache_context_mode == "fingerprint":
+                fingerprint_context = context
+        return TranslationCache.make_key(
+            self.backend_name,
+            getattr(self, "source", ""),
+            getattr(self, "target", ""),
+            text,
+            fingerprint_context,
+        )
+
+    def is_cacheable(self, translation: str) -> bool:
+        """
+        Whether a translation result may be stored in the cache.
+        """
+        return bool(translation)
     
     @abstractmethod
     def translate_with_context(self, text: str, context: str| None) -> str:
@@ -0,0 +1,147 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+CacheKey = Tuple[str, str, str, str, str]
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes an utterance for cache lookups: trims, collapses whitespace and ignores case.
+    """
+    return " ".join(text.split()).casefold()
+
+
+def context_fingerprint(context: str | None) -> str:
+    """
+    Short stable hash of a context string ("" for no context).
+    """
+    if not context:
+        return ""
+    return hashlib.sha1(context.encode("utf-8")).hexdigest()[:16]
+
+
+class TranslationCache:
+    """
+    Thread-safe LRU cache of translations with optional TTL and on-disk backing.
+
+    Keys are (backend, source, target, normalized text, context fingerprint).
+    With `path` set, entries are written through to a SQLite file and read back
+    on a memory miss, so the cache survives restarts. The file is bounded too:
+    expired rows and all but the `max_entries` most recently stored ones are
+    deleted on open and again after every `max_entries` writes.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float | None = None, path: str | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes_since_trim = 0
+        self._lock = threading.Lock()
+        # key -> (translation, stored_at), least recently used first
+        self._entries: OrderedDict[CacheKey, Tuple[str, float]] = OrderedDict()
+        self._conn: sqlite3.Connection | None = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                " key TEXT PRIMARY KEY,"
+                " translation TEXT NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS translations_stored_at ON translations (stored_at)")
+            self._trim_disk()
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(backend: str, source: str, target: str, text: str, context: str | None = None) -> CacheKey:
+        return (backend, source, target, normalize_text(text), context_fingerprint(context))
+
+    def _expired(self, stored_at: float) -> bool:
+        return bool(self.ttl) and time.time() - stored_at > self.ttl
+
+    def get(self, key: CacheKey) -> str | None:
+        """
+        Returns the cached translation or None, counting a hit or a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1]):
+                del self._entries[key]
+                entry = None
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT translation, stored_at FROM translations WHERE key = ?", ("\x1f".join(key),)
+                ).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    entry = (row[0], row[1])
+                    self._store(key, entry)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: CacheKey, translation: str) -> None:
+        entry = (translation, time.time())
+        with self._lock:
+            self._store(key, entry)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO translations (key, translation, stored_at) VALUES (?, ?, ?)",
+                        ("\x1f".join(key), translation, entry[1]),
+                    )
+                    self._writes_since_trim += 1
+                    if self._writes_since_trim >= self.max_entries:
+                        self._trim_disk()
+
+    def _store(self, key: CacheKey, entry: Tuple[str, float]) -> None:
+        # Called with the lock held
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _trim_disk(self) -> None:
+        # Called with the lock held (or from __init__) inside a transaction
+        if self.ttl:
+            self._conn.execute("DELETE FROM translations WHERE stored_at < ?", (time.time() - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM translations WHERE key NOT IN"
+            " (SELECT key FROM translations ORDER BY stored_at DESC LIMIT ?)",
+            (self.max_entries,),
+        )
+        self._writes_since_trim = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM translations")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
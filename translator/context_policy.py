@@ -0,0 +1,124 @@
+import logging
+import math
+from typing import List
+
+# Used when tiktoken isn't installed; close enough for English and European languages
+CHARS_PER_TOKEN = 4
+
+# The missing-tiktoken warning is logged by the first counter only
+_fallback_warned = False
+
+
+class TokenCounter:
+    """
+    Counts and truncates text in model tokens with tiktoken, or approximately by
+    characters if tiktoken isn't installed.
+    """
+
+    def __init__(self, model: str = "gpt-4.1-nano"):
+        global _fallback_warned
+        self.model = model
+        self._encoding = None
+        try:
+            import tiktoken
+        except ImportError:
+            if not _fallback_warned:
+                _fallback_warned = True
+                logging.warning(
+                    f"tiktoken is not installed: context token budgets are estimated "
+                    f"at {CHARS_PER_TOKEN} characters per token"
+                )
+            return
+        try:
+            self._encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Models newer than the installed tiktoken use the GPT-4o tokenizer
+            self._encoding = tiktoken.get_encoding("o200k_base")
+
+    @property
+    def exact(self) -> bool:
+        return self._encoding is not None
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def head(self, text: str, tokens: int) -> str:
+        """
+        The first `tokens` tokens of text.
+        """
+        if tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            return self._encoding.decode(self._encoding.encode(text)[:tokens])
+        return text[:tokens * CHARS_PER_TOKEN]
+
+    def tail(self, text: str, tokens: int) -> str:
+        """
+        The last `tokens` tokens of text.
+        """
+        if tokens <= 0:
+            return ""
+        if self._encoding is not None:
+            return self._encoding.decode(self._encoding.encode(text)[-tokens:])
+        return text[-tokens * CHARS_PER_TOKEN:]
+
+
+class ContextPolicy:
+    """
+    Chooses the context sent with each request under a fixed token budget: the
+    most recent utterances (up to `recent_utterances` of them) plus as much of the
+    latest summary as still fits.
+
+    The summary comes first because it changes only when the compressor runs, so
+    consecutive prompts share a long stable prefix (instructions + summary) that
+    provider-side prompt caching can reuse. At least `summary_share` of the budget
+    is kept for the summary when there is one.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 300,
+        recent_utterances: int = 6,
+        summary_share: float = 0.4,
+        counter: TokenCounter | None = None,
+    ):
+        self.max_tokens = max_tokens
+        self.recent_utterances = recent_utterances
+        self.summary_share = summary_share
+        self.counter = counter or TokenCounter()
+        # Tokens of the last context built, for stats
+        self.last_tokens = 0
+
+    def build(self, summary: str, texts: List[str]) -> str:
+        """
+        Context for the next request from the latest summary and the texts added
+        since (oldest first).
+        """
+        count = self.counter.count
+        summary_tokens = count(summary)
+        recent_budget = self.max_tokens - min(summary_tokens, int(self.max_tokens * self.summary_share))
+
+        recent: List[str] = []
+        used = 0
+        for text in reversed(texts[-self.recent_utterances:] if self.recent_utterances > 0 else []):
+            cost = count(text)
+            if used + cost > recent_budget:
+                if not recent:
+                    # A single long utterance: keep its end, nearest to the new text
+                    text = self.counter.tail(text, recent_budget)
+                    recent.append(text)
+                    used += count(text)
+                break
+            recent.append(text)
+            used += cost
+        recent.reverse()
+
+        summary_part = summary if summary_tokens <= self.max_tokens - used else self.counter.head(summary, self.max_tokens - used)
+        parts = [summary_part] + recent if summary_part else recent
+        context = "\n".join(parts)
+        self.last_tokens = count(context)
+        return context
@@ -1,15 +1,44 @@
 from .google_translator import GoogleTranslator
 from .openai_translator import OpenAITranslator
+from .local_translator import LocalTranslator
+from .hedged_translator import HedgedTranslator
+from openai_client import OpenAIClient
 
 
-def get_translator(translator_type: str, input_lang: str, translate_lang: str, proxy: str | None = None, openai_api_key: str | None = None):
+def get_translator(
+    translator_type: str,
+    input_lang: str,
+    translate_lang: str,
+    proxy: str | None = None,
+    openai_api_key: str | None = None,
+    local_model: str | None = None,
+    local_threads: int = 2,
+    hedge_backends: list[str] | None = None,
+    hedge_delay: float = 1.0,
+    latency_budget: float = 5.0,
+    openai_client: OpenAIClient | None = None,
+):
     if translator_type == "google":
         kwargs = {"source": input_lang, "target": translate_lang}
         if proxy:
             kwargs["proxy"] = proxy
         translator = GoogleTranslator(**kwargs)
     elif translator_type == "openai":
-        translator = OpenAITranslator(input_lang, translate_lang, openai_api_key)
+        translator = OpenAITranslator(input_lang, translate_lang, openai_api_key, openai_client=openai_client)
+    elif translator_type == "local":
+        translator = LocalTranslator(input_lang, translate_lang, model_path=local_model, inter_threads=local_threads)
+    elif translator_type == "hedged":
+        names = hedge_backends or ["google", "openai"]
+        if "hedged" in names:
+            raise ValueError("A hedged translator can't contain another hedged translator")
+        backends = [
+            get_translator(
+                name, input_lang, translate_lang, proxy, openai_api_key, local_model, local_threads,
+                openai_client=openai_client,
+            )
+            for name in names
+        ]
+        translator = HedgedTranslator(backends, hedge_delay=hedge_delay, budget=latency_budget)
     else:
         raise ValueError(f"Unknown translator type: {translator_type}")
     
@@ -1,20 +1,131 @@
-from .base import BaseTranslator
+import contextvars
+import threading
+from typing import List
+
+import requests
+from requests.adapters import HTTPAdapter
+import deep_translator.google
 from deep_translator import GoogleTranslator as gt
 
+from .base import BaseTranslator
+
+# Google's web endpoint rejects payloads of 5000 characters or more
+MAX_PAYLOAD_CHARS = 4999
+# Separates utterances in a batched payload; Google keeps line breaks in place
+BATCH_SEPARATOR = "\n"
+
+# (session, timeout) used by the requests of the current call, if any
+_bound_session: contextvars.ContextVar[tuple[requests.Session, float] | None] = contextvars.ContextVar(
+    "google_session", default=None
+)
+
+
+class _SessionRouter:
+    """
+    Stands in for the `requests` module inside deep_translator.google, so the
+    upstream GoogleTranslator.translate() runs unchanged but sends its GET
+    through the keep-alive session bound by the calling GoogleTranslator.
+    Calls made outside of one go to plain requests as before.
+    """
+
+    def get(self, url, **kwargs):
+        bound = _bound_session.get()
+        if bound is None:
+            return requests.get(url, **kwargs)
+        session, timeout = bound
+        # The session carries the proxies
+        kwargs.pop("proxies", None)
+        kwargs.setdefault("timeout", timeout)
+        return session.get(url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+deep_translator.google.requests = _SessionRouter()
+
+
 class GoogleTranslator(BaseTranslator):
-    def __init__(self, source: str = "en", target: str = "ru", proxy: str | None = None):
+    backend_name = "google"
+
+    def __init__(
+        self,
+        source: str = "en",
+        target: str = "ru",
+        proxy: str | None = None,
+        timeout: float = 10.0,
+        pool_size: int = 10,
+    ):
         super().__init__()
         self.source = source
         self.target = target
         self.proxy = proxy
-        # You can initialize a Google Translate API client or another mechanism here if needed
+        self.timeout = timeout
+        self.pool_size = pool_size
+        # One keep-alive session for the lifetime of the translator, so every
+        # utterance after the first skips the TCP+TLS (and proxy) handshake
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if self.proxy:
+            self.session.proxies.update({'http': self.proxy, 'https': self.proxy})
+        # deep_translator's client keeps per-call request parameters on the
+        # instance, so each thread gets its own; they all share the session
+        self._local = threading.local()
+
+    def _translate(self, text: str) -> str:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = gt(source=self.source, target=self.target)
+        token = _bound_session.set((self.session, self.timeout))
+        try:
+            result = client.translate(text)
+        finally:
+            _bound_session.reset(token)
+        # Upstream returns None when the reply repeats the text with other punctuation
+        return result if result is not None else text.strip()
 
     def translate_with_context(self, text: str, context: str| None) -> str:        
-        # Prepare arguments for the deep_translator GoogleTranslator
-        kwargs: dict[str, str | dict[str, str] | None] = {"source": self.source, "target": self.target}
-        if self.proxy:
-            # If a proxy is specified, add it to the translator arguments
-            kwargs["proxies"] = {'http': self.proxy, 'https': self.proxy}
-        translator = gt(**kwargs)
-        return translator.translate(text)
+        return self._translate(text)
+
+    def translate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        """
+        Translates several utterances with as few requests as possible by joining
+        them with line breaks. Falls back to one request per utterance for any
+        chunk whose translation doesn't split back into the same number of lines.
+        """
+        results: List[str] = []
+        for chunk in self._chunks(texts):
+            if len(chunk) == 1:
+                results.append(self._translate(chunk[0]))
+                continue
+            parts = self._split(self._translate(BATCH_SEPARATOR.join(chunk)), len(chunk))
+            if parts is None:
+                parts = [self._translate(text) for text in chunk]
+            results.extend(parts)
+        return results
+
+    @staticmethod
+    def _split(translated: str, count: int) -> List[str] | None:
+        # None if the translation doesn't have one line per utterance
+        parts = [p for p in translated.split(BATCH_SEPARATOR) if p.strip()]
+        return parts if len(parts) == count else None
+
+    @staticmethod
+    def _chunks(texts: List[str]) -> List[List[str]]:
+        # Group utterances into payloads under the size limit; line breaks inside
+        # an utterance would break the split, so they are flattened first
+        chunks: List[List[str]] = []
+        size = 0
+        for text in (" ".join(t.split()) for t in texts):
+            if chunks and size + len(BATCH_SEPARATOR) + len(text) <= MAX_PAYLOAD_CHARS:
+                chunks[-1].append(text)
+                size += len(BATCH_SEPARATOR) + len(text)
+            else:
+                chunks.append([text])
+                size = len(text)
+        return chunks
 
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,313 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Callable, List
+
+from .base import BaseTranslator
+
+
+class NoTranslationError(RuntimeError):
+    """
+    Raised when no backend produced a usable translation within the latency budget.
+    """
+
+
+class BackendHealth:
+    """
+    EWMA latency and error rate of one backend, plus a circuit breaker.
+    After `failure_threshold` failures in a row the breaker opens and the backend
+    is skipped for `cooldown` seconds; then it gets one trial request, and a
+    success closes the breaker again.
+    """
+
+    def __init__(self, name: str, alpha: float = 0.2, failure_threshold: int = 3, cooldown: float = 30.0):
+        self.name = name
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.latency: float | None = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.open_until = 0.0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def available(self, now: float) -> bool:
+        """
+        True if the breaker is closed or its cool-down is over.
+        """
+        with self._lock:
+            return now >= self.open_until
+
+    def acquire(self, now: float) -> bool:
+        """
+        Called before sending a request. Once the cool-down of an open breaker is
+        over, only the first caller gets through (the trial request); the others
+        are turned away until the trial is recorded or another cool-down passes.
+        """
+        with self._lock:
+            if now < self.open_until:
+                return False
+            if self.failures >= self.failure_threshold:
+                self.open_until = now + self.cooldown
+            return True
+
+    def record(self, ok: bool, latency: float, now: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.error_rate = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * self.error_rate
+            if ok:
+                self.latency = latency if self.latency is None else self.alpha * latency + (1 - self.alpha) * self.latency
+                if self.failures >= self.failure_threshold:
+                    logging.info(f"Translator {self.name}: circuit closed")
+                self.failures = 0
+                self.open_until = 0.0
+                return
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.open_until = now + self.cooldown
+                logging.warning(f"Translator {self.name}: circuit open for {self.cooldown:.0f}s after {self.failures} failures")
+
+    def trip(self, now: float) -> None:
+        """
+        Opens the breaker right away, e.g. for a backend that failed to start.
+        """
+        with self._lock:
+            self.failures = max(self.failures, self.failure_threshold)
+            self.open_until = now + self.cooldown
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "latency": self.latency,
+                "error_rate": self.error_rate,
+                "requests": self.requests,
+                "open": time.monotonic() < self.open_until,
+            }
+
+
+class _Race:
+    """
+    Bookkeeping of one hedged request, shared by the sync and async loops: which
+    backend to start next and when, how long to wait, and how each finished
+    request counts towards its backend's health. The loops only start requests
+    (tasks or executor futures, both called handles here) and wait for them.
+    """
+
+    def __init__(self, translator: "HedgedTranslator", check: Callable[[object], bool]):
+        self.translator = translator
+        self.check = check
+        now = time.monotonic()
+        self.deadline = now + translator.budget
+        self.next_hedge = now
+        healthy = [i for i, health in enumerate(translator.health) if health.available(now)]
+        # With every breaker open, trying them all beats failing outright
+        self.forced = not healthy
+        self.waiting = healthy or list(range(len(translator.backends)))
+        # Handle -> (backend index, start time)
+        self.running: dict = {}
+        self.last_error: BaseException | None = None
+
+    def next_backend(self) -> int | None:
+        """
+        Index of the backend to start now, or None if no hedge is due.
+        """
+        now = time.monotonic()
+        if self.running and now < self.next_hedge:
+            return None
+        while self.waiting:
+            index = self.waiting.pop(0)
+            # Another caller may have taken the trial request of a half-open breaker
+            if self.forced or self.translator.health[index].acquire(now):
+                self.next_hedge = now + self.translator.hedge_delay
+                return index
+        return None
+
+    def started(self, handle, index: int) -> None:
+        self.running[handle] = (index, time.monotonic())
+
+    def timeout(self) -> float | None:
+        """
+        Seconds to wait for a result before the next hedge is due, or None once
+        the budget is spent.
+        """
+        now = time.monotonic()
+        remaining = self.deadline - now
+        if remaining <= 0:
+            return None
+        if self.waiting:
+            remaining = min(remaining, self.next_hedge - now)
+        return max(0.0, remaining)
+
+    def finished(self, handle) -> bool:
+        """
+        Records a finished request; True if its result wins the race.
+        """
+        index, started = self.running.pop(handle)
+        now = time.monotonic()
+        health = self.translator.health[index]
+        error = handle.exception()
+        if error is None and self.translator._usable(index, handle.result()) and self.check(handle.result()):
+            health.record(True, now - started, now)
+            return True
+        health.record(False, now - started, now)
+        self.last_error = error or NoTranslationError(f"{health.name} returned an unusable result")
+        # A failure hedges right away instead of waiting out the delay
+        self.next_hedge = now
+        return False
+
+    def failure(self) -> BaseException:
+        """
+        The error to raise when no backend won.
+        """
+        if self.running or self.last_error is None:
+            # Requests still running at the deadline count as failures, so a
+            # hanging backend trips its breaker like an erroring one
+            now = time.monotonic()
+            for index, started in self.running.values():
+                self.translator.health[index].record(False, now - started, now)
+            return NoTranslationError(f"No translation within {self.translator.budget:.1f}s")
+        return self.last_error
+
+
+class HedgedTranslator(BaseTranslator):
+    """
+    Composite translator over an ordered list of backends.
+
+    Each utterance goes to the first healthy backend. If it hasn't answered within
+    `hedge_delay` seconds (or fails), the next backend is asked as well, and so on;
+    the first usable answer wins and the slower requests are cancelled. Nothing is
+    awaited beyond `budget` seconds per utterance. Backends with an open circuit
+    breaker are skipped unless every backend is unhealthy.
+
+    Context and cache are handled by the composite: backends are called through
+    their *_with_context methods, so attach the compressor and cache here.
+    """
+    backend_name = "hedged"
+
+    def __init__(
+        self,
+        backends: List[BaseTranslator],
+        hedge_delay: float = 1.0,
+        budget: float = 5.0,
+        alpha: float = 0.2,
+        failure_threshold: int = 3,
+        cooldown: float = 30.0,
+    ):
+        super().__init__()
+        if not backends:
+            raise ValueError("HedgedTranslator needs at least one backend")
+        self.backends = backends
+        self.hedge_delay = hedge_delay
+        self.budget = budget
+        self.context_sensitive = any(b.context_sensitive for b in backends)
+        self.source = getattr(backends[0], "source", "")
+        self.target = getattr(backends[0], "target", "")
+        self.health = [
+            BackendHealth(f"{i}:{b.backend_name}", alpha, failure_threshold, cooldown)
+            for i, b in enumerate(backends)
+        ]
+        # Sync calls run backends in threads; a losing request finishes in the background
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4 * len(backends), thread_name_prefix="hedged-translator"
+        )
+
+    def warmup(self) -> None:
+        """
+        Warms up every backend. A backend that fails (e.g. a local model without
+        its packages) is logged and its breaker opened, so the others carry on;
+        the error is raised only if no backend could be warmed up.
+        """
+        warmed = 0
+        last_error: Exception | None = None
+        for backend, health in zip(self.backends, self.health):
+            try:
+                backend.warmup()
+            except Exception as e:
+                last_error = e
+                logging.error(f"Translator {health.name}: warmup failed: {e!r}")
+                health.trip(time.monotonic())
+            else:
+                warmed += 1
+        if not warmed:
+            raise last_error
+
+    def stats(self) -> dict:
+        """
+        Backend name -> EWMA latency, error rate, request count and breaker state.
+        """
+        return {health.name: health.stats() for health in self.health}
+
+    def _usable(self, index: int, result) -> bool:
+        backend = self.backends[index]
+        if isinstance(result, list):
+            return all(backend.is_cacheable(r) for r in result)
+        return backend.is_cacheable(result)
+
+    async def _arace(self, call: Callable[[BaseTranslator], object], check: Callable[[object], bool] = lambda r: True):
+        race = _Race(self, check)
+        try:
+            while True:
+                index = race.next_backend()
+                if index is not None:
+                    race.started(asyncio.ensure_future(call(self.backends[index])), index)
+                timeout = race.timeout()
+                if not race.running or timeout is None:
+                    break
+                done, _ = await asyncio.wait(race.running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if race.finished(task):
+                        return task.result()
+        finally:
+            for task in race.running:
+                task.cancel()
+        raise race.failure()
+
+    def _race(self, call: Callable[[BaseTranslator], object], check: Callable[[object], bool] = lambda r: True):
+        race = _Race(self, check)
+        try:
+            while True:
+                index = race.next_backend()
+                if index is not None:
+                    race.started(self._executor.submit(call, self.backends[index]), index)
+                timeout = race.timeout()
+                if not race.running or timeout is None:
+                    break
+                done, _ = concurrent.futures.wait(race.running, timeout=timeout, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    if race.finished(future):
+                        return future.result()
+        finally:
+            for future in race.running:
+                future.cancel()
+        raise race.failure()
+
+    def close(self) -> None:
+        """
+        Shuts down the threads of sync requests; requests still running are abandoned.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def translate_with_context(self, text: str, context: str | None) -> str:
+        if not text:
+            return ""
+        return self._race(lambda backend: backend.translate_with_context(text, context))
+
+    async def atranslate_with_context(self, text: str, context: str | None) -> str:
+        if not text:
+            return ""
+        return await self._arace(lambda backend: backend.atranslate_with_context(text, context))
+
+    def translate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        return self._race(
+            lambda backend: backend.translate_batch_with_context(texts, context),
+            check=lambda result: len(result) == len(texts),
+        )
+
+    async def atranslate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        return await self._arace(
+            lambda backend: backend.atranslate_batch_with_context(texts, context),
+            check=lambda result: len(result) == len(texts),
+        )
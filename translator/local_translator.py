@@ -0,0 +1,143 @@
+import os
+import threading
+from typing import List
+
+from .base import BaseTranslator
+
+# NLLB models name languages with FLORES-200 codes
+NLLB_LANGUAGE_CODES = {
+    "en": "eng_Latn",
+    "ru": "rus_Cyrl",
+    "de": "deu_Latn",
+    "pt": "por_Latn",
+    "it": "ita_Latn",
+    "es": "spa_Latn",
+    "fr": "fra_Latn",
+}
+
+
+def default_model_path(source: str, target: str) -> str:
+    """
+    Where `ct2-transformers-converter` output for Helsinki-NLP/opus-mt-<source>-<target>
+    is expected when no model path is given.
+    """
+    return os.path.join("models", f"opus-mt-{source}-{target}")
+
+
+class LocalTranslator(BaseTranslator):
+    """
+    Translates on the CPU with a CTranslate2-converted Opus-MT (Marian) or NLLB model,
+    so no text leaves the machine and latency doesn't depend on the network.
+
+    The model is loaded on first use (or by warmup()) and then kept warm for the
+    lifetime of the translator. `inter_threads` models run side by side, so up to
+    that many requests (e.g. --translate_concurrency) are translated in parallel,
+    each using `intra_threads` threads. Batched utterances go through a single
+    translate_batch call.
+
+    Requires the optional ctranslate2 and transformers (with sentencepiece) packages.
+    The tokenizer is read from the model directory, so convert with --copy_files
+    for the tokenizer files, or pass `tokenizer` as a Hugging Face model name.
+    """
+    backend_name = "local"
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        model_path: str | None = None,
+        tokenizer: str | None = None,
+        device: str = "cpu",
+        compute_type: str = "int8",
+        inter_threads: int = 2,
+        intra_threads: int = 0,
+        beam_size: int = 2,
+        max_batch_size: int = 16,
+    ):
+        super().__init__()
+        self.source = source
+        self.target = target
+        self.model_path = model_path or default_model_path(source, target)
+        self.tokenizer_name = tokenizer or self.model_path
+        self.device = device
+        self.compute_type = compute_type
+        self.inter_threads = inter_threads
+        self.intra_threads = intra_threads
+        self.beam_size = beam_size
+        self.max_batch_size = max_batch_size
+        # NLLB is multilingual and needs language codes; Opus-MT models are per pair
+        self.nllb = "nllb" in os.path.basename(os.path.normpath(self.model_path)).lower()
+        self._model = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+
+    def _load(self):
+        # Loading takes seconds, so it happens once, under a lock, on first use
+        if self._model is not None:
+            return self._model, self._tokenizer
+        with self._load_lock:
+            if self._model is None:
+                try:
+                    import ctranslate2
+                    from transformers import AutoTokenizer
+                except ImportError as e:
+                    raise ImportError(
+                        "The local translator needs: pip install ctranslate2 transformers sentencepiece"
+                    ) from e
+                tokenizer_kwargs = {}
+                if self.nllb:
+                    tokenizer_kwargs["src_lang"] = self._nllb_code(self.source)
+                self._tokenizer = AutoTokenizer.from_pretrained(self.tokenizer_name, **tokenizer_kwargs)
+                self._model = ctranslate2.Translator(
+                    self.model_path,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    inter_threads=self.inter_threads,
+                    intra_threads=self.intra_threads,
+                )
+        return self._model, self._tokenizer
+
+    @staticmethod
+    def _nllb_code(language: str) -> str:
+        try:
+            return NLLB_LANGUAGE_CODES[language]
+        except KeyError:
+            raise ValueError(f"No NLLB language code for: {language}") from None
+
+    def warmup(self) -> None:
+        """
+        Loads the model and runs one short translation so the first utterance
+        doesn't pay for loading and allocation.
+        """
+        self.translate_batch_with_context(["Hello."], None)
+
+    def translate_with_context(self, text: str, context: str | None) -> str:
+        return self.translate_batch_with_context([text], context)[0]
+
+    def translate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        """
+        Translates all utterances in one translate_batch call. The model doesn't
+        take context, so it is ignored.
+        """
+        results = [""] * len(texts)
+        indexes = [i for i, text in enumerate(texts) if text.strip()]
+        if not indexes:
+            return results
+        model, tokenizer = self._load()
+        sources = [tokenizer.convert_ids_to_tokens(tokenizer.encode(texts[i].strip())) for i in indexes]
+        target_prefix = None
+        if self.nllb:
+            target_prefix = [[self._nllb_code(self.target)]] * len(sources)
+        outputs = model.translate_batch(
+            sources,
+            target_prefix=target_prefix,
+            beam_size=self.beam_size,
+            max_batch_size=self.max_batch_size,
+        )
+        for i, output in zip(indexes, outputs):
+            tokens = output.hypotheses[0]
+            if self.nllb:
+                # The forced target language token comes first
+                tokens = tokens[1:]
+            results[i] = tokenizer.decode(tokenizer.convert_tokens_to_ids(tokens), skip_special_tokens=True)
+        return results
@@ -1,54 +1,250 @@
-import os
-from openai import OpenAI
+import asyncio
+import re
+import threading
+from typing import Callable, List
+from openai import AsyncOpenAI
+from openai_client import OpenAIClient, PRIORITY_TRANSLATION
 from translator.base import BaseTranslator
 
 
+# Batched segments are sent and expected back as "[[1]] text" lines
+SEGMENT_MARKER = re.compile(r"\[\[(\d+)\]\]")
+
+
+def split_numbered_segments(content: str, count: int) -> List[str] | None:
+    """
+    Splits a "[[1]] ... [[2]] ..." reply back into `count` segments.
+    Returns None if the markers are missing, duplicated or out of range.
+    """
+    parts = SEGMENT_MARKER.split(content)
+    # parts = [preamble, "1", text1, "2", text2, ...]
+    segments: dict[int, str] = {}
+    for number, text in zip(parts[1::2], parts[2::2]):
+        index = int(number)
+        if index in segments or not 1 <= index <= count:
+            return None
+        segments[index] = text.strip()
+    if len(segments) != count or parts[0].strip() or not all(segments.values()):
+        return None
+    return [segments[i] for i in range(1, count + 1)]
+
+
 class OpenAITranslator(BaseTranslator):
-    def __init__(self, source: str, target: str, api_key: str | None = None):
+    backend_name = "openai"
+    context_sensitive = True
+
+    def __init__(
+        self,
+        source: str,
+        target: str,
+        api_key: str | None = None,
+        openai_client: OpenAIClient | None = None,
+        timeout: float = 20.0,
+    ):
         super().__init__() 
-        if not api_key:
-            api_key = os.environ.get("OPENAI_API_KEY", "")
-        if not api_key:
-            raise ValueError("OpenAI API key must be provided")
-        self.api_key = api_key
+        if openai_client is None:
+            openai_client = OpenAIClient(api_key)
+        self.api_key = openai_client.api_key
         self.source = source
         self.target = target
-        self.client = OpenAI(api_key=api_key)
+        # Shared with the compressor: one rate limit and retry policy per API key
+        self.openai_client = openai_client
+        self.client = openai_client.client
+        # Deadline for one request including retries
+        self.timeout = timeout
+        # Prompt tokens reported by the API, see prompt_token_stats()
+        self._usage = {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "last_prompt_tokens": 0}
+        self._usage_lock = threading.Lock()
 
-    def translate_with_context(self, text: str, context: str| None) -> str:
-        if not text:
-            return ""
-        
-        # Compose the prompt for the OpenAI model, including context if available
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        return self.openai_client.async_client
+
+    def _prompt_prefix(self, context: str | None) -> str:
+        # Identical for every request until the context changes, with the slowly
+        # changing summary ahead of the recent utterances, so consecutive prompts
+        # share as long a prefix as possible for provider-side prompt caching
         prompt = (
             f"You are a translator. The input is a transcription of speech from an online recording. "
             f"Translate the text from {self.source} to {self.target}, and output only the translated text without any additional commentary or formatting."
         )
-
-        
         if context:
             # If context is provided, include it in the prompt for better translation quality
-            prompt += f"\n\nPrevious context:\n{context}\n\nNew text to translate:\n{text}"
-        else:
-            prompt += f"\n\nText to translate:\n{text}"
+            prompt += f"\n\nPrevious context:\n{context}"
+        return prompt
+
+    def _build_prompt(self, text: str, context: str | None) -> str:
+        # Compose the prompt for the OpenAI model, including context if available
+        label = "New text to translate" if context else "Text to translate"
+        return f"{self._prompt_prefix(context)}\n\n{label}:\n{text}"
+
+    def _build_batch_prompt(self, texts: List[str], context: str | None) -> str:
+        segments = "\n".join(f"[[{i}]] {' '.join(text.split())}" for i, text in enumerate(texts, 1))
+        return (
+            f"{self._prompt_prefix(context)}\n\n"
+            f"The text is split into numbered segments marked [[1]], [[2]] and so on. Translate every segment separately "
+            f"and output each one on its own line starting with the same marker. Never merge, split or skip segments."
+            f"\n\nSegments to translate:\n{segments}"
+        )
+
+    def _record_usage(self, usage) -> None:
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(prompt_tokens, int):
+            return
+        cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+        with self._usage_lock:
+            self._usage["calls"] += 1
+            self._usage["prompt_tokens"] += prompt_tokens
+            self._usage["cached_tokens"] += cached if isinstance(cached, int) else 0
+            self._usage["last_prompt_tokens"] = prompt_tokens
+
+    def prompt_token_stats(self) -> dict:
+        """
+        Prompt tokens measured by the API: totals, the part served from the prompt
+        cache, the mean per call and the last call, plus the context policy's last
+        context size in tokens.
+        """
+        with self._usage_lock:
+            stats = dict(self._usage)
+        stats["mean_prompt_tokens"] = stats["prompt_tokens"] / stats["calls"] if stats["calls"] else 0.0
+        if self.context_policy:
+            stats["context_tokens"] = self.context_policy.last_tokens
+        return stats
+
+    @staticmethod
+    def _content(response) -> str:
+        # Extract the translated content from the OpenAI response
+        if response.choices and response.choices[0].message:
+            return response.choices[0].message.content or ""
+        return ""
+
+    @staticmethod
+    def _delta(chunk) -> str:
+        return (chunk.choices[0].delta.content if chunk.choices else None) or ""
+
+    def translate_with_context(self, text: str, context: str| None) -> str:
+        if not text:
+            return ""
         
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-nano",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000,
-            )
-            
-            # Add text to context before returning translation
-            if self.compressor:
-                self.compressor.add_text(text)
-                
-            # Extract the translated content from the OpenAI response
-            if response.choices and response.choices[0].message:
-                return response.choices[0].message.content or ""
+        prompt = self._build_prompt(text, context)
+        
+        response = self.openai_client.create(
+            PRIORITY_TRANSLATION,
+            timeout=self.timeout,
+            model="gpt-4.1-nano",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=1000,
+        )
+
+        self._record_usage(getattr(response, "usage", None))
+        return self._content(response)
+
+    async def atranslate_with_context(self, text: str, context: str | None) -> str:
+        if not text:
             return ""
-            
-        except Exception as e:
-            # Print error for debugging and return error message as translation result
-            print(f"Error during translation: {e}")
-            return f"Error: {str(e)}"
\ No newline at end of file
+
+        response = await self.openai_client.acreate(
+            PRIORITY_TRANSLATION,
+            timeout=self.timeout,
+            model="gpt-4.1-nano",
+            messages=[{"role": "user", "content": self._build_prompt(text, context)}],
+            max_tokens=1000,
+        )
+        self._record_usage(getattr(response, "usage", None))
+        return self._content(response)
+
+    def translate_stream_with_context(
+        self, text: str, context: str | None, on_partial: Callable[[str], None]
+    ) -> str:
+        """
+        Streams the completion and calls on_partial with the translation so far
+        each time new tokens arrive.
+        """
+        if not text:
+            return ""
+
+        stream = self.openai_client.create(
+            PRIORITY_TRANSLATION,
+            timeout=self.timeout,
+            model="gpt-4.1-nano",
+            messages=[{"role": "user", "content": self._build_prompt(text, context)}],
+            max_tokens=1000,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        translation = ""
+        for chunk in stream:
+            # The last chunk has no choices, only the usage of the whole request
+            self._record_usage(getattr(chunk, "usage", None))
+            delta = self._delta(chunk)
+            if delta:
+                translation += delta
+                on_partial(translation)
+        return translation
+
+    async def atranslate_stream_with_context(
+        self, text: str, context: str | None, on_partial: Callable[[str], None]
+    ) -> str:
+        if not text:
+            return ""
+
+        stream = await self.openai_client.acreate(
+            PRIORITY_TRANSLATION,
+            timeout=self.timeout,
+            model="gpt-4.1-nano",
+            messages=[{"role": "user", "content": self._build_prompt(text, context)}],
+            max_tokens=1000,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+        translation = ""
+        async for chunk in stream:
+            self._record_usage(getattr(chunk, "usage", None))
+            delta = self._delta(chunk)
+            if delta:
+                translation += delta
+                on_partial(translation)
+        return translation
+
+    def translate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        """
+        Translates several utterances in one request using numbered segment markers.
+        If the reply doesn't split back into exactly one segment per utterance,
+        each utterance is translated on its own instead.
+        """
+        if len(texts) < 2:
+            return [self.translate_with_context(text, context) for text in texts]
+
+        response = self.openai_client.create(
+            PRIORITY_TRANSLATION,
+            timeout=self.timeout,
+            model="gpt-4.1-nano",
+            messages=[{"role": "user", "content": self._build_batch_prompt(texts, context)}],
+            max_tokens=1000 * len(texts),
+        )
+
+        self._record_usage(getattr(response, "usage", None))
+        translations = split_numbered_segments(self._content(response), len(texts))
+        if translations is None:
+            # Misaligned reply: recover by translating one utterance at a time
+            return [self.translate_with_context(text, context) for text in texts]
+        return translations
+
+    async def atranslate_batch_with_context(self, texts: List[str], context: str | None) -> List[str]:
+        if len(texts) < 2:
+            return [await self.atranslate_with_context(text, context) for text in texts]
+
+        response = await self.openai_client.acreate(
+            PRIORITY_TRANSLATION,
+            timeout=self.timeout,
+            model="gpt-4.1-nano",
+            messages=[{"role": "user", "content": self._build_batch_prompt(texts, context)}],
+            max_tokens=1000 * len(texts),
+        )
+
+        self._record_usage(getattr(response, "usage", None))
+        translations = split_numbered_segments(self._content(response), len(texts))
+        if translations is None:
+            # Misaligned reply: recover by translating the utterances one by one, concurrently
+            return list(await asyncio.gather(*(self.atranslate_with_context(text, context) for text in texts)))
+        return translations
@@ -0,0 +1,142 @@
+import sqlite3
+import time
+
+import pytest
+
+from .base import BaseTranslator
+from .cache import TranslationCache, normalize_text
+
+
+class CountingTranslator(BaseTranslator):
+    backend_name = "counting"
+
+    def __init__(self, result=lambda text: text.upper()):
+        super().__init__()
+        self.source = "en"
+        self.target = "ru"
+        self.calls = 0
+        self.result = result
+
+    def translate_with_context(self, text, context):
+        self.calls += 1
+        return self.result(text)
+
+
+class ContextTranslator(CountingTranslator):
+    context_sensitive = True
+
+
+class FixedContext:
+    def __init__(self, context):
+        self.context = context
+
+    def get_context(self):
+        return self.context
+
+    def add_text(self, text):
+        pass
+
+
+def test_normalize_text():
+    assert normalize_text("  Next   Slide ") == normalize_text("next slide")
+
+
+def test_repeated_utterance_served_from_cache():
+    translator = CountingTranslator()
+    translator.set_cache(TranslationCache(max_entries=10))
+    assert translator.translate("next slide") == "NEXT SLIDE"
+    assert translator.translate("Next  slide") == "NEXT SLIDE"
+    assert translator.calls == 1
+    assert translator.cache.stats()["hits"] == 1
+    assert translator.cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = TranslationCache(max_entries=2)
+    keys = [TranslationCache.make_key("b", "en", "ru", t) for t in ("a", "b", "c")]
+    cache.put(keys[0], "A")
+    cache.put(keys[1], "B")
+    assert cache.get(keys[0]) == "A"
+    cache.put(keys[2], "C")
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "A"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("translator.cache.time.time", lambda: now[0])
+    cache = TranslationCache(ttl=5)
+    key = TranslationCache.make_key("b", "en", "ru", "hello")
+    cache.put(key, "привет")
+    now[0] += 4
+    assert cache.get(key) == "привет"
+    now[0] += 2
+    assert cache.get(key) is None
+
+
+def test_persistent_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.db")
+    key = TranslationCache.make_key("b", "en", "ru", "hello")
+    first = TranslationCache(path=path)
+    first.put(key, "привет")
+    first.close()
+    assert TranslationCache(path=path).get(key) == "привет"
+
+
+def disk_rows(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+
+def test_persistent_cache_is_bounded(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("translator.cache.time.time", lambda: now[0])
+    path = str(tmp_path / "cache.db")
+    cache = TranslationCache(max_entries=3, ttl=60, path=path)
+    for i in range(6):
+        now[0] += 1
+        cache.put(TranslationCache.make_key("b", "en", "ru", f"t{i}"), f"T{i}")
+    # Trimmed every max_entries writes, keeping the most recently stored rows
+    assert disk_rows(path) == 3
+    cache.close()
+    now[0] += 59.5
+    # On open the rows older than the TTL are gone as well
+    reopened = TranslationCache(max_entries=3, ttl=60, path=path)
+    assert disk_rows(path) == 1
+    assert reopened.get(TranslationCache.make_key("b", "en", "ru", "t5")) == "T5"
+
+
+def test_context_sensitive_backend_bypasses_cache_by_default():
+    translator = ContextTranslator()
+    translator.set_compressor(FixedContext("ctx"))
+    translator.set_cache(TranslationCache())
+    translator.translate("hi")
+    translator.translate("hi")
+    assert translator.calls == 2
+    assert translator.cache.stats()["hits"] + translator.cache.stats()["misses"] == 0
+
+
+def test_fingerprint_mode_keys_on_context():
+    translator = ContextTranslator()
+    compressor = FixedContext("first")
+    translator.set_compressor(compressor)
+    translator.set_cache(TranslationCache(), context_mode="fingerprint")
+    translator.translate("hi")
+    translator.translate("hi")
+    compressor.context = "second"
+    translator.translate("hi")
+    assert translator.calls == 2
+
+
+def test_empty_results_are_not_cached():
+    translator = CountingTranslator(result=lambda text: "")
+    translator.set_cache(TranslationCache())
+    translator.translate("hi")
+    translator.translate("hi")
+    assert translator.calls == 2
+
+
+def test_unknown_context_mode_rejected():
+    with pytest.raises(ValueError):
+        CountingTranslator().set_cache(TranslationCache(), context_mode="sometimes")
@@ -0,0 +1,99 @@
+import logging
+import sys
+
+from . import context_policy
+from .base import BaseTranslator
+from .context_policy import ContextPolicy, TokenCounter
+from compressor.base import BaseCompressor
+
+
+class WordCounter(TokenCounter):
+    # One token per word keeps the budgets in these tests easy to read
+    def __init__(self):
+        super().__init__()
+        self._encoding = None
+
+    def count(self, text):
+        return len(text.split())
+
+    def head(self, text, tokens):
+        return " ".join(text.split()[:max(0, tokens)])
+
+    def tail(self, text, tokens):
+        return " ".join(text.split()[-tokens:]) if tokens > 0 else ""
+
+
+def policy(**kwargs):
+    return ContextPolicy(counter=WordCounter(), **kwargs)
+
+
+def test_recent_utterances_newest_first_within_budget():
+    p = policy(max_tokens=5, summary_share=0.0)
+    assert p.build("", ["one two", "three four", "five six"]) == "three four\nfive six"
+    assert p.last_tokens == 4
+
+
+def test_summary_comes_first_and_is_trimmed_to_what_is_left():
+    p = policy(max_tokens=6, summary_share=0.5)
+    context = p.build("s1 s2 s3 s4 s5", ["a b", "c d", "e f"])
+    # Half the budget is kept for the summary; it also gets what the recent ones leave
+    assert context == "s1 s2 s3 s4\ne f"
+    assert p.last_tokens == 6
+
+
+def test_recent_window_is_capped_by_count():
+    p = policy(max_tokens=100, recent_utterances=2)
+    assert p.build("sum", ["a", "b", "c"]) == "sum\nb\nc"
+
+
+def test_single_long_utterance_keeps_its_end():
+    p = policy(max_tokens=3, summary_share=0.0)
+    assert p.build("", ["w1 w2 w3 w4 w5"]) == "w3 w4 w5"
+
+
+def test_approximate_counter_without_tiktoken():
+    counter = TokenCounter()
+    counter._encoding = None
+    assert counter.count("x" * 9) == 3
+    assert counter.head("abcdefghij", 1) == "abcd"
+    assert counter.tail("abcdefghij", 1) == "ghij"
+
+
+def test_missing_tiktoken_is_logged_once(monkeypatch, caplog):
+    monkeypatch.setitem(sys.modules, "tiktoken", None)
+    monkeypatch.setattr(context_policy, "_fallback_warned", False)
+    with caplog.at_level(logging.WARNING):
+        assert not TokenCounter().exact
+        assert not TokenCounter().exact
+    assert [r.message for r in caplog.records if "tiktoken" in r.message] == [
+        "tiktoken is not installed: context token budgets are estimated at 4 characters per token"
+    ]
+
+
+class ListCompressor(BaseCompressor):
+    def compress(self):
+        pass
+
+    def get_context(self):
+        return " ".join(self.context)
+
+
+class EchoTranslator(BaseTranslator):
+    context_sensitive = True
+
+    def __init__(self):
+        super().__init__()
+        self.contexts = []
+
+    def translate_with_context(self, text, context):
+        self.contexts.append(context)
+        return text.upper()
+
+
+def test_translator_sends_policy_context():
+    translator = EchoTranslator()
+    translator.set_compressor(ListCompressor(compression_threshold=10_000))
+    translator.set_context_policy(policy(max_tokens=2, summary_share=0.0))
+    for text in ("one", "two", "three", "four"):
+        translator.translate(text)
+    assert translator.contexts == ["", "one", "one\ntwo", "two\nthree"]
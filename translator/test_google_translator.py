@@ -0,0 +1,97 @@
+from unittest.mock import MagicMock
+
+import pytest
+from deep_translator.exceptions import TooManyRequests
+
+from .google_translator import GoogleTranslator
+
+
+def page(text):
+    response = MagicMock(status_code=200, text=f'<div class="t0">{text}</div>')
+    return response
+
+
+@pytest.fixture
+def translator():
+    translator = GoogleTranslator(source="en", target="ru", proxy="http://proxy:3128")
+    translator.session.get = MagicMock(side_effect=lambda url, params, timeout: page(params["q"].upper()))
+    return translator
+
+
+def test_session_is_reused_and_configured_once(translator):
+    session = translator.session
+    assert session.proxies == {"http": "http://proxy:3128", "https": "http://proxy:3128"}
+    assert translator.translate_with_context("hello", None) == "HELLO"
+    assert translator.translate_with_context("world", None) == "WORLD"
+    assert translator.session is session
+    assert session.get.call_count == 2
+
+
+def test_batch_is_sent_as_one_request(translator):
+    assert translator.translate_batch_with_context(["one", "two", "three"], None) == ["ONE", "TWO", "THREE"]
+    assert translator.session.get.call_count == 1
+    assert translator.session.get.call_args.kwargs["params"]["q"] == "one\ntwo\nthree"
+
+
+def test_batch_falls_back_when_lines_do_not_match(translator):
+    # The backend merged two lines into one
+    def merge_lines(url, params, timeout):
+        return page(params["q"].replace("\n", " ").upper())
+    translator.session.get = MagicMock(side_effect=merge_lines)
+    assert translator.translate_batch_with_context(["one", "two"], None) == ["ONE", "TWO"]
+    assert translator.session.get.call_count == 3
+
+
+def test_batch_splits_large_payloads(translator):
+    texts = ["x" * 3000, "y" * 3000]
+    assert translator.translate_batch_with_context(texts, None) == ["X" * 3000, "Y" * 3000]
+    assert translator.session.get.call_count == 2
+
+
+def test_rate_limit_raises(translator):
+    translator.session.get = MagicMock(return_value=MagicMock(status_code=429, text=""))
+    with pytest.raises(TooManyRequests):
+        translator.translate_with_context("hello", None)
+
+
+def test_translate_batch_uses_cache_for_known_utterances(translator):
+    from .cache import TranslationCache
+
+    translator.set_cache(TranslationCache())
+    translator.translate("one")
+    translator.session.get.reset_mock()
+    assert translator.translate_batch(["one", "two"]) == ["ONE", "TWO"]
+    assert translator.session.get.call_args.kwargs["params"]["q"] == "two"
+
+
+def test_async_translation_goes_through_the_session(translator):
+    import asyncio
+
+    seen = []
+
+    def respond(url, params, timeout):
+        seen.append(params["q"])
+        return page(params["q"].upper())
+
+    translator.session.get = MagicMock(side_effect=respond)
+
+    async def run():
+        return await translator.atranslate("hello"), await translator.atranslate_batch(["one", "two"])
+
+    assert asyncio.run(run()) == ("HELLO", ["ONE", "TWO"])
+    assert seen == ["hello", "one\ntwo"]
+
+
+def test_repeated_text_is_returned_unchanged(translator):
+    # Upstream's same-text branch: names and numbers come back as they are
+    translator.session.get = MagicMock(side_effect=lambda url, params, timeout: page(params["q"]))
+    assert translator.translate_with_context("Kubernetes", None) == "Kubernetes"
+
+
+def test_other_clients_keep_plain_requests(translator, monkeypatch):
+    from deep_translator import GoogleTranslator as Upstream
+
+    calls = []
+    monkeypatch.setattr("requests.get", lambda url, **kwargs: calls.append(kwargs) or page("ПРИВЕТ"))
+    assert Upstream(source="en", target="ru").translate("hello") == "ПРИВЕТ"
+    assert len(calls) == 1 and translator.session.get.call_count == 0
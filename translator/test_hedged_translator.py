@@ -0,0 +1,177 @@
+import asyncio
+import time
+
+import pytest
+
+from .base import BaseTranslator
+from .hedged_translator import BackendHealth, HedgedTranslator, NoTranslationError
+
+
+class ScriptedBackend(BaseTranslator):
+    # Answers f"{name}:{text}" after `delay` seconds, or raises if `fail` is set
+    def __init__(self, name, delay=0.0, fail=False, result=None):
+        super().__init__()
+        self.backend_name = name
+        self.delay = delay
+        self.fail = fail
+        self.result = result
+        self.calls = 0
+        self.cancelled = 0
+
+    def _answer(self, text):
+        if self.fail:
+            raise RuntimeError(f"{self.backend_name} down")
+        return self.result if self.result is not None else f"{self.backend_name}:{text}"
+
+    def translate_with_context(self, text, context):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self._answer(text)
+
+    async def atranslate_with_context(self, text, context):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self._answer(text)
+
+
+def test_fast_primary_is_not_hedged():
+    primary, secondary = ScriptedBackend("a", 0.01), ScriptedBackend("b")
+    translator = HedgedTranslator([primary, secondary], hedge_delay=0.5)
+    assert asyncio.run(translator.atranslate("hi")) == "a:hi"
+    assert secondary.calls == 0
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    primary, secondary = ScriptedBackend("a", 1.0), ScriptedBackend("b", 0.01)
+    translator = HedgedTranslator([primary, secondary], hedge_delay=0.05)
+    start = time.monotonic()
+    assert asyncio.run(translator.atranslate("hi")) == "b:hi"
+    assert time.monotonic() - start < 0.5
+    assert primary.cancelled == 1
+
+
+def test_failure_hedges_immediately():
+    primary, secondary = ScriptedBackend("a", fail=True), ScriptedBackend("b")
+    translator = HedgedTranslator([primary, secondary], hedge_delay=10)
+    start = time.monotonic()
+    assert asyncio.run(translator.atranslate("hi")) == "b:hi"
+    assert time.monotonic() - start < 1
+
+
+def test_unusable_answer_counts_as_failure():
+    # e.g. OpenAITranslator reports failures as an "Error: ..." string
+    primary = ScriptedBackend("a", result="")
+    translator = HedgedTranslator([primary, ScriptedBackend("b")], hedge_delay=10)
+    assert translator.translate_with_context("hi", None) == "b:hi"
+    assert translator.stats()["0:a"]["error_rate"] > 0
+
+
+def test_budget_bounds_the_wait():
+    translator = HedgedTranslator([ScriptedBackend("a", 5), ScriptedBackend("b", 5)], hedge_delay=0.01, budget=0.1)
+    start = time.monotonic()
+    with pytest.raises(NoTranslationError):
+        asyncio.run(translator.atranslate("hi"))
+    assert time.monotonic() - start < 1
+    # Both timed-out requests count against their backends
+    assert all(s["requests"] == 1 and s["error_rate"] > 0 for s in translator.stats().values())
+
+
+def test_all_failing_raises_last_error():
+    translator = HedgedTranslator([ScriptedBackend("a", fail=True), ScriptedBackend("b", fail=True)])
+    with pytest.raises(RuntimeError, match="b down"):
+        translator.translate_with_context("hi", None)
+
+
+def test_circuit_breaker_skips_unhealthy_backend():
+    primary, secondary = ScriptedBackend("a", fail=True), ScriptedBackend("b")
+    translator = HedgedTranslator([primary, secondary], failure_threshold=2, cooldown=60)
+    for _ in range(5):
+        assert translator.translate_with_context("hi", None) == "b:hi"
+    assert primary.calls == 2
+    assert translator.stats()["0:a"]["open"]
+
+
+def test_breaker_closes_after_successful_trial():
+    health = BackendHealth("x", failure_threshold=1, cooldown=1.0)
+    health.record(False, 0.1, now=100.0)
+    assert not health.acquire(100.5)
+    # One trial request after the cool-down; the others wait for its outcome
+    assert health.acquire(101.0)
+    assert not health.acquire(101.1)
+    health.record(True, 0.2, now=101.2)
+    assert health.failures == 0
+    assert health.acquire(101.3)
+    assert health.latency == pytest.approx(0.2)
+
+
+def test_failed_trial_reopens_breaker():
+    health = BackendHealth("x", failure_threshold=1, cooldown=1.0)
+    health.record(False, 0.1, now=100.0)
+    assert health.acquire(101.0)
+    health.record(False, 0.1, now=101.5)
+    assert not health.acquire(102.0)
+    assert health.acquire(102.5)
+
+
+def test_concurrent_callers_send_one_trial_request():
+    flaky, fallback = ScriptedBackend("a", delay=0.2), ScriptedBackend("b")
+    translator = HedgedTranslator([flaky, fallback], hedge_delay=10, failure_threshold=1, cooldown=0.05)
+    translator.health[0].record(False, 0.1, now=time.monotonic())
+    time.sleep(0.1)
+
+    async def burst():
+        return await asyncio.gather(*(translator.atranslate_with_context(f"t{i}", None) for i in range(5)))
+
+    results = asyncio.run(burst())
+    assert flaky.calls == 1
+    assert results == ["a:t0"] + [f"b:t{i}" for i in range(1, 5)]
+
+
+def test_batch_requires_matching_length():
+    short = ScriptedBackend("a")
+    short.translate_batch_with_context = lambda texts, context: ["only one"]
+    translator = HedgedTranslator([short, ScriptedBackend("b")], hedge_delay=10)
+    assert translator.translate_batch_with_context(["x", "y"], None) == ["b:x", "b:y"]
+
+
+def test_context_and_cache_live_on_the_composite():
+    from .cache import TranslationCache
+
+    backend = ScriptedBackend("a")
+    translator = HedgedTranslator([backend])
+    translator.set_cache(TranslationCache())
+    assert translator.translate("hi") == "a:hi"
+    assert translator.translate("hi") == "a:hi"
+    assert backend.calls == 1
+
+
+class BrokenBackend(ScriptedBackend):
+    def warmup(self):
+        raise ImportError("ctranslate2 is not installed")
+
+
+def test_failed_warmup_skips_only_that_backend():
+    broken, fallback = BrokenBackend("local"), ScriptedBackend("google")
+    translator = HedgedTranslator([broken, fallback], hedge_delay=10)
+    translator.warmup()
+    assert translator.stats()["0:local"]["open"]
+    assert translator.translate_with_context("hi", None) == "google:hi"
+    assert broken.calls == 0
+
+
+def test_warmup_raises_when_no_backend_starts():
+    translator = HedgedTranslator([BrokenBackend("a"), BrokenBackend("b")])
+    with pytest.raises(ImportError):
+        translator.warmup()
+
+
+def test_close_shuts_down_the_executor():
+    translator = HedgedTranslator([ScriptedBackend("a")])
+    assert translator.translate_with_context("hi", None) == "a:hi"
+    translator.close()
+    with pytest.raises(RuntimeError):
+        translator._executor.submit(lambda: None)
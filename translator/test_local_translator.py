@@ -0,0 +1,79 @@
+import asyncio
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from .factory import get_translator
+from .local_translator import LocalTranslator
+
+
+class WordTokenizer:
+    # Stands in for a sentencepiece tokenizer: one token per word
+    def encode(self, text):
+        return text.split()
+
+    def convert_ids_to_tokens(self, ids):
+        return list(ids)
+
+    def convert_tokens_to_ids(self, tokens):
+        return list(tokens)
+
+    def decode(self, ids, skip_special_tokens=True):
+        return " ".join(ids)
+
+
+class UpperModel:
+    def __init__(self):
+        self.calls = []
+
+    def translate_batch(self, sources, target_prefix=None, beam_size=1, max_batch_size=0):
+        self.calls.append((sources, target_prefix))
+        prefixes = target_prefix or [[] for _ in sources]
+        return [
+            SimpleNamespace(hypotheses=[prefix + [token.upper() for token in tokens]])
+            for tokens, prefix in zip(sources, prefixes)
+        ]
+
+
+def loaded(translator):
+    translator._model = UpperModel()
+    translator._tokenizer = WordTokenizer()
+    return translator
+
+
+def test_batch_is_one_model_call_and_skips_empty_texts():
+    translator = loaded(LocalTranslator("en", "ru", model_path="models/opus-mt-en-ru"))
+    assert translator.translate_batch_with_context(["hello world", "  ", "bye"], "ignored context") == ["HELLO WORLD", "", "BYE"]
+    assert translator._model.calls == [([["hello", "world"], ["bye"]], None)]
+
+
+def test_nllb_forces_target_language_and_strips_it():
+    translator = loaded(LocalTranslator("en", "de", model_path="models/nllb-200-distilled-600M"))
+    assert translator.nllb
+    assert translator.translate_with_context("good morning", None) == "GOOD MORNING"
+    assert translator._model.calls[0][1] == [["deu_Latn"]]
+
+
+def test_async_single_and_batch():
+    translator = loaded(LocalTranslator("en", "ru"))
+
+    async def main():
+        return await translator.atranslate("one"), await translator.atranslate_batch(["two", "three"])
+
+    assert asyncio.run(main()) == ("ONE", ["TWO", "THREE"])
+
+
+def test_model_is_not_loaded_until_used():
+    translator = get_translator("local", "en", "ru", local_model="/nonexistent/model", local_threads=4)
+    assert isinstance(translator, LocalTranslator)
+    assert translator.inter_threads == 4
+    assert translator._model is None
+    assert translator.translate_with_context("", None) == ""
+    assert translator._model is None
+
+
+def test_missing_runtime_raises_import_error_on_first_use(monkeypatch):
+    monkeypatch.setitem(sys.modules, "ctranslate2", None)
+    with pytest.raises(ImportError, match="ctranslate2"):
+        LocalTranslator("en", "ru").translate_with_context("hello", None)
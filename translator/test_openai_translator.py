@@ -0,0 +1,115 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from .cache import TranslationCache
+from .openai_translator import OpenAITranslator, split_numbered_segments
+
+
+def reply(content):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+
+@pytest.fixture
+def translator():
+    translator = OpenAITranslator("en", "ru", api_key="test-key")
+    patcher = patch.object(translator.client.chat.completions, "create")
+    create = patcher.start()
+    yield translator, create
+    patcher.stop()
+
+
+def test_split_numbered_segments():
+    assert split_numbered_segments("[[1]] раз\n[[2]] два", 2) == ["раз", "два"]
+    # Missing, duplicated and out-of-range markers are all misalignments
+    assert split_numbered_segments("[[1]] раз два", 2) is None
+    assert split_numbered_segments("[[1]] раз\n[[1]] два", 2) is None
+    assert split_numbered_segments("[[1]] раз\n[[3]] два", 2) is None
+    assert split_numbered_segments("Sure! [[1]] раз\n[[2]] два", 2) is None
+
+
+def test_batch_is_one_request(translator):
+    translator, create = translator
+    create.return_value = reply("[[1]] раз\n[[2]] два\n[[3]] три")
+    assert translator.translate_batch_with_context(["one", "two", "three"], None) == ["раз", "два", "три"]
+    assert create.call_count == 1
+    prompt = create.call_args.kwargs["messages"][0]["content"]
+    assert "[[1]] one\n[[2]] two\n[[3]] three" in prompt
+
+
+def test_misaligned_batch_recovers_per_utterance(translator):
+    translator, create = translator
+    create.side_effect = [reply("[[1]] раз два"), reply("раз"), reply("два")]
+    assert translator.translate_batch_with_context(["one", "two"], None) == ["раз", "два"]
+    assert create.call_count == 3
+
+
+def test_failed_request_raises_and_is_not_cached(translator):
+    translator, create = translator
+    translator.set_cache(TranslationCache(max_entries=16))
+    create.side_effect = RuntimeError("rate limited")
+    with pytest.raises(RuntimeError, match="rate limited"):
+        translator.translate_batch(["one", "two"])
+    with pytest.raises(RuntimeError, match="rate limited"):
+        translator.translate("one")
+    assert translator.cache.stats()["entries"] == 0
+
+
+def chunk(content):
+    return MagicMock(choices=[MagicMock(delta=MagicMock(content=content))])
+
+
+def test_streaming_reports_partials(translator):
+    translator, create = translator
+    create.return_value = iter([chunk("При"), chunk(None), chunk("вет"), MagicMock(choices=[])])
+    partials = []
+    assert translator.translate_stream_with_context("hello", None, partials.append) == "Привет"
+    assert partials == ["При", "Привет"]
+    assert create.call_args.kwargs["stream"] is True
+
+
+def test_async_translation_uses_async_client():
+    from unittest.mock import AsyncMock
+    import asyncio
+
+    translator = OpenAITranslator("en", "ru", api_key="test-key")
+    translator.client.chat.completions.create = MagicMock(side_effect=AssertionError("sync client used"))
+
+    async def run():
+        create = AsyncMock(return_value=reply("Привет"))
+        translator.async_client.chat.completions.create = create
+        assert await translator.atranslate("hello") == "Привет"
+        return create
+
+    assert asyncio.run(run()).await_count == 1
+
+
+def test_prompt_token_stats_from_usage(translator):
+    translator, create = translator
+    response = reply("привет")
+    response.usage = MagicMock(prompt_tokens=120, prompt_tokens_details=MagicMock(cached_tokens=100))
+    create.return_value = response
+    translator.translate_with_context("hello", "context")
+    translator.translate_with_context("hello", "context")
+    stats = translator.prompt_token_stats()
+    assert stats["calls"] == 2
+    assert stats["prompt_tokens"] == 240
+    assert stats["cached_tokens"] == 200
+    assert stats["mean_prompt_tokens"] == 120
+
+
+def test_single_and_batch_prompts_share_a_prefix(translator):
+    translator, _ = translator
+    prefix = translator._prompt_prefix("earlier words")
+    assert translator._build_prompt("one", "earlier words").startswith(prefix)
+    assert translator._build_batch_prompt(["one", "two"], "earlier words").startswith(prefix)
+
+
+def test_each_utterance_enters_the_context_once(translator):
+    translator, create = translator
+    create.return_value = reply("привет")
+    compressor = MagicMock()
+    compressor.get_context.return_value = ""
+    translator.set_compressor(compressor)
+    translator.translate("hello")
+    compressor.add_text.assert_called_once_with("hello")